@@ -115,6 +115,7 @@ signatures_sqlite = {
     "sqlite3_db_handle": intp(intp),
     "sqlite3_db_filename": intp(intp, intp),
     "sqlite3_db_readonly": int32(intp, intp),
+    "sqlite3_get_autocommit": int32(intp),
     "sqlite3_changes": int32(intp),
     "sqlite3_last_insert_rowid": int64(intp),
     "sqlite3_total_changes": int32(intp),
@@ -129,6 +130,7 @@ signatures_sqlite = {
     "sqlite3_sql": intp(intp),
     "sqlite3_expanded_sql": intp(intp),
     "sqlite3_stmt_busy": int32(intp),
+    "sqlite3_clear_bindings": int32(intp),
     # === Parameter binding ===
     "sqlite3_bind_int": int32(intp, int32, int32),
     "sqlite3_bind_int64": int32(intp, int32, int64),
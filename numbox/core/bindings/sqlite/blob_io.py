@@ -0,0 +1,260 @@
+"""BlobReader / BlobWriter: incremental BLOB I/O straight between SQLite and
+numpy buffers, usable from Python and from @njit code.
+
+A BLOB holding a packed array (e.g. ``arr.tobytes()`` of float64 features) is
+read by ``sqlite3_blob_read`` directly into the memory of a caller-provided
+contiguous array of any dtype -- no result row, no intermediate bytes object.
+One handle serves many rows: ``reopen`` moves it to another rowid of the same
+table and column (``sqlite3_blob_reopen``, no re-parse of the schema), and the
+byte ``offset`` of ``read_into`` / ``write_from`` streams a BLOB larger than
+the buffer in chunks.
+
+Incremental I/O cannot resize a BLOB: write into one already created at its
+final size, e.g. with ``zeroblob(n)``. Methods return SQLite return codes;
+a failed ``reopen`` (no such row, or no BLOB in it) aborts the handle --
+every later call but ``close`` returns SQLITE_ABORT. Handles are not closed
+by garbage collection: call ``close`` (the Python objects are also context
+managers), and before closing the connection.
+"""
+import numpy as np
+from numba import njit
+from numba.core import types
+from numba.core.errors import TypingError
+from numba.core.types import StructRef, int32, int64
+from numba.experimental.structref import define_boxing, new, register, StructRefProxy
+from numba.extending import overload, overload_method
+
+from numbox.core.bindings.sqlite.blob import (
+    sqlite3_blob_bytes, sqlite3_blob_close, sqlite3_blob_open, sqlite3_blob_read,
+    sqlite3_blob_reopen, sqlite3_blob_write,
+)
+from numbox.core.bindings.sqlite.constants import (
+    SQLITE_BLOB_READONLY, SQLITE_BLOB_READWRITE, SQLITE_MISUSE, SQLITE_OK, SQLITE_TOOBIG,
+)
+from numbox.core.bindings.sqlite.query import _raise_rc, _utf8_encode
+from numbox.core.configurations import jit_options
+
+__all__ = ["BlobReader", "BlobWriter", "BlobReaderType", "BlobWriterType"]
+
+
+@register
+class BlobReaderTypeClass(StructRef):
+    pass
+
+
+@register
+class BlobWriterTypeClass(StructRef):
+    pass
+
+
+_BLOB_FIELDS = [
+    ("db", int64),       # sqlite3* the handle was opened on
+    ("blob", int64),     # sqlite3_blob*, 0 once closed
+    ("rowid", int64),    # row the handle currently points at
+    ("nbytes", int64),   # size of that row's BLOB
+]
+BlobReaderType = BlobReaderTypeClass(_BLOB_FIELDS)
+BlobWriterType = BlobWriterTypeClass(_BLOB_FIELDS)
+
+
+@njit(**jit_options)
+def _open_utf8(db, schema8, table8, column8, rowid, flags, blob_out):
+    return sqlite3_blob_open(
+        db, schema8.ctypes.data, table8.ctypes.data, column8.ctypes.data, rowid, flags, blob_out.ctypes.data)
+
+
+@njit(**jit_options)
+def _blob_open(db, schema, table, column, rowid, flags):
+    blob_out = np.zeros(1, np.int64)
+    rc = _open_utf8(db, _utf8_encode(schema), _utf8_encode(table), _utf8_encode(column), rowid, flags, blob_out)
+    return rc, blob_out[0]
+
+
+@njit(**jit_options)
+def _new_blob(handle_type, db, blob, rowid):
+    h = new(handle_type)
+    h.db = db
+    h.blob = blob
+    h.rowid = rowid
+    h.nbytes = sqlite3_blob_bytes(blob)
+    return h
+
+
+def _open_blob(handle_type, db, table, column, rowid, schema, flags):
+    rc, blob = _blob_open(db, schema, table, column, rowid, flags)
+    if rc != SQLITE_OK:
+        if blob:
+            sqlite3_blob_close(blob)
+        _raise_rc(db, rc, "sqlite3_blob_open")
+    return _new_blob(handle_type, db, blob, rowid)
+
+
+class _BlobHandle(StructRefProxy):
+    @property
+    @njit(**jit_options)
+    def rowid(self):
+        return self.rowid
+
+    @property
+    @njit(**jit_options)
+    def nbytes(self):
+        return self.nbytes
+
+    @njit(**jit_options)
+    def reopen(self, rowid):
+        return self.reopen(rowid)
+
+    @njit(**jit_options)
+    def close(self):
+        return self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BlobReader(_BlobHandle):
+    """Read-only handle on ``schema.table.column`` at ``rowid``; raises
+    RuntimeError with SQLite's message if the BLOB cannot be opened."""
+    def __new__(cls, db, table, column, rowid, schema="main"):
+        return _open_blob(BlobReaderType, db, table, column, rowid, schema, SQLITE_BLOB_READONLY)
+
+    @njit(**jit_options)
+    def read_into(self, out, offset=0):
+        return self.read_into(out, offset)
+
+    @njit(**jit_options)
+    def read_rows(self, rowids, out):
+        return self.read_rows(rowids, out)
+
+
+class BlobWriter(_BlobHandle):
+    """Read-write handle on ``schema.table.column`` at ``rowid``; raises
+    RuntimeError with SQLite's message if the BLOB cannot be opened."""
+    def __new__(cls, db, table, column, rowid, schema="main"):
+        return _open_blob(BlobWriterType, db, table, column, rowid, schema, SQLITE_BLOB_READWRITE)
+
+    @njit(**jit_options)
+    def write_from(self, src, offset=0):
+        return self.write_from(src, offset)
+
+    @njit(**jit_options)
+    def write_rows(self, rowids, src):
+        return self.write_rows(rowids, src)
+
+
+define_boxing(BlobReaderTypeClass, BlobReader)
+define_boxing(BlobWriterTypeClass, BlobWriter)
+
+
+def _make_ctor(handle_type, flags, what):
+    def ol_ctor(db, table, column, rowid, schema="main"):
+        def _(db, table, column, rowid, schema="main"):
+            rc, blob = _blob_open(db, schema, table, column, rowid, flags)
+            if rc != SQLITE_OK:
+                if blob:
+                    sqlite3_blob_close(blob)
+                raise RuntimeError(what + ": sqlite3_blob_open failed")
+            return _new_blob(handle_type, db, blob, rowid)
+        return _
+    return ol_ctor
+
+
+overload(BlobReader, jit_options=jit_options)(_make_ctor(BlobReaderType, SQLITE_BLOB_READONLY, "BlobReader"))
+overload(BlobWriter, jit_options=jit_options)(_make_ctor(BlobWriterType, SQLITE_BLOB_READWRITE, "BlobWriter"))
+
+
+def _buffer_guard(buf_ty, what, min_ndim=1):
+    """Typing-time check that ``buf_ty`` is an array of ``min_ndim`` or more
+    dimensions; returns whether its contiguity must be checked at run time."""
+    if not isinstance(buf_ty, types.Array) or buf_ty.ndim < min_ndim:
+        raise TypingError(f"{what}: expected an array of ndim >= {min_ndim}, got {buf_ty}")
+    return buf_ty.layout != "C"
+
+
+@njit(**jit_options)
+def _blob_io(blob, buf, nbytes, offset, write):
+    """Read / write ``nbytes`` of the memory of ``buf`` at byte ``offset`` of
+    the BLOB; taking ``buf`` keeps it alive across the C call."""
+    if blob == 0:
+        return SQLITE_MISUSE
+    if offset < 0 or nbytes + offset > 0x7FFFFFFF:
+        return SQLITE_TOOBIG
+    if write:
+        return sqlite3_blob_write(blob, buf.ctypes.data, int32(nbytes), int32(offset))
+    return sqlite3_blob_read(blob, buf.ctypes.data, int32(nbytes), int32(offset))
+
+
+def _make_transfer(write, what):
+    def ol_transfer(self_ty, buf_ty, offset_ty=None):
+        check = _buffer_guard(buf_ty, what)
+
+        def _(self, buf, offset=0):
+            if check and not buf.flags.c_contiguous:
+                raise ValueError(what + ": buffer must be C-contiguous")
+            return _blob_io(self.blob, buf, buf.size * buf.itemsize, offset, write)
+        return _
+    return ol_transfer
+
+
+def _make_rows(write, what):
+    def ol_rows(self_ty, rowids_ty, buf_ty):
+        check = _buffer_guard(buf_ty, what, min_ndim=2)
+
+        def _(self, rowids, buf):
+            if len(rowids) != buf.shape[0]:
+                raise ValueError(what + ": rowids and buffer disagree on the number of rows")
+            if check and not buf.flags.c_contiguous:
+                raise ValueError(what + ": buffer must be C-contiguous")
+            rc = SQLITE_OK
+            for i in range(len(rowids)):
+                if rowids[i] != self.rowid:
+                    rc = self.reopen(rowids[i])
+                    if rc != SQLITE_OK:
+                        break
+                row = buf[i]
+                rc = _blob_io(self.blob, row, row.size * row.itemsize, 0, write)
+                if rc != SQLITE_OK:
+                    break
+            return rc
+        return _
+    return ol_rows
+
+
+overload_method(BlobReaderTypeClass, "read_into", strict=False, jit_options=jit_options)(
+    _make_transfer(False, "BlobReader.read_into"))
+overload_method(BlobReaderTypeClass, "read_rows", strict=False, jit_options=jit_options)(
+    _make_rows(False, "BlobReader.read_rows"))
+overload_method(BlobWriterTypeClass, "write_from", strict=False, jit_options=jit_options)(
+    _make_transfer(True, "BlobWriter.write_from"))
+overload_method(BlobWriterTypeClass, "write_rows", strict=False, jit_options=jit_options)(
+    _make_rows(True, "BlobWriter.write_rows"))
+
+
+for _type_class in (BlobReaderTypeClass, BlobWriterTypeClass):
+    @overload_method(_type_class, "reopen", strict=False, jit_options=jit_options)
+    def ol_reopen(self_ty, rowid_ty):
+        def _(self, rowid):
+            if self.blob == 0:
+                return SQLITE_MISUSE
+            rc = sqlite3_blob_reopen(self.blob, rowid)
+            if rc == SQLITE_OK:
+                self.rowid = rowid
+                self.nbytes = sqlite3_blob_bytes(self.blob)
+            else:
+                self.nbytes = 0
+            return rc
+        return _
+
+    @overload_method(_type_class, "close", strict=False, jit_options=jit_options)
+    def ol_close(self_ty):
+        def _(self):
+            if self.blob == 0:
+                return SQLITE_OK
+            rc = sqlite3_blob_close(self.blob)
+            self.blob = 0
+            self.nbytes = 0
+            return rc
+        return _
@@ -27,7 +27,7 @@ __all__ = [
     "sqlite3_libversion", "sqlite3_libversion_number",
     "sqlite3_errmsg", "sqlite3_errcode", "sqlite3_extended_errcode",
     "sqlite3_threadsafe",
-    "sqlite3_db_handle", "sqlite3_db_filename", "sqlite3_db_readonly",
+    "sqlite3_db_handle", "sqlite3_db_filename", "sqlite3_db_readonly", "sqlite3_get_autocommit",
     "sqlite3_changes", "sqlite3_last_insert_rowid", "sqlite3_total_changes",
     "sqlite3_changes64", "sqlite3_total_changes64",
 ]
@@ -96,6 +96,11 @@ def sqlite3_db_readonly(db_p, name_p):
     return _call_lib_func("sqlite3_db_readonly", (db_p, name_p))
 
 
+@proxy(signatures.get("sqlite3_get_autocommit"), jit_options=jit_options)
+def sqlite3_get_autocommit(db_p):
+    return _call_lib_func("sqlite3_get_autocommit", (db_p,))
+
+
 @proxy(signatures.get("sqlite3_changes"), jit_options=jit_options)
 def sqlite3_changes(db_p):
     return _call_lib_func("sqlite3_changes", (db_p,))
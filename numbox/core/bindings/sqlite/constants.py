@@ -35,6 +35,7 @@ __all__ = [
     "SQLITE_INDEX_CONSTRAINT_LE", "SQLITE_INDEX_CONSTRAINT_LT",
     "SQLITE_INDEX_CONSTRAINT_GE", "SQLITE_INDEX_CONSTRAINT_NE",
     "SQLITE_INDEX_CONSTRAINT_ISNULL", "SQLITE_INDEX_CONSTRAINT_IS",
+    "SQLITE_INDEX_SCAN_UNIQUE",
 ]
 
 # === Primary result codes (sqlite3.h) ===
@@ -124,3 +125,6 @@ SQLITE_INDEX_CONSTRAINT_GE = 32
 SQLITE_INDEX_CONSTRAINT_NE = 68
 SQLITE_INDEX_CONSTRAINT_ISNULL = 71
 SQLITE_INDEX_CONSTRAINT_IS = 72
+
+# === sqlite3_index_info.idxFlags (since 3.9.0) ===
+SQLITE_INDEX_SCAN_UNIQUE = 1
@@ -0,0 +1,161 @@
+"""insert_array: bulk-insert a numpy structured array into a SQLite table from
+@njit code -- the write-side counterpart of `query.query_to_array`.
+
+Fields map to SQLite types by the same ``_typemap._col_tag`` rules the read
+path uses (integers and booleans -> INTEGER, floats -> REAL, 'S' / 'U' ->
+TEXT), so ``query_to_array`` with the same dtype reads the rows back. Every
+cell is bound straight from the array's bytes; no Python object is created
+per row.
+"""
+import numpy as np
+from numba import njit
+from numba.core import types
+from numba.core.errors import TypingError
+from numba.core.types import float32, float64, int8, int16, int32, int64, uint8, uint16, uint32, uint64
+from numba.extending import overload
+from numba.np.numpy_support import as_dtype
+
+from numbox.core.bindings.sqlite._typemap import (
+    _nul_trimmed_len, utf32_to_utf8,
+    _TAG_I8, _TAG_I16, _TAG_I32, _TAG_I64, _TAG_U8, _TAG_U16, _TAG_U32, _TAG_U64,
+    _TAG_F32, _TAG_F64, _TAG_BOOL, _TAG_S, _TAG_U,
+)
+from numbox.core.bindings.sqlite.bind import sqlite3_bind_double, sqlite3_bind_int64, sqlite3_bind_text
+from numbox.core.bindings.sqlite.conn import sqlite3_get_autocommit
+from numbox.core.bindings.sqlite.constants import SQLITE_DONE, SQLITE_MISUSE, SQLITE_OK, SQLITE_STATIC
+from numbox.core.bindings.sqlite.exec import sqlite3_exec
+from numbox.core.bindings.sqlite.query import _layout, _utf8_encode
+from numbox.core.bindings.sqlite.stmt import sqlite3_finalize, sqlite3_prepare_v2, sqlite3_reset, sqlite3_step
+from numbox.core.configurations import jit_options
+from numbox.utils.lowlevel import load_unaligned
+
+__all__ = ["insert_array"]
+
+
+def _quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _insert_layout(*args):
+    raise NotImplementedError
+
+
+@overload(_insert_layout, strict=False, jit_options=jit_options)
+def ol_insert_layout(arr_ty):
+    """``(clause, offsets, tags, widths)`` for the fields of ``arr``, where
+    ``clause`` is the constant ``("a", "b") VALUES (?, ?)`` tail of the INSERT;
+    unsupported field dtypes fail at typing time."""
+    if not (isinstance(arr_ty, types.Array) and arr_ty.ndim == 1 and isinstance(arr_ty.dtype, types.Record)):
+        raise TypingError(f"insert_array: arr must be a 1-D structured array, got {arr_ty}")
+    dtype = as_dtype(arr_ty.dtype)
+    try:
+        offsets, tags, widths = _layout(dtype)
+    except TypeError as e:
+        raise TypingError(f"insert_array: {e}") from e
+    clause = " (%s) VALUES (%s)" % (
+        ", ".join(_quote_ident(name) for name in dtype.names), ", ".join("?" * len(dtype.names)))
+
+    def _impl(arr):
+        return clause, offsets, tags, widths
+    return _impl
+
+
+@njit(**jit_options)
+def _bind_cell(stmt, idx, tag, width, addr, text_p):
+    """Bind the field of tag ``tag`` at ``addr`` to parameter ``idx``. Text is
+    bound SQLITE_STATIC: 'S' bytes in place, 'U' re-encoded to UTF-8 at
+    ``text_p`` -- both stay put until the parameter is rebound."""
+    if tag == _TAG_I8:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, int8)))
+    elif tag == _TAG_I16:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, int16)))
+    elif tag == _TAG_I32:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, int32)))
+    elif tag == _TAG_I64:
+        return sqlite3_bind_int64(stmt, idx, load_unaligned(addr, int64))
+    elif tag == _TAG_U8:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, uint8)))
+    elif tag == _TAG_U16:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, uint16)))
+    elif tag == _TAG_U32:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, uint32)))
+    elif tag == _TAG_U64:
+        return sqlite3_bind_int64(stmt, idx, int64(load_unaligned(addr, uint64)))
+    elif tag == _TAG_BOOL:
+        return sqlite3_bind_int64(stmt, idx, int64(1) if load_unaligned(addr, uint8) != 0 else int64(0))
+    elif tag == _TAG_F32:
+        return sqlite3_bind_double(stmt, idx, float64(load_unaligned(addr, float32)))
+    elif tag == _TAG_F64:
+        return sqlite3_bind_double(stmt, idx, load_unaligned(addr, float64))
+    elif tag == _TAG_S:
+        return sqlite3_bind_text(stmt, idx, addr, int32(_nul_trimmed_len(addr, width)), SQLITE_STATIC)
+    elif tag == _TAG_U:
+        n = utf32_to_utf8(addr, width // 4, text_p)
+        return sqlite3_bind_text(stmt, idx, text_p, int32(n), SQLITE_STATIC)
+    return int32(SQLITE_MISUSE)
+
+
+@njit(**jit_options)
+def _prepare_utf8(db, sql8, stmt_out):
+    """Prepare the NUL-terminated UTF-8 bytes ``sql8`` into ``stmt_out[0]``."""
+    return sqlite3_prepare_v2(db, sql8.ctypes.data, -1, stmt_out.ctypes.data, 0)
+
+
+@njit(**jit_options)
+def _exec_utf8(db, sql8):
+    return sqlite3_exec(db, sql8.ctypes.data, 0, 0, 0)
+
+
+@njit(**jit_options)
+def insert_array(db, table, arr):
+    """Insert every row of the 1-D structured array ``arr`` into ``table``
+    (its columns named after the fields) with one prepared INSERT, rebound
+    and re-stepped per row. Returns SQLITE_OK, or the first failing SQLite
+    return code.
+
+    On a connection in autocommit mode the rows are inserted in one
+    transaction of their own, rolled back on failure; inside the caller's
+    transaction they join it, and a failure is left for the caller to roll
+    back. Callable from Python and from @njit code."""
+    clause, offsets, tags, widths = _insert_layout(arr)
+    sql = 'INSERT INTO "' + table.replace('"', '""') + '"' + clause
+    stmt_out = np.zeros(1, np.int64)
+    rc = _prepare_utf8(db, _utf8_encode(sql), stmt_out)
+    if rc != SQLITE_OK:
+        return rc
+    stmt = stmt_out[0]
+    own_txn = sqlite3_get_autocommit(db) != 0
+    if own_txn:
+        rc = _exec_utf8(db, _utf8_encode("BEGIN"))
+        if rc != SQLITE_OK:
+            sqlite3_finalize(stmt)
+            return rc
+    ncols = len(offsets)
+    # one UTF-8 slot per column, large enough for the widest 'U' field
+    # (4 bytes per code point + NUL); unused by the other columns
+    text_cap = widths.max() + 1 if ncols else 1
+    text = np.empty(ncols * text_cap, np.uint8)
+    text_p = text.ctypes.data
+    data_p = arr.ctypes.data
+    stride = arr.strides[0]
+    rc = SQLITE_DONE
+    for i in range(len(arr)):
+        row_p = data_p + i * stride
+        for j in range(ncols):
+            rc = _bind_cell(stmt, j + 1, tags[j], widths[j], row_p + offsets[j], text_p + j * text_cap)
+            if rc != SQLITE_OK:
+                break
+        if rc == SQLITE_OK:
+            rc = sqlite3_step(stmt)
+        if rc != SQLITE_DONE:
+            break
+        sqlite3_reset(stmt)
+    sqlite3_finalize(stmt)
+    text[0] = 0  # keeps the STATIC text buffer alive until the statement is gone
+    if rc != SQLITE_DONE:
+        if own_txn:
+            _exec_utf8(db, _utf8_encode("ROLLBACK"))
+        return rc
+    if own_txn:
+        return _exec_utf8(db, _utf8_encode("COMMIT"))
+    return SQLITE_OK
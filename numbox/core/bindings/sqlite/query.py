@@ -1,26 +1,57 @@
-"""query_to_array: collect SELECT results into a numpy structured array."""
+"""query_to_array: collect SELECT results into a numpy structured array;
+query_to_columns: into one 1-D array per column; query_iter_arrays: stream
+them in fixed-size chunks; parallel_query_to_array: read rowid-range shards
+of a database file concurrently; PreparedQuery: rerun a parameterized SELECT
+without re-preparing it, from Python or @njit code."""
 import ctypes
+import os
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from inspect import getfile
+from io import StringIO
 
 import numpy as np
-from numba import njit, carray
+from numba import njit, carray, from_dtype, literal_unroll
+from numba.core import types
+from numba.core.errors import TypingError
 from numba.core.types import uint8, uint32
+from numba.cpython.unicode import (
+    PY_UNICODE_1BYTE_KIND, PY_UNICODE_2BYTE_KIND, PY_UNICODE_4BYTE_KIND, _empty_string, _set_code_point,
+)
+from numba.extending import overload
 
-from numbox.core.bindings.sqlite.constants import SQLITE_ROW, SQLITE_NULL, SQLITE_OK, SQLITE_DONE
-from numbox.core.bindings.sqlite.stmt import sqlite3_prepare_v2, sqlite3_step, sqlite3_finalize
+from numbox.core.bindings.sqlite.bind import (
+    sqlite3_bind_double, sqlite3_bind_int64, sqlite3_bind_null, sqlite3_bind_text,
+)
+from numbox.core.bindings.sqlite.constants import (
+    SQLITE_ROW, SQLITE_NULL, SQLITE_OK, SQLITE_DONE, SQLITE_TRANSIENT, SQLITE_OPEN_READONLY, SQLITE_OPEN_NOMUTEX,
+)
+from numbox.core.bindings.sqlite.stmt import (
+    sqlite3_prepare_v2, sqlite3_step, sqlite3_finalize, sqlite3_reset, sqlite3_clear_bindings,
+)
 from numbox.core.bindings.sqlite.column import (
     sqlite3_column_count, sqlite3_column_type, sqlite3_column_int64, sqlite3_column_double,
     sqlite3_column_text, sqlite3_column_blob, sqlite3_column_bytes,
 )
-from numbox.core.bindings.sqlite.conn import sqlite3_errmsg
+from numbox.core.bindings.sqlite.conn import sqlite3_close, sqlite3_errmsg, sqlite3_open_v2
 from numbox.core.bindings.sqlite._typemap import (
     _col_tag,
     _TAG_I8, _TAG_I16, _TAG_I32, _TAG_I64, _TAG_U8, _TAG_U16, _TAG_U32, _TAG_U64,
     _TAG_F32, _TAG_F64, _TAG_BOOL, _TAG_S, _TAG_U, _TAG_BLOB,
 )
 from numbox.core.configurations import jit_options
+from numbox.core.vector.vector import make_vector, vector_push
+from numbox.utils.cstrings import c_string
 from numbox.utils.lowlevel import _cast_int_to_void_p
 
-__all__ = ["query_to_array"]
+__all__ = [
+    "query_to_array", "query_to_columns", "query_iter_arrays", "parallel_query_to_array", "rowid_shards",
+    "PreparedQuery", "StatementCache", "statement_cache", "close_statement_cache", "bind_params", "run_prepared",
+]
+
+_DEFAULT_CACHE_SIZE = 64
 
 
 @njit(**jit_options)
@@ -34,10 +65,11 @@ def _copy_bytes(dst, off, src, nbytes):
 def _put_unicode(buf, off, scratch8, src_p, nbytes, width_cp):
     """Decode UTF-8 at ``src_p`` into up to ``width_cp`` UTF-32 code points and
     write them into ``buf`` at ``off`` in the platform's NATIVE byte order (via a
-    uint32 view of ``scratch8``, matching numpy's 'U' dtype). Mirrors
-    ``_typemap.utf8_to_utf32`` but writes natively into ``buf`` (a tracked
-    uint8 array view) instead of a raw pointer -- raw-pointer stores get
-    dead-code-eliminated by the macOS-arm64 optimizer. Malformed input -> U+FFFD."""
+    uint32 view of ``scratch8``, matching numpy's 'U' dtype); return how many
+    were written. Mirrors ``_typemap.utf8_to_utf32`` but writes natively into
+    ``buf`` (a tracked uint8 array view) instead of a raw pointer -- raw-pointer
+    stores get dead-code-eliminated by the macOS-arm64 optimizer. Malformed
+    input -> U+FFFD."""
     inp = carray(_cast_int_to_void_p(src_p), (nbytes,), dtype=np.uint8)
     cps = scratch8.view(np.uint32)
     i = 0
@@ -70,6 +102,7 @@ def _put_unicode(buf, off, scratch8, src_p, nbytes, width_cp):
         cps[0] = cp
         _copy_bytes(buf, off + 4 * k, scratch8, 4)
         k += 1
+    return k
 
 
 @njit(**jit_options)
@@ -158,20 +191,37 @@ def _query_core(stmt, ncols, offsets, tags, widths, itemsize):
     return out_u8[:n * itemsize].copy(), rc
 
 
-def _raise_rc(db, rc):
+@njit(**jit_options)
+def _fill_chunk(stmt, ncols, offsets, tags, widths, itemsize, out_u8, max_rows):
+    """Step ``stmt`` for up to ``max_rows`` rows into the uint8 view ``out_u8``,
+    zeroing each row before its cells are stored (the buffer may be reused).
+    Returns ``(n, rc)``: ``rc`` is SQLITE_ROW when the chunk filled up before
+    the statement ran out, else the terminal step return code."""
+    scratch8 = np.empty(8, np.uint8)
+    n = 0
+    rc = SQLITE_ROW
+    while n < max_rows:
+        rc = sqlite3_step(stmt)
+        if rc != SQLITE_ROW:
+            break
+        row_off = n * itemsize
+        out_u8[row_off:row_off + itemsize] = 0
+        for j in range(ncols):
+            _store_cell(out_u8, row_off + offsets[j], tags[j], widths[j], stmt, j, scratch8)
+        n += 1
+    return n, rc
+
+
+def _raise_rc(db, rc, what="query_to_array"):
     msg_p = sqlite3_errmsg(db)
     detail = ""
     if msg_p:
         detail = ": " + ctypes.cast(msg_p, ctypes.c_char_p).value.decode("utf-8", "replace")
-    raise RuntimeError("query_to_array failed (rc=%d)%s" % (rc, detail))
+    raise RuntimeError("%s failed (rc=%d)%s" % (what, rc, detail))
 
 
-def query_to_array(db, sql_p, dtype):
-    """Run the NUL-terminated SQL text at pointer ``sql_p`` on ``db`` and return
-    its rows as a 1-D numpy structured array of ``dtype`` (one field per result
-    column, by position). ``sql_p`` is a char* pointer (e.g. from
-    ``numbox.utils.cstrings.c_string`` or ``get_unicode_data_p``), not a Python
-    str. NULL -> NaN (float) / 0 (int) / empty (text/blob)."""
+def _layout(dtype):
+    """Per-field (offsets, tags, widths) of the structured ``dtype``."""
     if dtype.fields is None or dtype.names is None:
         raise TypeError("dtype must be a structured numpy dtype, got %r" % (dtype,))
     names = list(dtype.names)
@@ -179,17 +229,608 @@ def query_to_array(db, sql_p, dtype):
     subs = [dtype.fields[nm][0] for nm in names]
     tags = np.array([_col_tag(s, False) for s in subs], dtype=np.int64)
     widths = np.array([int(s.itemsize) for s in subs], dtype=np.int64)
+    return offsets, tags, widths
+
+
+def _prepare(db, sql_p, nfields, what):
+    """Prepare ``sql_p`` and check it returns ``nfields`` columns."""
     stmt = ctypes.c_int64(0)
     rc = sqlite3_prepare_v2(db, sql_p, -1, ctypes.addressof(stmt), 0)
     if rc != SQLITE_OK:
-        _raise_rc(db, rc)
+        _raise_rc(db, rc, what)
+    ncols = sqlite3_column_count(stmt.value)
+    if ncols != nfields:
+        sqlite3_finalize(stmt.value)
+        raise ValueError("dtype has %d fields but query returns %d columns" % (nfields, ncols))
+    return stmt.value
+
+
+def query_to_array(db, sql_p, dtype):
+    """Run the NUL-terminated SQL text at pointer ``sql_p`` on ``db`` and return
+    its rows as a 1-D numpy structured array of ``dtype`` (one field per result
+    column, by position). ``sql_p`` is a char* pointer (e.g. from
+    ``numbox.utils.cstrings.c_string`` or ``get_unicode_data_p``), not a Python
+    str. NULL -> NaN (float) / 0 (int) / empty (text/blob)."""
+    offsets, tags, widths = _layout(dtype)
+    stmt = _prepare(db, sql_p, len(offsets), "query_to_array")
     try:
-        ncols = sqlite3_column_count(stmt.value)
-        if ncols != len(names):
-            raise ValueError("dtype has %d fields but query returns %d columns" % (len(names), ncols))
-        buf, last_rc = _query_core(stmt.value, ncols, offsets, tags, widths, int(dtype.itemsize))
+        buf, last_rc = _query_core(stmt, len(offsets), offsets, tags, widths, int(dtype.itemsize))
         if last_rc != SQLITE_DONE:
             _raise_rc(db, last_rc)
         return buf.view(dtype)
     finally:
-        sqlite3_finalize(stmt.value)
+        sqlite3_finalize(stmt)
+
+
+def query_iter_arrays(db, sql_p, dtype, chunk_rows, *, out=None):
+    """Like `query_to_array`, but return an iterator over the rows in
+    consecutive structured-array chunks of at most ``chunk_rows`` rows, so peak
+    memory is one chunk rather than the whole result set.
+
+    The statement is prepared (and ``sql_p`` read) by this call, which raises
+    for bad SQL or a column-count mismatch; it stays open until the iterator is
+    exhausted or closed (``close()``, or garbage collection). Each chunk is a
+    fresh array unless ``out`` -- a 1-D array of ``dtype`` with at least
+    ``chunk_rows`` rows -- is given: then every chunk is a view of ``out``,
+    overwritten by the next one."""
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive, got %r" % (chunk_rows,))
+    offsets, tags, widths = _layout(dtype)
+    if out is not None:
+        if out.dtype != dtype or out.ndim != 1 or not out.flags.c_contiguous or len(out) < chunk_rows:
+            raise ValueError("out must be a C-contiguous 1-D array of %r with at least %d rows"
+                             % (dtype, chunk_rows))
+    stmt = _prepare(db, sql_p, len(offsets), "query_iter_arrays")
+    return _ChunkIterator(db, stmt, dtype, int(chunk_rows), offsets, tags, widths, out)
+
+
+class _ChunkIterator:
+    """Iterator of `query_iter_arrays`: owns the prepared statement and
+    finalizes it once exhausted, on error, on `close` or when collected --
+    also when it is dropped before the first chunk."""
+
+    def __init__(self, db, stmt, dtype, chunk_rows, offsets, tags, widths, out):
+        self.db = db
+        self.stmt = stmt
+        self.dtype = dtype
+        self.chunk_rows = chunk_rows
+        self._layout = (offsets, tags, widths)
+        self.out = out
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        offsets, tags, widths = self._layout
+        while self.stmt:
+            chunk = np.empty(self.chunk_rows, self.dtype) if self.out is None else self.out
+            try:
+                n, rc = _fill_chunk(self.stmt, len(offsets), offsets, tags, widths, int(self.dtype.itemsize),
+                                    chunk.view(np.uint8), self.chunk_rows)
+                if rc != SQLITE_ROW and rc != SQLITE_DONE:
+                    _raise_rc(self.db, rc, "query_iter_arrays")
+            except BaseException:
+                self.close()
+                raise
+            if rc != SQLITE_ROW:
+                self.close()
+            if n > 0:
+                return chunk[:n]
+        raise StopIteration
+
+    def close(self):
+        stmt, self.stmt = self.stmt, 0
+        if stmt:
+            sqlite3_finalize(stmt)
+
+    def __del__(self):
+        if getattr(self, "stmt", 0):
+            self.close()
+
+
+@njit(**jit_options)
+def _push_text(v, tag, width, stmt, j, scratch8):
+    """Append column ``j`` as one ``width``-byte 'S' / 'U' cell to the uint8
+    Vector ``v``, growing it geometrically."""
+    needed = v.size + width
+    cap = v.buf.shape[0]
+    if needed > cap:
+        while cap < needed:
+            cap *= 2
+        new_buf = np.empty(cap, np.uint8)
+        new_buf[:v.size] = v.buf[:v.size]
+        v.buf = new_buf
+    v.buf[v.size:needed] = 0
+    _store_cell(v.buf, v.size, tag, width, stmt, j, scratch8)
+    v.size = needed
+
+
+def _push_cell(*args):
+    raise NotImplementedError
+
+
+@overload(_push_cell, strict=False, jit_options=jit_options)
+def ol_push_cell(v_ty, tag_ty, width_ty, stmt_ty, j_ty, scratch8_ty):
+    """Append column ``j`` of the current row to the Vector ``v`` as its
+    element type: NULL -> NaN (float) / 0 (int, bool); a uint8 Vector of a
+    text column (tag 'S' / 'U') takes ``width`` bytes per row instead."""
+    elem = v_ty.field_dict["buf"].dtype
+    if isinstance(elem, types.Float):
+        def _impl(v, tag, width, stmt, j, scratch8):
+            if sqlite3_column_type(stmt, j) == SQLITE_NULL:
+                vector_push(v, elem(np.nan))
+            else:
+                vector_push(v, elem(sqlite3_column_double(stmt, j)))
+    elif isinstance(elem, types.Boolean):
+        def _impl(v, tag, width, stmt, j, scratch8):
+            vector_push(v, sqlite3_column_int64(stmt, j) != 0)
+    elif elem == types.uint8:
+        def _impl(v, tag, width, stmt, j, scratch8):
+            if tag == _TAG_S or tag == _TAG_U:
+                _push_text(v, tag, width, stmt, j, scratch8)
+            else:
+                vector_push(v, elem(sqlite3_column_int64(stmt, j)))
+    else:
+        def _impl(v, tag, width, stmt, j, scratch8):
+            vector_push(v, elem(sqlite3_column_int64(stmt, j)))
+    return _impl
+
+
+@njit(**jit_options)
+def _columns_core(stmt, columns, tags, widths):
+    """Step ``stmt`` to exhaustion, appending each result column to its Vector
+    in the (heterogeneous) tuple ``columns``. Returns ``(n, rc)`` like
+    ``_query_core``."""
+    scratch8 = np.empty(8, np.uint8)
+    n = 0
+    rc = sqlite3_step(stmt)
+    while rc == SQLITE_ROW:
+        j = 0
+        for v in literal_unroll(columns):
+            _push_cell(v, tags[j], widths[j], stmt, j, scratch8)
+            j += 1
+        n += 1
+        rc = sqlite3_step(stmt)
+    return n, rc
+
+
+def query_to_columns(db, sql_p, columns):
+    """Like `query_to_array`, but return the rows column by column: a dict
+    mapping each key of ``columns`` -- a ``{name: dtype}`` dict, one entry
+    per result column, by position -- to a 1-D array of its dtype.
+
+    Numeric columns are appended to typed ``numbox.core.vector`` Vectors as
+    they are stepped, with no structured-array detour; fixed-width 'S' / 'U'
+    columns grow a byte Vector of ``width`` bytes per row."""
+    names = list(columns)
+    dtypes = [np.dtype(columns[name]) for name in names]
+    tags = np.array([_col_tag(dt, False) for dt in dtypes], dtype=np.int64)
+    widths = np.array([int(dt.itemsize) for dt in dtypes], dtype=np.int64)
+    vectors = []
+    for dt, tag in zip(dtypes, tags):
+        if tag == _TAG_S or tag == _TAG_U:
+            vectors.append(make_vector(uint8)[0](16 * dt.itemsize))
+        else:
+            vectors.append(make_vector(from_dtype(dt))[0](16))
+    stmt = _prepare(db, sql_p, len(names), "query_to_columns")
+    try:
+        n, last_rc = _columns_core(stmt, tuple(vectors), tags, widths)
+        if last_rc != SQLITE_DONE:
+            _raise_rc(db, last_rc, "query_to_columns")
+    finally:
+        sqlite3_finalize(stmt)
+    # .copy() trims the growth slack, as in _query_core
+    return {name: v.buf[:n * dt.itemsize].view(dt).copy() if dt.kind in "SU" else v.buf[:n].copy()
+            for name, dt, v in zip(names, dtypes, vectors)}
+
+
+@njit(**{**jit_options, "nogil": True})
+def _shard_core(stmt, lo, hi, ncols, offsets, tags, widths, itemsize):
+    """Bind the rowid range ``[lo, hi)`` to parameters 1 and 2 of ``stmt`` and
+    run `_query_core` -- without the GIL, so shards run concurrently."""
+    rc = sqlite3_bind_int64(stmt, 1, lo)
+    if rc == SQLITE_OK:
+        rc = sqlite3_bind_int64(stmt, 2, hi)
+    if rc != SQLITE_OK:
+        return np.zeros(0, np.uint8), rc
+    return _query_core(stmt, ncols, offsets, tags, widths, itemsize)
+
+
+def _open_readonly(path):
+    db = ctypes.c_int64(0)
+    with c_string(path) as path_p:
+        rc = sqlite3_open_v2(path_p, ctypes.addressof(db), SQLITE_OPEN_READONLY | SQLITE_OPEN_NOMUTEX, 0)
+    if rc != SQLITE_OK:
+        try:
+            _raise_rc(db.value, rc, "sqlite3_open_v2(%r)" % (path,))
+        finally:
+            sqlite3_close(db.value)
+    return db.value
+
+
+def rowid_shards(path, table, shards):
+    """Split the rowid span of ``table`` in the database at ``path`` into at
+    most ``shards`` contiguous ``(lo, hi)`` ranges (``hi`` exclusive) for
+    `parallel_query_to_array`. Ranges are equal in rowid span, not in row
+    count; an empty table has no shards."""
+    if shards <= 0:
+        raise ValueError("shards must be positive, got %r" % (shards,))
+    db = _open_readonly(path)
+    try:
+        sql = 'SELECT min(rowid), max(rowid), max(rowid) IS NULL FROM "%s"' % table.replace('"', '""')
+        with c_string(sql) as sql_p:
+            span = query_to_array(db, sql_p, np.dtype([("lo", "i8"), ("hi", "i8"), ("empty", "?")]))
+    finally:
+        sqlite3_close(db)
+    if span["empty"][0]:
+        return []
+    lo, hi = int(span["lo"][0]), int(span["hi"][0]) + 1
+    step = -(-(hi - lo) // shards)
+    return [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+
+
+def _run_shard(path, sql_p, lo, hi, dtype, offsets, tags, widths):
+    db = _open_readonly(path)
+    try:
+        stmt = _prepare(db, sql_p, len(offsets), "parallel_query_to_array")
+        try:
+            buf, rc = _shard_core(stmt, lo, hi, len(offsets), offsets, tags, widths, int(dtype.itemsize))
+            if rc != SQLITE_DONE:
+                _raise_rc(db, rc, "parallel_query_to_array")
+        finally:
+            sqlite3_finalize(stmt)
+    finally:
+        sqlite3_close(db)
+    return buf.view(dtype)
+
+
+def parallel_query_to_array(path, sql_template, shards, dtype, *, max_workers=None):
+    """Like `query_to_array`, but run one query per rowid range in ``shards``
+    -- a sequence of ``(lo, hi)`` pairs, e.g. from `rowid_shards` -- on its own
+    read-only connection to the database file at ``path``, concurrently on a
+    thread pool of ``max_workers`` threads (default: one per shard, at most
+    ``os.cpu_count()``). Each shard's rows are read with the GIL released.
+
+    ``sql_template`` is SQL text whose parameters ``?1`` and ``?2`` receive a
+    shard's ``lo`` and ``hi``, e.g. ``SELECT ... WHERE rowid >= ?1 AND rowid <
+    ?2 ORDER BY rowid``. The result is the shards' rows concatenated in
+    ``shards`` order into one preallocated array of ``dtype``."""
+    offsets, tags, widths = _layout(dtype)
+    shards = [(int(lo), int(hi)) for lo, hi in shards]
+    if max_workers is None:
+        max_workers = min(len(shards), os.cpu_count() or 1)
+    if not shards:
+        return np.empty(0, dtype)
+    with c_string(sql_template) as sql_p, ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+        futures = [pool.submit(_run_shard, path, sql_p, lo, hi, dtype, offsets, tags, widths) for lo, hi in shards]
+        parts = [f.result() for f in futures]
+    out = np.empty(sum(len(part) for part in parts), dtype)
+    start = 0
+    for part in parts:
+        out[start:start + len(part)] = part
+        start += len(part)
+    return out
+
+
+@njit(**jit_options)
+def _utf8_encode(s):
+    """UTF-8 bytes of the unicode string ``s`` (numba stores strings as
+    UCS-1/2/4, not UTF-8), NUL-terminated; the last byte is not part of the
+    text. Lone surrogates -> U+FFFD, as in ``_typemap.utf32_to_utf8``."""
+    n = 0
+    for ch in s:
+        cp = ord(ch)
+        n += 1 if cp < 0x80 else 2 if cp < 0x800 else 3 if cp < 0x10000 else 4
+    out = np.zeros(n + 1, np.uint8)
+    k = 0
+    for ch in s:
+        cp = ord(ch)
+        if 0xD800 <= cp <= 0xDFFF:
+            cp = 0xFFFD
+        if cp < 0x80:
+            out[k] = cp
+            k += 1
+        elif cp < 0x800:
+            out[k] = 0xC0 | (cp >> 6)
+            out[k + 1] = 0x80 | (cp & 0x3F)
+            k += 2
+        elif cp < 0x10000:
+            out[k] = 0xE0 | (cp >> 12)
+            out[k + 1] = 0x80 | ((cp >> 6) & 0x3F)
+            out[k + 2] = 0x80 | (cp & 0x3F)
+            k += 3
+        else:
+            out[k] = 0xF0 | (cp >> 18)
+            out[k + 1] = 0x80 | ((cp >> 12) & 0x3F)
+            out[k + 2] = 0x80 | ((cp >> 6) & 0x3F)
+            out[k + 3] = 0x80 | (cp & 0x3F)
+            k += 4
+    return out
+
+
+@njit(**jit_options)
+def _utf8_decode(src_p, nbytes):
+    """The unicode string of the ``nbytes`` UTF-8 bytes at ``src_p`` (malformed
+    input -> U+FFFD), in the narrowest numba string kind that holds it."""
+    buf = np.zeros(4 * nbytes, np.uint8)
+    n = _put_unicode(buf, 0, np.empty(8, np.uint8), src_p, nbytes, nbytes)
+    cps = buf.view(np.uint32)
+    max_cp = uint32(0)
+    for i in range(n):
+        max_cp = max(max_cp, cps[i])
+    if max_cp < 0x100:
+        kind = PY_UNICODE_1BYTE_KIND
+    elif max_cp < 0x10000:
+        kind = PY_UNICODE_2BYTE_KIND
+    else:
+        kind = PY_UNICODE_4BYTE_KIND
+    s = _empty_string(kind, n, max_cp < 0x80)
+    for i in range(n):
+        _set_code_point(s, i, cps[i])
+    return s
+
+
+@njit(**jit_options)
+def _charseq_bytes(v):
+    """The bytes of an 'S' record field up to its trailing NULs, NUL-terminated."""
+    n = len(v)
+    out = np.zeros(n + 1, np.uint8)
+    for k in range(n):
+        out[k] = v[k]
+    return out
+
+
+@njit(**jit_options)
+def _bind_text_bytes(stmt, idx, buf):
+    """Bind the NUL-terminated uint8 array ``buf`` as TEXT. SQLite copies it
+    (SQLITE_TRANSIENT); ``buf`` is never empty, so '' does not bind as NULL."""
+    return sqlite3_bind_text(stmt, idx, buf.ctypes.data, len(buf) - 1, SQLITE_TRANSIENT)
+
+
+def _bind_value(*args):
+    raise NotImplementedError
+
+
+@overload(_bind_value, strict=False, jit_options=jit_options)
+def ol_bind_value(stmt_ty, idx_ty, value_ty):
+    if isinstance(value_ty, (types.Boolean, types.Integer)):
+        def _impl(stmt, idx, value):
+            return sqlite3_bind_int64(stmt, idx, np.int64(value))
+    elif isinstance(value_ty, types.Float):
+        def _impl(stmt, idx, value):
+            return sqlite3_bind_double(stmt, idx, np.float64(value))
+    elif isinstance(value_ty, types.UnicodeType):
+        def _impl(stmt, idx, value):
+            return _bind_text_bytes(stmt, idx, _utf8_encode(value))
+    elif isinstance(value_ty, types.UnicodeCharSeq):
+        def _impl(stmt, idx, value):
+            return _bind_text_bytes(stmt, idx, _utf8_encode(str(value)))
+    elif isinstance(value_ty, types.CharSeq):
+        def _impl(stmt, idx, value):
+            return _bind_text_bytes(stmt, idx, _charseq_bytes(value))
+    elif isinstance(value_ty, types.NoneType):
+        def _impl(stmt, idx, value):
+            return sqlite3_bind_null(stmt, idx)
+    else:
+        raise TypingError(f"bind_params: cannot bind a parameter of type {value_ty}")
+    return _impl
+
+
+def bind_params(*args):
+    """``bind_params(stmt, params) -> rc``: bind ``params`` -- a tuple, or a
+    structured-array row (numpy record) -- to the ``?`` parameters of ``stmt``
+    by position, stopping at the first bind error. Integers and booleans bind
+    as INTEGER, floats as REAL, str / 'U' / 'S' values as UTF-8 TEXT and None
+    as NULL. @njit only."""
+    raise NotImplementedError
+
+
+def _make_bind_params_code(accessors):
+    code_txt = StringIO()
+    code_txt.write("""
+def _bind_params_(stmt, params):""")
+    for ind, accessor in enumerate(accessors):
+        code_txt.write(f"""
+    rc = _bind_value(stmt, {ind + 1}, params[{accessor}])
+    if rc != SQLITE_OK:
+        return rc""")
+    code_txt.write("""
+    return SQLITE_OK""")
+    return code_txt.getvalue()
+
+
+@overload(bind_params, strict=False, jit_options=jit_options)
+def ol_bind_params(stmt_ty, params_ty):
+    if isinstance(params_ty, types.Record):
+        accessors = [repr(name) for name, _ in params_ty.members]
+    elif isinstance(params_ty, types.BaseTuple):
+        accessors = [str(ind) for ind in range(len(params_ty))]
+    else:
+        raise TypingError(f"bind_params: params must be a tuple or a record, got {params_ty}")
+    code_txt = _make_bind_params_code(accessors)
+    ns = {"_bind_value": _bind_value, "SQLITE_OK": SQLITE_OK}
+    code = compile(code_txt, getfile(bind_params), mode="exec")
+    exec(code, ns)  # nosec B102 - JIT codegen of internal source
+    return ns["_bind_params_"]
+
+
+@njit(**jit_options)
+def run_prepared(handle, params):
+    """Rebind ``params`` (see `bind_params`) to a `PreparedQuery`'s statement
+    and run it; ``handle`` is ``PreparedQuery.handle``. Returns ``(buf, rc)``
+    like ``_query_core``: ``buf`` holds the rows' bytes (view it as the query's
+    dtype) and ``rc`` is SQLITE_DONE on success, else the failing bind / step
+    code (``buf`` then holds the rows read so far). The statement is reset on
+    return, so it holds no read transaction between calls."""
+    stmt, offsets, tags, widths, itemsize = handle
+    sqlite3_reset(stmt)
+    sqlite3_clear_bindings(stmt)
+    rc = bind_params(stmt, params)
+    if rc != SQLITE_OK:
+        return np.zeros(0, np.uint8), rc
+    buf, rc = _query_core(stmt, len(offsets), offsets, tags, widths, itemsize)
+    sqlite3_reset(stmt)
+    return buf, rc
+
+
+class StatementCache:
+    """Bounded LRU of one connection's idle prepared statements, keyed by SQL
+    text. `acquire` checks a statement out (preparing it on a miss) and
+    `release` checks it back in, finalizing the least recently used ones over
+    ``capacity``. Get it with `statement_cache`."""
+
+    def __init__(self, db, capacity=_DEFAULT_CACHE_SIZE):
+        if capacity < 0:
+            raise ValueError("capacity must be non-negative, got %r" % (capacity,))
+        self.db = db
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._idle = OrderedDict()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self, sql, what="PreparedQuery"):
+        """Check out a statement for ``sql``, preparing it on a cache miss."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("the statement cache of this connection is closed")
+            stmt = self._idle.pop(sql, None)
+            if stmt is not None:
+                self.hits += 1
+                return stmt
+            self.misses += 1
+        stmt = ctypes.c_int64(0)
+        with c_string(sql) as sql_p:
+            rc = sqlite3_prepare_v2(self.db, sql_p, -1, ctypes.addressof(stmt), 0)
+        if rc != SQLITE_OK:
+            _raise_rc(self.db, rc, what)
+        if stmt.value == 0:
+            raise ValueError("sql contains no statement: %r" % (sql,))
+        return stmt.value
+
+    def release(self, sql, stmt):
+        """Reset ``stmt`` and check it back in as the most recently used."""
+        sqlite3_reset(stmt)
+        sqlite3_clear_bindings(stmt)
+        with self._lock:
+            if self._closed or sql in self._idle:
+                evicted = [stmt]
+            else:
+                self._idle[sql] = stmt
+                evicted = self._evict()
+        for old in evicted:
+            sqlite3_finalize(old)
+
+    def resize(self, capacity):
+        if capacity < 0:
+            raise ValueError("capacity must be non-negative, got %r" % (capacity,))
+        with self._lock:
+            self.capacity = capacity
+            evicted = self._evict()
+        for old in evicted:
+            sqlite3_finalize(old)
+
+    def clear(self):
+        """Finalize every idle statement."""
+        with self._lock:
+            evicted = list(self._idle.values())
+            self._idle.clear()
+        for old in evicted:
+            sqlite3_finalize(old)
+
+    def _evict(self):
+        evicted = []
+        while len(self._idle) > self.capacity:
+            evicted.append(self._idle.popitem(last=False)[1])
+        return evicted
+
+
+_statement_caches = {}
+_statement_caches_lock = threading.Lock()
+
+
+def statement_cache(db, capacity=None):
+    """The `StatementCache` of connection ``db``, created on first use with
+    ``capacity`` (default 64) idle statements; an existing cache is resized
+    when ``capacity`` is given. Call `close_statement_cache` before
+    ``sqlite3_close(db)``: a connection with unfinalized statements does not
+    close (SQLITE_BUSY)."""
+    with _statement_caches_lock:
+        cache = _statement_caches.get(db)
+        if cache is None:
+            cache = _statement_caches[db] = StatementCache(
+                db, _DEFAULT_CACHE_SIZE if capacity is None else capacity)
+            return cache
+    if capacity is not None:
+        cache.resize(capacity)
+    return cache
+
+
+def close_statement_cache(db):
+    """Finalize and forget the cached statements of ``db``. Statements still
+    checked out by open `PreparedQuery` objects are finalized when those close,
+    which must also happen before ``sqlite3_close(db)``."""
+    with _statement_caches_lock:
+        cache = _statement_caches.pop(db, None)
+    if cache is not None:
+        with cache._lock:
+            cache._closed = True
+        cache.clear()
+
+
+class PreparedQuery:
+    """A parameterized SELECT (``?`` placeholders) that reruns without being
+    re-parsed or re-planned, returning its rows like `query_to_array`.
+
+    The statement is checked out of the connection's `StatementCache`, so
+    constructing a `PreparedQuery` for SQL seen before on ``db`` is also cheap;
+    `close` (or leaving a ``with`` block) checks it back in. Call the object
+    with a tuple or a structured-array row of parameters (see `bind_params`).
+    From @njit code, pass ``handle`` in and call ``run_prepared(handle,
+    params)``. One `PreparedQuery` runs one query at a time; it is not safe to
+    share between threads."""
+
+    def __init__(self, db, sql, dtype):
+        dtype = np.dtype(dtype)
+        offsets, tags, widths = _layout(dtype)
+        cache = statement_cache(db)
+        stmt = cache.acquire(sql)
+        ncols = sqlite3_column_count(stmt)
+        if ncols != len(offsets):
+            cache.release(sql, stmt)
+            raise ValueError("dtype has %d fields but query returns %d columns" % (len(offsets), ncols))
+        self.db = db
+        self.sql = sql
+        self.dtype = dtype
+        self.stmt = stmt
+        self.handle = (stmt, offsets, tags, widths, int(dtype.itemsize))
+        self._cache = cache
+
+    def __call__(self, params=()):
+        if not self.stmt:
+            raise RuntimeError("PreparedQuery is closed")
+        if isinstance(params, list):
+            params = tuple(params)
+        buf, rc = run_prepared(self.handle, params)
+        if rc != SQLITE_DONE:
+            _raise_rc(self.db, rc, "PreparedQuery")
+        return buf.view(self.dtype)
+
+    def close(self):
+        stmt, self.stmt = self.stmt, 0
+        if stmt:
+            self._cache.release(self.sql, stmt)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "stmt", 0):
+            self.close()
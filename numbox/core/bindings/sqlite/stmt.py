@@ -1,5 +1,5 @@
 """SQLite statement-lifecycle bindings: prepare_v2 / finalize / reset / step /
-sql / expanded_sql / stmt_busy.
+sql / expanded_sql / stmt_busy / clear_bindings.
 
 Note: ``sqlite3_expanded_sql`` returns a ``char *`` the caller MUST free via
 ``sqlite3_free`` (bound in sqlite/exec.py). Document this with each call site
@@ -15,7 +15,7 @@ from numbox.core.proxy.proxy import proxy
 
 __all__ = [
     "sqlite3_prepare_v2", "sqlite3_finalize", "sqlite3_reset", "sqlite3_step",
-    "sqlite3_sql", "sqlite3_expanded_sql", "sqlite3_stmt_busy",
+    "sqlite3_sql", "sqlite3_expanded_sql", "sqlite3_stmt_busy", "sqlite3_clear_bindings",
 ]
 
 
@@ -55,3 +55,8 @@ def sqlite3_expanded_sql(stmt_p):
 @proxy(signatures.get("sqlite3_stmt_busy"), jit_options=jit_options)
 def sqlite3_stmt_busy(stmt_p):
     return _call_lib_func("sqlite3_stmt_busy", (stmt_p,))
+
+
+@proxy(signatures.get("sqlite3_clear_bindings"), jit_options=jit_options)
+def sqlite3_clear_bindings(stmt_p):
+    return _call_lib_func("sqlite3_clear_bindings", (stmt_p,))
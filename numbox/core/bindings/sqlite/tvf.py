@@ -20,6 +20,15 @@ from this registration's cfunc addresses. The handle retains the module struct,
 every cfunc object (SQLite stores their addresses), the descriptor buffers, and
 ``fn``; its keep-alive lives in the module-level ``_DATA_ANCHOR`` (released by
 SQLite via ``xDestroy``).
+
+``register_tvf_stream`` is the lazy variant for row counts that should not be
+materialized: a stateful producer ``init(*args) -> state`` /
+``next_chunk(state, out) -> n`` refills one per-cursor chunk buffer of
+``chunk_rows`` rows, pulled by a generated ``xNext`` only when the cursor runs
+past the current chunk. Memory stays bounded to one chunk and the state, and a
+``LIMIT`` stops the producer early -- SQLite simply never asks for the next
+chunk. Both variants share the cursor layout and the column reader; an eager
+cursor is a stream whose only chunk is the returned array.
 """
 import ctypes
 
@@ -31,6 +40,7 @@ from numbox.core.bindings.sqlite.constants import (
     SQLITE_INDEX_CONSTRAINT_EQ,
 )
 from numbox.core.bindings.sqlite._typemap import _col_tag, _SQL_TYPE, tags_buf_t
+from numbox.core.bindings.sqlite.udf_helpers import _prepare_callbacks, _state_id, _validate_state_type
 from numbox.core.bindings.sqlite.vtable import (
     _Sqlite3Module, _SQLITE3_VTAB_CURSOR_DTYPE, _VTAB_DTYPE, _VTAB_SIZE,
     _IDX_INFO_DTYPE, _CONSTRAINT_DTYPE, _USAGE_DTYPE,
@@ -66,10 +76,10 @@ from numbox.utils.lowlevel import (  # noqa: F401
     _cast_int_to_void_p, get_unicode_data_p, load_unaligned, store_at, array_data_p,
 )
 from numbox.utils.meminfo import (  # noqa: F401
-    structref_meminfo, _incref_meminfo, release_meminfo,
+    structref_meminfo, _incref_meminfo, release_meminfo, borrow_structref, export_meminfo,
 )
 
-__all__ = ["register_tvf"]
+__all__ = ["register_tvf", "register_tvf_stream"]
 
 _CACHE = jit_options.get("cache", True)
 _SQLITE_TRANSIENT = -1
@@ -87,9 +97,13 @@ _TVF_DESC_DTYPE = np.dtype([
     ("schema_ptr", "i8"), ("scratch_bytes", "i8"),
 ], align=True)
 
+# rowid indexes the current chunk (the whole array for register_tvf); the row
+# id SQLite sees is row_base + rowid. state_p is the stream producer's state
+# meminfo, 0 for register_tvf.
 _TVF_CUR_DTYPE = np.dtype([
     ("base", _SQLITE3_VTAB_CURSOR_DTYPE), ("descriptor", "i8"), ("rowid", "i8"),
     ("mi_p", "i8"), ("data_p", "i8"), ("n_rows", "i8"), ("row_stride", "i8"), ("scratch_p", "i8"),
+    ("state_p", "i8"), ("row_base", "i8"),
 ], align=True)
 _TVF_CUR_SIZE = _TVF_CUR_DTYPE.itemsize
 
@@ -131,6 +145,54 @@ def _tvf_xfilter_impl(cur, argc, argv):
     c[0].row_stride = result.strides[0]
 '''
 
+# Baked globals of the streaming variant: _init, _next_chunk, _state_type,
+# _OUT_DTYPE, _CHUNK_ROWS, _N_HIDDEN. The chunk buffer is pinned in mi_p /
+# data_p exactly like register_tvf's result array, the state in state_p; both
+# are released by the next xFilter or by xClose.
+_STREAM_XFILTER_SRC = '''
+@njit(**jit_options)
+def _tvf_xfilter_impl(cur, argc, argv):
+    c = carray(_cast_int_to_void_p(cur), (1,), dtype=_TVF_CUR_DTYPE)
+    if c[0].mi_p != 0:
+        release_meminfo(c[0].mi_p)
+        c[0].mi_p = 0
+        c[0].data_p = 0
+        c[0].n_rows = 0
+        c[0].row_stride = 0
+    if c[0].state_p != 0:
+        release_meminfo(c[0].state_p)
+        c[0].state_p = 0
+    c[0].rowid = 0
+    c[0].row_base = 0
+    if argc < _N_HIDDEN:
+        return
+    vals = carray(_cast_int_to_void_p(argv), (argc,), dtype=np.intp)
+{arg_decode}
+    state = {init_call}
+    c[0].state_p = export_meminfo(state)
+    chunk = np.empty(_CHUNK_ROWS, _OUT_DTYPE)
+    mi_p, _base = structref_meminfo(chunk)
+    _incref_meminfo(mi_p)
+    c[0].mi_p = mi_p
+    c[0].data_p = array_data_p(chunk)
+    c[0].row_stride = chunk.strides[0]
+    c[0].n_rows = min(max(int64(_next_chunk(state, chunk)), 0), _CHUNK_ROWS)
+'''
+
+_STREAM_XNEXT_SRC = '''
+@njit(**jit_options)
+def _tvf_xnext_impl(cur):
+    c = carray(_cast_int_to_void_p(cur), (1,), dtype=_TVF_CUR_DTYPE)
+    c[0].rowid = c[0].rowid + 1
+    if c[0].rowid < c[0].n_rows or c[0].state_p == 0:
+        return
+    chunk = carray(_cast_int_to_void_p(c[0].data_p), (_CHUNK_ROWS,), dtype=_OUT_DTYPE)
+    n = _next_chunk(borrow_structref(_state_type, c[0].state_p), chunk)
+    c[0].row_base = c[0].row_base + c[0].n_rows
+    c[0].rowid = 0
+    c[0].n_rows = min(max(int64(n), 0), _CHUNK_ROWS)
+'''
+
 
 def _gen_arg_decode(arg_tags):
     lines = []
@@ -243,6 +305,8 @@ def _make_static_cfuncs():
             c[0].n_rows = 0
             c[0].row_stride = 0
             c[0].scratch_p = scratch_p
+            c[0].state_p = 0
+            c[0].row_base = 0
             slot = carray(_cast_int_to_void_p(pp_cursor), (1,), dtype=np.intp)
             slot[0] = cur
             return SQLITE_OK
@@ -261,6 +325,9 @@ def _make_static_cfuncs():
                 c[0].data_p = 0
                 c[0].n_rows = 0
                 c[0].row_stride = 0
+            if c[0].state_p != 0:
+                release_meminfo(c[0].state_p)
+                c[0].state_p = 0
             sqlite3_free(c[0].scratch_p)
             sqlite3_free(cur)
             return SQLITE_OK
@@ -283,7 +350,7 @@ def _make_static_cfuncs():
     @cfunc(types.int32(types.intp, types.intp), cache=_CACHE)
     def _tvf_xrowid(cur, p_rowid):
         c = carray(_cast_int_to_void_p(cur), (1,), dtype=_TVF_CUR_DTYPE)
-        store_at(p_rowid, c[0].rowid)
+        store_at(p_rowid, c[0].row_base + c[0].rowid)
         return SQLITE_OK
 
     return _tvf_xdisconnect, _tvf_xopen, _tvf_xclose, _tvf_xnext, _tvf_xeof, _tvf_xrowid
@@ -357,21 +424,39 @@ def _prepare_fn(fn):
     raise TypeError("fn must be a callable (plain Python or @njit), got %r" % (fn,))
 
 
-def _compile_xfilter(stem, arg_tags, out_dtype, fn):
-    n_hidden = len(arg_tags)
-    arg_decode = _gen_arg_decode(arg_tags)
-    fn_call = "_fn(%s)" % ", ".join("a%d" % i for i in range(n_hidden))
-    src = _XFILTER_SRC.format(arg_decode=arg_decode, fn_call=fn_call)
-    tvf_digest = digest((out_dtype, tuple(arg_tags)), [fn])
+def _exec_anchored(stem, src, subject, fns, baked):
+    tvf_digest = digest(subject, list(fns.values()))
     code_txt = "# tvf-digest: %s\n%s" % (tvf_digest, src)
-    ns = {**globals(), "_fn": fn, "_N_HIDDEN": n_hidden}
+    ns = {**globals(), **baked, **fns}
     anchor = _anchor_path(_ANCHOR_SUBDIR, stem, code_txt)
     _materialize_anchor(anchor, code_txt)
     code = compile(code_txt, str(anchor), mode="exec")
     exec(code, ns)  # nosec B102 - JIT codegen of internal source
+    return ns
+
+
+def _compile_xfilter(stem, arg_tags, out_dtype, fn):
+    n_hidden = len(arg_tags)
+    arg_decode = _gen_arg_decode(arg_tags)
+    fn_call = "_fn(%s)" % ", ".join("a%d" % i for i in range(n_hidden))
+    src = _XFILTER_SRC.format(arg_decode=arg_decode, fn_call=fn_call)
+    ns = _exec_anchored(stem, src, (out_dtype, tuple(arg_tags)), {"_fn": fn}, {"_N_HIDDEN": n_hidden})
     return ns["_tvf_xfilter_impl"]
 
 
+def _compile_stream(stem, arg_tags, out_dtype, chunk_rows, state_type, init, next_chunk):
+    n_hidden = len(arg_tags)
+    arg_decode = _gen_arg_decode(arg_tags)
+    init_call = "_init(%s)" % ", ".join("a%d" % i for i in range(n_hidden))
+    src = _STREAM_XFILTER_SRC.format(arg_decode=arg_decode, init_call=init_call) + _STREAM_XNEXT_SRC
+    subject = ("stream", out_dtype, tuple(arg_tags), chunk_rows, _state_id(state_type))
+    baked = {
+        "_N_HIDDEN": n_hidden, "_CHUNK_ROWS": chunk_rows, "_OUT_DTYPE": out_dtype, "_state_type": state_type,
+    }
+    ns = _exec_anchored(stem, src, subject, {"_init": init, "_next_chunk": next_chunk}, baked)
+    return ns["_tvf_xfilter_impl"], ns["_tvf_xnext_impl"]
+
+
 def _build_tvf_descriptor(name, arg_types, out_dtype):
     if out_dtype.fields is None or out_dtype.names is None:
         raise TypeError("out_dtype must be a structured numpy dtype, got %r" % (out_dtype,))
@@ -452,7 +537,40 @@ def register_tvf(db, name, arg_types, out_dtype, fn):
         name, arg_types, out_dtype)
 
     xfilter_impl = _compile_xfilter(_stem(name), arg_tags, out_dtype, _prepare_fn(fn))
+    _install_tvf(db, name, (c, offsets_buf, tags_buf, widths_buf, schema), (fn,), xfilter_impl)
+
+
+def register_tvf_stream(db, name, arg_types, out_dtype, state_type, init, next_chunk, *, chunk_rows=1024):
+    """Register an eponymous table-valued function whose rows are produced
+    lazily, one chunk at a time.
+
+    ``SELECT * FROM name(<args>)`` calls ``init(*args)`` once per scan for the
+    producer state -- an instance of the numba StructRef type ``state_type`` --
+    then ``next_chunk(state, out)``, which writes the next rows into the front
+    of ``out`` (a 1-D ``out_dtype`` array of ``chunk_rows`` rows, reused by
+    every call of the scan) and returns how many it wrote. It is called again
+    only once the cursor has consumed those rows; returning 0 ends the stream,
+    a short chunk does not. ``init`` / ``next_chunk`` may be plain Python or
+    ``@njit`` callables and are baked into the generated xFilter / xNext like
+    ``register_tvf``'s ``fn``; ``arg_types`` and the NULL / NaN rules are as
+    there. An exception in either fails the query with a SQLite error.
+    """
+    _validate_state_type(state_type)
+    if int(chunk_rows) < 1:
+        raise ValueError("chunk_rows must be >= 1, got %r" % (chunk_rows,))
+    c, offsets_buf, tags_buf, widths_buf, schema, arg_tags = _build_tvf_descriptor(
+        name, arg_types, out_dtype)
+    fns = _prepare_callbacks(init=init, next_chunk=next_chunk)
+    xfilter_impl, xnext_impl = _compile_stream(
+        _stem(name), arg_tags, out_dtype, int(chunk_rows), state_type, fns["init"], fns["next_chunk"])
+    _install_tvf(
+        db, name, (c, offsets_buf, tags_buf, widths_buf, schema), (init, next_chunk), xfilter_impl, xnext_impl)
 
+
+def _install_tvf(db, name, built, fns, xfilter_impl, xnext_impl=None):
+    """Build this registration's sqlite3_module around ``xfilter_impl`` (and,
+    for a stream, ``xnext_impl``) and register it; ``built`` / ``fns`` are
+    the descriptor buffers and user callables the handle keeps alive."""
     # cache=False, unlike every other cfunc here: this one closes over
     # xfilter_impl, a dispatcher minted per registration, so its cache key never
     # repeats. With cache=True it writes an index entry per registration per
@@ -478,6 +596,18 @@ def register_tvf(db, name, arg_types, out_dtype, fn):
     xbestindex = _make_xbestindex()
     xdisconnect, xopen, xclose, xnext, xeof, xrowid = _make_static_cfuncs()
     xcolumn = _make_xcolumn()
+    if xnext_impl is not None:
+        # cache=False for the same reason as _tvf_xfilter. A producer exception
+        # fails the query with SQLITE_ERROR; xnext_impl has already moved the
+        # cursor past the chunk, so xEof then holds.
+        @cfunc(types.int32(types.intp), cache=False)
+        def _tvf_xnext_stream(cur):
+            try:
+                xnext_impl(cur)
+            except Exception:
+                return SQLITE_ERROR
+            return SQLITE_OK
+        xnext = _tvf_xnext_stream
 
     module = _Sqlite3Module()
     module.iVersion = 1
@@ -496,7 +626,7 @@ def register_tvf(db, name, arg_types, out_dtype, fn):
     module_p = ctypes.addressof(module)
 
     handle = _TvfHandle(
-        module, c, offsets_buf, tags_buf, widths_buf, schema, fn,
-        xfilter_impl, _tvf_xfilter, xconnect, xbestindex, xdisconnect,
+        module, *built, *fns, xfilter_impl, xnext_impl, _tvf_xfilter, xconnect, xbestindex, xdisconnect,
         xopen, xclose, xnext, xeof, xrowid, xcolumn)
+    c = built[0]
     _register_with_destroy(db, name, module_p, c.ctypes.data, handle)
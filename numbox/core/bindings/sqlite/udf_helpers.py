@@ -1,4 +1,5 @@
-"""Higher-level registration helpers for structref-backed SQLite UDAFs.
+"""Higher-level registration helpers for SQLite UDFs: structref-backed
+aggregates and windows, and typed scalar functions.
 
 ``register_aggregate`` / ``register_window`` generate the SQLite callback
 functions (xStep/xInverse/xValue/xFinal) that perform the per-group state
@@ -18,6 +19,12 @@ be a silent wrong result; the in-body catch also lets numba run the borrowed
 state's reference-count decrement, which the unwind would otherwise skip -- a
 per-group meminfo leak. Only ``xFinal`` releases the slot.
 
+``register_scalar`` generates the xFunc of a scalar function from its declared
+argument and return types: each argument is decoded with the matching
+``sqlite3_value_*`` accessor (text as UTF-8 into a numba ``str``), the user
+function is called, and its result is written with the matching
+``sqlite3_result_*`` setter; a NULL argument yields NULL without a call.
+
 Mechanism: per-UDAF callback source is generated with the state type and the user functions
 baked in as module globals (so the calls inline), written to a content-addressed
 anchor file under numba's cache dir (reusing numbox.utils.preprocessing), and the
@@ -63,8 +70,15 @@ from numbox.utils.preprocessing import (
 import numpy as np  # noqa: F401
 from numba import carray, njit  # noqa: F401
 from numbox.core.configurations import jit_options  # noqa: F401
-from numbox.core.bindings.sqlite.result import sqlite3_result_error  # noqa: F401
+from numbox.core.bindings.sqlite.constants import SQLITE_NULL, SQLITE_TRANSIENT  # noqa: F401
+from numbox.core.bindings.sqlite.query import _utf8_decode, _utf8_encode
+from numbox.core.bindings.sqlite.result import (  # noqa: F401
+    sqlite3_result_double, sqlite3_result_error, sqlite3_result_int64, sqlite3_result_null, sqlite3_result_text,
+)
 from numbox.core.bindings.sqlite.udf import sqlite3_aggregate_context  # noqa: F401
+from numbox.core.bindings.sqlite.value import (  # noqa: F401
+    sqlite3_value_bytes, sqlite3_value_double, sqlite3_value_int64, sqlite3_value_text, sqlite3_value_type,
+)
 from numbox.utils.lowlevel import _cast_int_to_void_p, get_unicode_data_p  # noqa: F401
 from numbox.utils.meminfo import (  # noqa: F401
     borrow_structref,
@@ -72,7 +86,7 @@ from numbox.utils.meminfo import (  # noqa: F401
     release_meminfo,
 )
 
-__all__ = ["register_aggregate", "register_window"]
+__all__ = ["register_aggregate", "register_window", "register_scalar"]
 
 _ANCHOR_SUBDIR = "numbox-sqlite-udaf"
 _orphan_anchor_sweep(_ANCHOR_SUBDIR)
@@ -183,6 +197,66 @@ def _xvalue_impl(ctx):
         sqlite3_result_error(ctx, get_unicode_data_p("error in user value callback"), -1)
 '''
 
+# Baked global names: _fn, _set_result, _argtype_<k>, jit_options; the call's
+# argument list (one decoder per declared argument type) is formatted in.
+_XFUNC_SRC = '''
+@njit(**jit_options)
+def _xfunc_impl(ctx, argc, argv_pp):
+    args = carray(_cast_int_to_void_p(argv_pp), (argc,), dtype=np.intp)
+    for k in range(argc):
+        if sqlite3_value_type(args[k]) == SQLITE_NULL:
+            sqlite3_result_null(ctx)
+            return
+    try:
+        _r = _fn(%s)
+    except Exception:
+        sqlite3_result_error(ctx, get_unicode_data_p("error in user scalar function"), -1)
+        return
+    _set_result(ctx, _r)
+'''
+
+
+@njit(**jit_options)
+def _arg_int(v):
+    return sqlite3_value_int64(v)
+
+
+@njit(**jit_options)
+def _arg_float(v):
+    return sqlite3_value_double(v)
+
+
+@njit(**jit_options)
+def _arg_bool(v):
+    return sqlite3_value_int64(v) != 0
+
+
+@njit(**jit_options)
+def _arg_str(v):
+    # text accessor before bytes, per the sqlite3_value_* conversion rules
+    text_p = sqlite3_value_text(v)
+    return _utf8_decode(text_p, sqlite3_value_bytes(v))
+
+
+@njit(**jit_options)
+def _result_int(ctx, r):
+    sqlite3_result_int64(ctx, np.int64(r))
+
+
+@njit(**jit_options)
+def _result_float(ctx, r):
+    sqlite3_result_double(ctx, np.float64(r))
+
+
+@njit(**jit_options)
+def _result_utf8(ctx, buf):
+    sqlite3_result_text(ctx, buf.ctypes.data, len(buf) - 1, SQLITE_TRANSIENT)
+
+
+@njit(**jit_options)
+def _result_str(ctx, r):
+    _result_utf8(ctx, _utf8_encode(r))
+
 
 def _validate_state_type(state_type):
     if not isinstance(state_type, StructRef):
@@ -211,22 +285,28 @@ def _prepare_callbacks(**fns):
     return prepared
 
 
-def _compile_callbacks(stem, srcs, state_type, fns):
-    """Generate + content-address-anchor + exec the @njit(cache=True) impls.
-
-    ``fns`` maps generated global names (``_init``, ``_step``, ...) to user
-    callables. Returns the exec namespace (contains ``_xstep_impl`` etc.)."""
+def _state_id(state_type):
     # repr(state_type) is only the class qualname + field list, so same-qualname
     # StructRef classes in different modules would collide; fold the defining
     # module + qualname into the digest subject. (An @overload_method attached to
     # the type outside this registration is still not captured here -- for
     # make_structref-built types its body is folded via the method hash.)
-    state_id = "%s.%s;%r" % (type(state_type).__module__, type(state_type).__qualname__, state_type)
-    udaf_digest = digest(state_id, list(fns.values()))
+    return "%s.%s;%r" % (type(state_type).__module__, type(state_type).__qualname__, state_type)
+
+
+def _compile_callbacks(stem, srcs, subject, fns, baked=None):
+    """Generate + content-address-anchor + exec the @njit(cache=True) impls.
+
+    ``fns`` maps generated global names (``_init``, ``_step``, ...) to user
+    callables, digested together with the ``subject`` string; ``baked`` adds
+    further (non-function) globals, e.g. ``_state_type``, which ``subject``
+    must identify. Returns the exec namespace (contains ``_xstep_impl``
+    etc.)."""
+    udaf_digest = digest(subject, list(fns.values()))
     code_txt = "# udaf-digest: %s\n%s" % (udaf_digest, "".join(srcs))
     # globals() is this module's __dict__; it carries __name__, which numba's
     # warm-cache Environment rebuild requires when reloading the cached impls.
-    ns = {**globals(), "_state_type": state_type, **fns}
+    ns = {**globals(), **(baked or {}), **fns}
     anchor = _anchor_path(_ANCHOR_SUBDIR, stem, code_txt)
     _materialize_anchor(anchor, code_txt)
     code = compile(code_txt, str(anchor), mode="exec")
@@ -234,14 +314,14 @@ def _compile_callbacks(stem, srcs, state_type, fns):
     return ns
 
 
-def _raise_rc(db, name, rc):
+def _raise_rc(db, name, rc, kind="UDAF"):
     msg_p = sqlite3_errmsg(db)
     detail = ""
     if msg_p:
         detail = ": " + ctypes.cast(
             msg_p, ctypes.c_char_p).value.decode("utf-8", "replace")
     raise RuntimeError(
-        "sqlite3 UDAF registration failed for %r (rc=%d)%s" % (name, rc, detail))
+        "sqlite3 %s registration failed for %r (rc=%d)%s" % (kind, name, rc, detail))
 
 
 def _stem(prefix, name):
@@ -270,8 +350,9 @@ def register_aggregate(db, name, n_arg, state_type, init, step, finalize,
     _validate_state_type(state_type)
     fns = _prepare_callbacks(init=init, step=step, finalize=finalize)
     ns = _compile_callbacks(
-        _stem("udaf_", name), [_XSTEP_SRC, _XFINAL_SRC], state_type,
-        {"_init": fns["init"], "_step": fns["step"], "_finalize": fns["finalize"]})
+        _stem("udaf_", name), [_XSTEP_SRC, _XFINAL_SRC], _state_id(state_type),
+        {"_init": fns["init"], "_step": fns["step"], "_finalize": fns["finalize"]},
+        {"_state_type": state_type})
     xstep_impl = ns["_xstep_impl"]
     xfinal_impl = ns["_xfinal_impl"]
 
@@ -306,9 +387,10 @@ def register_window(db, name, n_arg, state_type, init, step, inverse, value,
                              finalize=finalize)
     ns = _compile_callbacks(
         _stem("wudaf_", name),
-        [_XSTEP_SRC, _XINVERSE_SRC, _XVALUE_SRC, _XFINAL_SRC], state_type,
+        [_XSTEP_SRC, _XINVERSE_SRC, _XVALUE_SRC, _XFINAL_SRC], _state_id(state_type),
         {"_init": fns["init"], "_step": fns["step"], "_inverse": fns["inverse"],
-         "_value": fns["value"], "_finalize": fns["finalize"]})
+         "_value": fns["value"], "_finalize": fns["finalize"]},
+        {"_state_type": state_type})
     xstep_impl = ns["_xstep_impl"]
     xinverse_impl = ns["_xinverse_impl"]
     xvalue_impl = ns["_xvalue_impl"]
@@ -338,3 +420,71 @@ def register_window(db, name, n_arg, state_type, init, step, inverse, value,
             value_cb.address, inverse_cb.address, 0)
     if rc != SQLITE_OK:
         _raise_rc(db, name, rc)
+
+
+def _arg_expr(k, ty):
+    """Generated-source expression decoding argument ``k`` as numba type ``ty``."""
+    if isinstance(ty, types.Boolean):
+        return "_arg_bool(args[%d])" % k
+    if isinstance(ty, types.Integer):
+        return "_argtype_%d(_arg_int(args[%d]))" % (k, k)
+    if isinstance(ty, types.Float):
+        return "_argtype_%d(_arg_float(args[%d]))" % (k, k)
+    if isinstance(ty, types.UnicodeType):
+        return "_arg_str(args[%d])" % k
+    raise TypeError("unsupported scalar UDF argument type %r (integer, float, boolean or unicode_type)" % (ty,))
+
+
+def _result_setter(ty):
+    if isinstance(ty, (types.Boolean, types.Integer)):
+        return _result_int
+    if isinstance(ty, types.Float):
+        return _result_float
+    if isinstance(ty, types.UnicodeType):
+        return _result_str
+    raise TypeError("unsupported scalar UDF return type %r (integer, float, boolean or unicode_type)" % (ty,))
+
+
+def register_scalar(db, name, arg_types, ret_type, fn, *, deterministic=False):
+    """Register a typed scalar SQL function.
+
+    ``fn`` may be plain Python or already-jitted (``@njit``/``@proxy``); plain
+    functions are compiled with ``njit``. It is called with one argument per
+    entry of ``arg_types`` and inlined into the generated xFunc.
+
+    :param db: connection pointer (intp), as returned by ``sqlite3_open``.
+    :param name: SQL function name (str); the C-string lifetime is handled here.
+    :param arg_types: numba types of the arguments -- integer, float,
+        ``boolean`` or ``unicode_type`` (text, decoded from UTF-8). Values
+        are converted by SQLite's usual rules; a NULL argument makes the
+        result NULL without calling ``fn``.
+    :param ret_type: numba type of the result, from the same set; integers
+        and booleans are returned as INTEGER, floats as REAL, ``unicode_type``
+        as UTF-8 TEXT.
+    :param fn: the function; an exception it raises becomes a SQL error.
+    :param deterministic: OR-in ``SQLITE_DETERMINISTIC``, letting SQLite
+        evaluate calls with constant arguments once and use the function in
+        indexes and generated columns.
+
+    Returns ``None``, like :func:`register_aggregate`.
+    """
+    arg_types = tuple(arg_types)
+    call_args = ", ".join(_arg_expr(k, ty) for k, ty in enumerate(arg_types))
+    set_result = _result_setter(ret_type)
+    fns = _prepare_callbacks(fn=fn)
+    subject = "scalar;%r;%r" % (arg_types, ret_type)
+    baked = {"_set_result": set_result, **{"_argtype_%d" % k: ty for k, ty in enumerate(arg_types)}}
+    ns = _compile_callbacks(_stem("udf_", name), [_XFUNC_SRC % call_args], subject, {"_fn": fns["fn"]}, baked)
+    xfunc_impl = ns["_xfunc_impl"]
+
+    @cfunc(types.void(types.intp, types.int32, types.intp))
+    def func_cb(ctx, argc, argv):
+        xfunc_impl(ctx, argc, argv)
+
+    flags = SQLITE_UTF8 | (SQLITE_DETERMINISTIC if deterministic else 0)
+    with c_string(name) as name_p:
+        rc = sqlite3_create_function_v2(
+            db, name_p, len(arg_types), flags, 0,
+            func_cb.address, 0, 0, 0)
+    if rc != SQLITE_OK:
+        _raise_rc(db, name, rc, "UDF")
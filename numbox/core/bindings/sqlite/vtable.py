@@ -10,6 +10,7 @@ our own members after it. Each is modelled as a numpy structured dtype with that
 base nested as field 'base'. See https://www.sqlite.org/vtab.html.
 """
 import ctypes
+import math
 from collections.abc import Mapping
 
 import numpy as np
@@ -22,7 +23,7 @@ from numba.core.types import (
 from numbox.core.bindings.sqlite.constants import (
     SQLITE_OK, SQLITE_STATIC, SQLITE_TRANSIENT, SQLITE_ERROR, SQLITE_NOMEM, SQLITE_FLOAT,
     SQLITE_INDEX_CONSTRAINT_EQ, SQLITE_INDEX_CONSTRAINT_GT, SQLITE_INDEX_CONSTRAINT_GE,
-    SQLITE_INDEX_CONSTRAINT_LT, SQLITE_INDEX_CONSTRAINT_LE,
+    SQLITE_INDEX_CONSTRAINT_LT, SQLITE_INDEX_CONSTRAINT_LE, SQLITE_INDEX_SCAN_UNIQUE,
 )
 from numbox.core.bindings.sqlite.conn import sqlite3_errmsg
 from numbox.core.bindings.sqlite.exec import sqlite3_free, sqlite3_malloc
@@ -59,8 +60,22 @@ _DESC_DTYPE = np.dtype([
     ("col_bases", "i8"), ("col_strides", "i8"),
     ("col_tags", "i8"), ("col_widths", "i8"),
     ("schema_ptr", "i8"), ("scratch_bytes", "i8"),
+    ("col_indexes", "i8"),
 ], align=True)
-assert _DESC_DTYPE.itemsize == 64
+assert _DESC_DTYPE.itemsize == 72
+
+# Per-column index record; col_indexes points at ncols of them (zeroed for an
+# unindexed column). perm is the rowid permutation that sorts the column in
+# its comparison domain (int64 for integer tags, float64 otherwise) with the
+# NaN rows -- SQL NULLs -- first, as ORDER BY ... ASC places them; nvalid
+# counts the non-NaN suffix a constraint can match and ndistinct feeds
+# xBestIndex's cost. A hash index over an integer column adds
+# an open-addressing table of `slots` (mask + 1 entries, -1 empty) holding
+# indices into the distinct sorted `keys`; key g owns perm[starts[g]:starts[g + 1]].
+_INDEX_DTYPE = np.dtype([
+    ("perm", "i8"), ("nvalid", "i8"), ("ndistinct", "i8"),
+    ("slots", "i8"), ("mask", "i8"), ("keys", "i8"), ("starts", "i8"),
+])
 
 # struct sqlite3_vtab { const sqlite3_module *pModule; int nRef; char *zErrMsg; }
 # https://www.sqlite.org/c3ref/vtab.html -- SQLite owns/sets these fields.
@@ -72,25 +87,32 @@ _VTAB_SIZE = _VTAB_DTYPE.itemsize
 # struct sqlite3_vtab_cursor { sqlite3_vtab *pVtab; }
 # https://www.sqlite.org/c3ref/vtab_cursor.html -- one-member SQLite base.
 _SQLITE3_VTAB_CURSOR_DTYPE = np.dtype([("pVtab", "i8")])
+# An indexed scan walks perm from pos to end (exclusive) by step (+1, or -1
+# for a consumed ORDER BY ... DESC), setting rowid from it (perm_p != 0);
+# otherwise rowid itself is the scan position. The unicode scratch is sized
+# by xFilter for the plan's used columns; scratch_cap is its current size.
 _CUR_DTYPE = np.dtype([
     ("base", _SQLITE3_VTAB_CURSOR_DTYPE), ("descriptor", "i8"), ("rowid", "i8"), ("scratch_p", "i8"),
-    ("pred_p", "i8"), ("n_pred", "i8"),
+    ("pred_p", "i8"), ("n_pred", "i8"), ("perm_p", "i8"), ("pos", "i8"), ("end", "i8"), ("step", "i8"),
+    ("scratch_cap", "i8"),
 ], align=True)
-assert _CUR_DTYPE.itemsize == 48
+assert _CUR_DTYPE.itemsize == 88
 _CUR_SIZE = _CUR_DTYPE.itemsize
 
 # struct sqlite3_index_info -- https://www.sqlite.org/c3ref/index_info.html
-# Modelled only through estimatedRows: later fields (idxFlags 3.9.0, colUsed
-# 3.10.0) are never addressed. estimatedRows needs SQLite 3.8.2+, met by the
-# >=3.34 support floor.
+# Modelled only through colUsed: estimatedRows (3.8.2), idxFlags (3.9.0) and
+# colUsed (3.10.0) are all met by the >=3.34 support floor; the later
+# handle_orderby/blob fields are never addressed.
 _IDX_INFO_DTYPE = np.dtype([
     ("nConstraint", "i4"), ("aConstraint", "i8"), ("nOrderBy", "i4"),
     ("aOrderBy", "i8"), ("aConstraintUsage", "i8"), ("idxNum", "i4"),
     ("idxStr", "i8"), ("needToFreeIdxStr", "i4"), ("orderByConsumed", "i4"),
-    ("estimatedCost", "f8"), ("estimatedRows", "i8"),
+    ("estimatedCost", "f8"), ("estimatedRows", "i8"), ("idxFlags", "i4"),
+    ("colUsed", "u8"),
 ], align=True)
 assert _IDX_INFO_DTYPE.fields["estimatedCost"][1] == 64
 assert _IDX_INFO_DTYPE.fields["estimatedRows"][1] == 72
+assert _IDX_INFO_DTYPE.fields["colUsed"][1] == 88
 
 # Element layouts of the three arrays sqlite3_index_info points at. align=True
 # reproduces the C padding so each element matches sqlite3.h byte-for-byte:
@@ -116,6 +138,18 @@ _SPEC_DTYPE = np.dtype([("col", "i4"), ("op", "i4")], align=True)
 _SPEC_SIZE = _SPEC_DTYPE.itemsize
 assert _SPEC_SIZE == 8
 
+# idxStr starts with this plan header, followed by the argc specs: the
+# unicode scratch the plan's used columns (colUsed) need, 0 when none of
+# them is a 'U' column. The zeroed leading word keeps idxStr an empty C
+# string where SQLite prints it (EXPLAIN QUERY PLAN's "INDEX n:idxStr").
+_PLAN_DTYPE = np.dtype([("nul", "i8"), ("scratch_bytes", "i8")])
+_PLAN_SIZE = _PLAN_DTYPE.itemsize
+
+# idxNum carries the argument count in its low bits and, above
+# _ORDER_SHIFT, the ORDER BY the plan consumes: 0 none, 1 rowid order (the
+# unindexed scan), or (col + 1) << 1 | desc for a scan of col's index.
+_ORDER_SHIFT = 16
+
 _CACHE = jit_options.get("cache", True)
 
 
@@ -154,9 +188,9 @@ class _BuiltDescriptor:
     underlying column data array(s). The C descriptor ``c`` is the source of
     truth; nothing here is read by the cfuncs."""
     __slots__ = ("c", "bases", "strides", "tags", "widths", "schema",
-                 "nrows", "ncols", "scratch_bytes", "arrays")
+                 "nrows", "ncols", "scratch_bytes", "arrays", "names", "indexes", "index_arrays")
 
-    def __init__(self, c, bases, strides, tags, widths, schema, arrays):
+    def __init__(self, c, bases, strides, tags, widths, schema, arrays, names, indexes):
         self.c = c
         self.bases = bases
         self.strides = strides
@@ -164,6 +198,9 @@ class _BuiltDescriptor:
         self.widths = widths
         self.schema = schema
         self.arrays = arrays
+        self.names = names
+        self.indexes = indexes
+        self.index_arrays = []
         self.nrows = int(c["nrows"][0])
         self.ncols = int(c["ncols"][0])
         self.scratch_bytes = int(c["scratch_bytes"][0])
@@ -183,6 +220,7 @@ def _finalize_descriptor(nrows, col_names, tags, widths, bases, strides, arrays)
     widths_buf = np.array(widths, dtype=np.int64)
     cols_sql = ", ".join('"%s" %s' % (n.replace('"', '""'), _SQL_TYPE[t]) for n, t in zip(col_names, tags))
     schema = ("CREATE TABLE x(%s)" % cols_sql).encode("utf-8") + b"\x00"
+    indexes = np.zeros(len(col_names), _INDEX_DTYPE)
 
     c = np.zeros(1, _DESC_DTYPE)
     c["nrows"] = int(nrows)
@@ -193,7 +231,9 @@ def _finalize_descriptor(nrows, col_names, tags, widths, bases, strides, arrays)
     c["col_widths"] = widths_buf.ctypes.data
     c["schema_ptr"] = ctypes.cast(ctypes.c_char_p(schema), ctypes.c_void_p).value
     c["scratch_bytes"] = int(scratch)
-    return _BuiltDescriptor(c, bases_buf, strides_buf, tags_buf, widths_buf, schema, tuple(arrays))
+    c["col_indexes"] = indexes.ctypes.data
+    return _BuiltDescriptor(c, bases_buf, strides_buf, tags_buf, widths_buf, schema, tuple(arrays),
+                            tuple(col_names), indexes)
 
 
 def _build_descriptor(arr, columns, text_as_blob):
@@ -253,6 +293,102 @@ def _build_descriptor_columnar(mapping, text_as_blob):
     return _finalize_descriptor(nrows, names, tags, widths, bases, strides, cols)
 
 
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+@njit(**jit_options)
+def _hash_slot(key, mask):
+    """Fibonacci hash of an int64 key onto a power-of-two table."""
+    return int64((uint64(key) * _HASH_MULT) >> uint64(32)) & mask
+
+
+@njit(**jit_options)
+def _column_keys_i64(d, col):
+    """Gather integer column `col` contiguously, as _row_matches compares it."""
+    keys = np.empty(d[0].nrows, dtype=np.int64)
+    for r in range(keys.shape[0]):
+        keys[r] = _cell_value_i64(d, r, col)
+    return keys
+
+
+@njit(**jit_options)
+def _column_keys_f64(d, col):
+    """Gather float/bool column `col` contiguously, as _row_matches compares it."""
+    keys = np.empty(d[0].nrows, dtype=np.float64)
+    for r in range(keys.shape[0]):
+        keys[r] = _cell_value_f64(d, r, col)
+    return keys
+
+
+@njit(**jit_options)
+def _build_hash(sorted_keys):
+    """Distinct keys, their run starts in the sorted order (plus a final
+    sentinel) and an open-addressing table mapping key -> distinct index."""
+    n = sorted_keys.shape[0]
+    ng = 0
+    for r in range(n):
+        if r == 0 or sorted_keys[r] != sorted_keys[r - 1]:
+            ng += 1
+    keys = np.empty(ng, dtype=np.int64)
+    starts = np.empty(ng + 1, dtype=np.int64)
+    g = 0
+    for r in range(n):
+        if r == 0 or sorted_keys[r] != sorted_keys[r - 1]:
+            keys[g] = sorted_keys[r]
+            starts[g] = r
+            g += 1
+    starts[ng] = n
+    size = 2
+    while size < 2 * ng:
+        size <<= 1
+    mask = size - 1
+    slots = np.full(size, -1, dtype=np.int64)
+    for g in range(ng):
+        h = _hash_slot(keys[g], mask)
+        while slots[h] != -1:
+            h = (h + 1) & mask
+        slots[h] = g
+    return slots, mask, keys, starts
+
+
+def _build_indexes(built, indexes, hash_indexes):
+    """Fill ``built.indexes`` for the named columns, keeping the permutation
+    and hash arrays alive on ``built``."""
+    positions = {n: j for j, n in enumerate(built.names)}
+    hashed = set()
+    for n in hash_indexes:
+        if n not in positions:
+            raise ValueError("hash index on unknown column %r" % (n,))
+        if not _is_int_tag(built.tags[positions[n]]):
+            raise ValueError("hash index column %r must be an integer column" % (n,))
+        hashed.add(n)
+    for n in indexes:
+        if n not in positions:
+            raise ValueError("index on unknown column %r" % (n,))
+    for n in dict.fromkeys(list(indexes) + list(hash_indexes)):
+        col = positions[n]
+        if not _is_numeric_tag(built.tags[col]):
+            raise ValueError("index column %r must be numeric, got a string/blob column" % (n,))
+        is_int = _is_int_tag(built.tags[col])
+        keys = _column_keys_i64(built.c, col) if is_int else _column_keys_f64(built.c, col)
+        perm = np.argsort(keys, kind="stable").astype(np.int64)
+        nvalid = len(perm) if is_int else int(len(perm) - np.count_nonzero(np.isnan(keys)))
+        perm = np.concatenate((perm[nvalid:], perm[:nvalid]))  # argsort puts NaN last; NULLs sort first
+        valid = keys[perm[len(perm) - nvalid:]]
+        rec = built.indexes[col]
+        rec["perm"] = perm.ctypes.data
+        rec["nvalid"] = nvalid
+        rec["ndistinct"] = int(np.count_nonzero(valid[1:] != valid[:-1])) + 1 if nvalid else 0
+        built.index_arrays.append(perm)
+        if n in hashed:
+            slots, mask, distinct, starts = _build_hash(valid)
+            rec["slots"] = slots.ctypes.data
+            rec["mask"] = mask
+            rec["keys"] = distinct.ctypes.data
+            rec["starts"] = starts.ctypes.data
+            built.index_arrays.extend((slots, distinct, starts))
+
+
 @cfunc(types.int32(types.intp, types.intp, types.int32, types.intp, types.intp, types.intp), cache=_CACHE)
 def _xconnect(db, p_aux, argc, argv, pp_vtab, pz_err):
     vtab = 0
@@ -293,13 +429,89 @@ def _is_supported_op(op):
             or op == SQLITE_INDEX_CONSTRAINT_LE)
 
 
+@njit(**jit_options)
+def _index_rank(ix, col, op):
+    """How well column `col`'s index serves a constraint with `op`: 3 for a
+    hashed EQ, 2 for a sorted EQ, 1 for a range, 0 when unindexed. xBestIndex
+    costs and xFilter drives by the same highest-ranked constraint."""
+    if ix[col].perm == 0:
+        return 0
+    if op == SQLITE_INDEX_CONSTRAINT_EQ:
+        return 3 if ix[col].slots != 0 else 2
+    return 1
+
+
+@njit(**jit_options)
+def _drive_estimate(ix, spec, nbound, col, nrows):
+    """(rows scanned, probe cost, bound count, has EQ) for a cursor driven by
+    column `col`'s index. An EQ range averages nvalid / ndistinct rows and
+    each range bound on the column is assumed to halve it; with no bound the
+    whole permutation is walked (an ORDER BY scan). The probe is one hash
+    lookup or a binary search per bound."""
+    n_on = 0
+    has_eq = False
+    for k in range(nbound):
+        if spec[k].col == col:
+            n_on += 1
+            has_eq = has_eq or spec[k].op == SQLITE_INDEX_CONSTRAINT_EQ
+    nvalid = ix[col].nvalid
+    if has_eq:
+        scanned = nvalid // max(ix[col].ndistinct, 1)
+    elif n_on > 0:
+        scanned = nvalid >> min(n_on, 62)
+    else:
+        scanned = nrows
+    probe = 1.0 if has_eq and ix[col].slots != 0 else n_on * math.log2(nrows + 1.0)
+    return scanned, probe, n_on, has_eq
+
+
+@njit(**jit_options)
+def _order_plan(ix, spec, nbound, ncols, nrows, oc, desc, best, has_eq, rows, cost):
+    """Decide whether the plan consumes a single-term ORDER BY on column `oc`
+    (-1: rowid). Returns the _ORDER_SHIFT code (0: not consumed) with the
+    possibly re-driven (best, has_eq, rows, cost)."""
+    if oc == -1:
+        # the unindexed scan walks rowids ascending
+        return (1 if not desc and best < 0 else 0), best, has_eq, rows, cost
+    if not (0 <= oc < min(ncols, 1 << 14)) or ix[oc].perm == 0:
+        return 0, best, has_eq, rows, cost
+    if oc != best:
+        # Walking oc's index yields the order but may scan more rows than the
+        # constraint-driven plan; take it when that beats the driven plan
+        # plus SQLite's sort of its output.
+        o_scanned, o_probe, o_on, o_eq = _drive_estimate(ix, spec, nbound, oc, nrows)
+        o_cost = o_probe + float64(o_scanned)
+        if o_cost > cost + rows * math.log2(rows + 1.0):
+            return 0, best, has_eq, rows, cost
+        best = oc
+        has_eq = o_eq
+        rows = max(o_scanned // (nbound - o_on + 1), 1)
+        cost = o_cost
+    return ((oc + 1) << 1) | (1 if desc else 0), best, has_eq, rows, cost
+
+
+@njit(**jit_options)
+def _used_scratch(tags, widths, col_used):
+    """Unicode scratch bytes the colUsed columns need. Bit j of colUsed marks
+    column j as read (bit 63: any column >= 63); only a used 'U' column
+    needs the cursor's transcoding scratch."""
+    scratch = 0
+    for j in range(tags.shape[0]):
+        if tags[j] == _TAG_U and (col_used >> uint64(min(j, 63))) & uint64(1):
+            scratch = max(scratch, widths[j] + 1)
+    return scratch
+
+
 @cfunc(types.int32(types.intp, types.intp), cache=_CACHE)
 def _xbestindex(vtab, idx_info):
     # Claim every usable _is_supported_op constraint on a numeric column: assign it an
     # argvIndex (so xFilter receives its value) and serialise the (col, op) pair
-    # into idxStr (the xBestIndex -> xFilter side channel). Cardinality is
-    # reported regardless (joins/subqueries otherwise mis-cost; SQLite defaults
-    # estimatedRows to 25).
+    # into idxStr (the xBestIndex -> xFilter side channel), after the plan
+    # header. Cardinality is reported regardless (joins/subqueries otherwise
+    # mis-cost; SQLite defaults estimatedRows to 25). When a claimed
+    # constraint hits an indexed column, the plan is costed as the probe
+    # xFilter will run (see _index_range); a single-term ORDER BY is consumed
+    # when the scan already yields that order (see _ORDER_SHIFT).
     idx_p = 0
     try:
         v = carray(_cast_int_to_void_p(vtab), (1,), dtype=_VTAB_DTYPE)
@@ -307,16 +519,24 @@ def _xbestindex(vtab, idx_info):
         ii = carray(_cast_int_to_void_p(idx_info), (1,), dtype=_IDX_INFO_DTYPE)
         ncols = d[0].ncols
         tags = carray(_cast_int_to_void_p(d[0].col_tags), (ncols,), dtype=tags_buf_t)
+        widths = carray(_cast_int_to_void_p(d[0].col_widths), (ncols,), dtype=np.int64)
         n_constraint = ii[0].nConstraint
         cons = carray(_cast_int_to_void_p(ii[0].aConstraint), (n_constraint,), dtype=_CONSTRAINT_DTYPE)
         usage = carray(_cast_int_to_void_p(ii[0].aConstraintUsage), (n_constraint,), dtype=_USAGE_DTYPE)
 
-        idx_p = sqlite3_malloc(int32(n_constraint * _SPEC_SIZE)) if n_constraint > 0 else 0
-        if n_constraint > 0 and idx_p == 0:
+        idx_p = sqlite3_malloc(int32(_PLAN_SIZE + n_constraint * _SPEC_SIZE))
+        if idx_p == 0:
             return SQLITE_NOMEM
-        spec = carray(_cast_int_to_void_p(idx_p), (n_constraint,), dtype=_SPEC_DTYPE)
+        plan = carray(_cast_int_to_void_p(idx_p), (1,), dtype=_PLAN_DTYPE)
+        spec = carray(_cast_int_to_void_p(idx_p + _PLAN_SIZE), (n_constraint,), dtype=_SPEC_DTYPE)
 
+        plan[0].nul = 0
+        plan[0].scratch_bytes = _used_scratch(tags, widths, ii[0].colUsed)
+
+        ix = carray(_cast_int_to_void_p(d[0].col_indexes), (ncols,), dtype=_INDEX_DTYPE)
         nbound = 0
+        best = -1
+        best_rank = 0
         for i in range(n_constraint):
             col = cons[i].iColumn
             op = cons[i].op
@@ -327,22 +547,42 @@ def _xbestindex(vtab, idx_info):
                 spec[nbound].col = int32(col)
                 spec[nbound].op = int32(op)
                 nbound += 1
-
-        ii[0].idxNum = int32(nbound)
-        if nbound > 0:
-            ii[0].idxStr = idx_p
-            ii[0].needToFreeIdxStr = int32(1)
-            idx_p = 0  # SQLite owns it now; the except handler must not free it
-        else:
-            sqlite3_free(idx_p)
-            idx_p = 0
+                rank = _index_rank(ix, col, op)
+                if rank > best_rank:
+                    best = col
+                    best_rank = rank
 
         nrows = d[0].nrows
-        # Heuristic only (no column stats): each bound constraint is assumed to
-        # divide the surviving rows, nudging the planner toward plans that bind
-        # more of them (the +1 keeps the estimate non-zero).
-        ii[0].estimatedRows = nrows if nbound == 0 else nrows // (nbound + 1) + 1
-        ii[0].estimatedCost = float64(nrows)
+        has_eq = False
+        if best < 0:
+            # Heuristic only (no column stats): each bound constraint is assumed to
+            # divide the surviving rows, nudging the planner toward plans that bind
+            # more of them (the +1 keeps the estimate non-zero).
+            rows = nrows if nbound == 0 else nrows // (nbound + 1) + 1
+            cost = float64(nrows)
+        else:
+            # Indexed: the cursor visits only the driving column's matching
+            # range; the remaining constraints divide the rows surfaced as in
+            # the unindexed heuristic.
+            scanned, probe, n_on, has_eq = _drive_estimate(ix, spec, nbound, best, nrows)
+            rows = max(scanned // (nbound - n_on + 1), 1)
+            cost = probe + float64(scanned)
+
+        order = 0
+        if ii[0].nOrderBy == 1:
+            ob = carray(_cast_int_to_void_p(ii[0].aOrderBy), (1,), dtype=_ORDERBY_DTYPE)
+            order, best, has_eq, rows, cost = _order_plan(
+                ix, spec, nbound, ncols, nrows, ob[0].iColumn, ob[0].desc != 0, best, has_eq, rows, cost)
+        if has_eq and ix[best].ndistinct == ix[best].nvalid:
+            ii[0].idxFlags = int32(ii[0].idxFlags | SQLITE_INDEX_SCAN_UNIQUE)
+
+        ii[0].idxNum = int32(nbound | (order << _ORDER_SHIFT))
+        ii[0].idxStr = idx_p
+        ii[0].needToFreeIdxStr = int32(1)
+        idx_p = 0  # SQLite owns it now; the except handler must not free it
+        ii[0].orderByConsumed = int32(1 if order != 0 else 0)
+        ii[0].estimatedRows = rows
+        ii[0].estimatedCost = cost
         return SQLITE_OK
     except Exception:
         sqlite3_free(idx_p)
@@ -360,33 +600,29 @@ def _xdisconnect(vtab):
 
 @cfunc(types.int32(types.intp, types.intp), cache=_CACHE)
 def _xopen(vtab, pp_cursor):
+    # The unicode scratch is left to xFilter, which knows the plan's used columns.
     cur = 0
-    scratch_p = 0
     try:
         v = carray(_cast_int_to_void_p(vtab), (1,), dtype=_VTAB_DTYPE)
-        desc = v[0].descriptor
-        d = carray(_cast_int_to_void_p(desc), (1,), dtype=_DESC_DTYPE)
-        scratch = d[0].scratch_bytes
         cur = sqlite3_malloc(int32(_CUR_SIZE))
         if cur == 0:
             return SQLITE_NOMEM
-        if scratch > 0:
-            scratch_p = sqlite3_malloc(int32(scratch))  # scratch <= numpy's int32 'U' itemsize cap: cast is safe
-            if scratch_p == 0:
-                sqlite3_free(cur)
-                return SQLITE_NOMEM
         c = carray(_cast_int_to_void_p(cur), (1,), dtype=_CUR_DTYPE)
         c[0].base.pVtab = vtab
-        c[0].descriptor = desc
+        c[0].descriptor = v[0].descriptor
         c[0].rowid = 0
-        c[0].scratch_p = scratch_p
+        c[0].scratch_p = 0
         c[0].pred_p = 0
         c[0].n_pred = 0
+        c[0].perm_p = 0
+        c[0].pos = 0
+        c[0].end = 0
+        c[0].step = 1
+        c[0].scratch_cap = 0
         slot = carray(_cast_int_to_void_p(pp_cursor), (1,), dtype=np.intp)
         slot[0] = cur
         return SQLITE_OK
     except Exception:
-        sqlite3_free(scratch_p)
         sqlite3_free(cur)
         return SQLITE_ERROR
 
@@ -547,12 +783,135 @@ def _row_matches(cur):
     return True
 
 
+@njit(**jit_options)
+def _key_sign(d, rowid, col, mode, ival, fval):
+    """Sign of (cell - constraint value) in the predicate's comparison mode."""
+    if mode == 1:
+        v = _cell_value_i64(d, rowid, col)
+        return -1 if v < ival else (1 if v > ival else 0)
+    elif mode == 0:
+        f = _cell_value_f64(d, rowid, col)
+        return -1 if f < fval else (1 if f > fval else 0)
+    return _int_float_cmp(_cell_value_i64(d, rowid, col), fval)
+
+
+@njit(**jit_options)
+def _bisect(d, perm, lo, hi, col, mode, ival, fval, upper):
+    """First position p in perm[lo:hi] whose cell is >= the value (> if
+    `upper`), or hi."""
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        sign = _key_sign(d, perm[mid], col, mode, ival, fval)
+        if sign < 0 or (upper and sign == 0):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@njit(**jit_options)
+def _hash_find(ix, col, key):
+    """Index of `key` among the hashed column's distinct keys, or -1."""
+    slots = carray(_cast_int_to_void_p(ix[col].slots), (ix[col].mask + 1,), dtype=np.int64)
+    keys = carray(_cast_int_to_void_p(ix[col].keys), (ix[col].ndistinct,), dtype=np.int64)
+    h = _hash_slot(key, ix[col].mask)
+    while slots[h] != -1:
+        if keys[slots[h]] == key:
+            return slots[h]
+        h = (h + 1) & ix[col].mask
+    return -1
+
+
+@njit(**jit_options)
+def _index_range(cur, order):
+    """Point the cursor at the permutation range of its driving index column:
+    the ORDER BY column `order` encodes (see _ORDER_SHIFT), else the
+    best-ranked indexed predicate column. The range is narrowed by every
+    predicate on that column; perm_p stays 0 (a rowid scan) when nothing
+    drives."""
+    c = carray(_cast_int_to_void_p(cur), (1,), dtype=_CUR_DTYPE)
+    d = carray(_cast_int_to_void_p(c[0].descriptor), (1,), dtype=_DESC_DTYPE)
+    ix = carray(_cast_int_to_void_p(d[0].col_indexes), (d[0].ncols,), dtype=_INDEX_DTYPE)
+    preds = carray(_cast_int_to_void_p(c[0].pred_p), (c[0].n_pred,), dtype=_PRED_DTYPE)
+    best = -1
+    desc = False
+    if order >= 2:
+        best = (order >> 1) - 1
+        desc = (order & 1) != 0
+    elif order == 0:
+        best_rank = 0
+        for k in range(c[0].n_pred):
+            rank = _index_rank(ix, preds[k].col, preds[k].op)
+            if rank > best_rank:
+                best = preds[k].col
+                best_rank = rank
+    if best < 0:
+        return
+    n = d[0].nrows
+    first = n - ix[best].nvalid  # NaN (NULL) rows occupy perm[:first]
+    perm = carray(_cast_int_to_void_p(ix[best].perm), (n,), dtype=np.int64)
+    lo = 0
+    hi = n
+    for k in range(c[0].n_pred):
+        if preds[k].col != best:
+            continue
+        lo = max(lo, first)  # a constraint never matches NULL
+        op = preds[k].op
+        mode = preds[k].is_int
+        if op == SQLITE_INDEX_CONSTRAINT_EQ and ix[best].slots != 0 and mode == 1:
+            g = _hash_find(ix, best, preds[k].ival)
+            if g < 0:
+                hi = lo
+                continue
+            starts = carray(_cast_int_to_void_p(ix[best].starts), (ix[best].ndistinct + 1,), dtype=np.int64)
+            a = first + starts[g]
+            b = first + starts[g + 1]
+        elif op == SQLITE_INDEX_CONSTRAINT_EQ:
+            a = _bisect(d, perm, first, n, best, mode, preds[k].ival, preds[k].fval, False)
+            b = _bisect(d, perm, a, n, best, mode, preds[k].ival, preds[k].fval, True)
+        elif op == SQLITE_INDEX_CONSTRAINT_GT:
+            a = _bisect(d, perm, first, n, best, mode, preds[k].ival, preds[k].fval, True)
+            b = n
+        elif op == SQLITE_INDEX_CONSTRAINT_GE:
+            a = _bisect(d, perm, first, n, best, mode, preds[k].ival, preds[k].fval, False)
+            b = n
+        elif op == SQLITE_INDEX_CONSTRAINT_LT:
+            a = first
+            b = _bisect(d, perm, first, n, best, mode, preds[k].ival, preds[k].fval, False)
+        else:
+            a = first
+            b = _bisect(d, perm, first, n, best, mode, preds[k].ival, preds[k].fval, True)
+        lo = max(lo, a)
+        hi = min(hi, b)
+    hi = max(lo, hi)
+    c[0].perm_p = ix[best].perm
+    if desc:
+        c[0].pos = hi - 1
+        c[0].end = lo - 1
+        c[0].step = -1
+    else:
+        c[0].pos = lo
+        c[0].end = hi
+        c[0].step = 1
+
+
 @njit(**jit_options)
 def _seek_match(cur):
     # No try/except: pure pointer arithmetic + bounded loads (0 <= col < ncols,
-    # rowid bounded by nrows), no NRT-managed allocation that could raise.
+    # rowid bounded by nrows, pos stepping within [-1, nrows]), no NRT-managed
+    # allocation that could raise. An exhausted indexed scan parks rowid at
+    # nrows so xEof stays a single comparison.
     c = carray(_cast_int_to_void_p(cur), (1,), dtype=_CUR_DTYPE)
     d = carray(_cast_int_to_void_p(c[0].descriptor), (1,), dtype=_DESC_DTYPE)
+    if c[0].perm_p != 0:
+        perm = carray(_cast_int_to_void_p(c[0].perm_p), (d[0].nrows,), dtype=np.int64)
+        while c[0].pos != c[0].end:
+            c[0].rowid = perm[c[0].pos]
+            if _row_matches(cur):
+                return
+            c[0].pos = c[0].pos + c[0].step
+        c[0].rowid = d[0].nrows
+        return
     while c[0].rowid < d[0].nrows and not _row_matches(cur):
         c[0].rowid = c[0].rowid + 1
 
@@ -564,10 +923,25 @@ def _xfilter(cur, idx_num, idx_str, argc, argv):
     c[0].pred_p = 0
     c[0].n_pred = 0
     c[0].rowid = 0
+    c[0].perm_p = 0
+    c[0].pos = 0
+    c[0].end = 0
+    c[0].step = 1
     try:
-        # argc equals xBestIndex's idxNum (= nbound) by construction, but only
-        # argc is load-bearing: idxStr holds argc (col, op) pairs and argv
-        # holds argc values, so the gate keys off argc alone.
+        plan = carray(_cast_int_to_void_p(idx_str), (1,), dtype=_PLAN_DTYPE)
+        need = plan[0].scratch_bytes
+        if need > c[0].scratch_cap:
+            # need <= numpy's int32 'U' itemsize cap + 1: the cast is safe
+            sqlite3_free(c[0].scratch_p)
+            c[0].scratch_cap = 0
+            c[0].scratch_p = sqlite3_malloc(int32(need))
+            if c[0].scratch_p == 0:
+                return SQLITE_NOMEM
+            c[0].scratch_cap = need
+        # argc equals the low bits of xBestIndex's idxNum (nbound) by
+        # construction, but only argc is load-bearing: idxStr holds argc
+        # (col, op) pairs after the plan header and argv holds argc values,
+        # so the gate keys off argc alone.
         if argc > 0:
             pred_p = sqlite3_malloc(int32(argc * _PRED_SIZE))
             if pred_p == 0:
@@ -575,7 +949,7 @@ def _xfilter(cur, idx_num, idx_str, argc, argv):
             c[0].pred_p = pred_p
             c[0].n_pred = argc
             preds = carray(_cast_int_to_void_p(pred_p), (argc,), dtype=_PRED_DTYPE)
-            spec = carray(_cast_int_to_void_p(idx_str), (argc,), dtype=_SPEC_DTYPE)
+            spec = carray(_cast_int_to_void_p(idx_str + _PLAN_SIZE), (argc,), dtype=_SPEC_DTYPE)
             vals = carray(_cast_int_to_void_p(argv), (argc,), dtype=np.intp)
             d = carray(_cast_int_to_void_p(c[0].descriptor), (1,), dtype=_DESC_DTYPE)
             ncols = d[0].ncols
@@ -605,12 +979,14 @@ def _xfilter(cur, idx_num, idx_str, argc, argv):
                     preds[k].is_int = 0
                     preds[k].ival = 0
                     preds[k].fval = sqlite3_value_double(vals[k])
+        _index_range(cur, idx_num >> _ORDER_SHIFT)
         _seek_match(cur)
         return SQLITE_OK
     except Exception:
         sqlite3_free(c[0].pred_p)
         c[0].pred_p = 0
         c[0].n_pred = 0
+        c[0].perm_p = 0
         return SQLITE_ERROR
 
 
@@ -619,7 +995,10 @@ def _xnext(cur):
     # No try/except: pure pointer arithmetic + bounded loads (0 <= col < ncols,
     # rowid bounded by nrows), no NRT-managed allocation that could raise.
     c = carray(_cast_int_to_void_p(cur), (1,), dtype=_CUR_DTYPE)
-    c[0].rowid = c[0].rowid + 1
+    if c[0].perm_p != 0:
+        c[0].pos = c[0].pos + c[0].step
+    else:
+        c[0].rowid = c[0].rowid + 1
     _seek_match(cur)
     return SQLITE_OK
 
@@ -745,7 +1124,7 @@ def _raise_rc(db, name, rc):
     raise RuntimeError("registration failed for %r (rc=%d)%s" % (name, rc, detail))
 
 
-def register_table(db, name, data, columns=None, *, text_as_blob=False):
+def register_table(db, name, data, columns=None, *, text_as_blob=False, indexes=(), hash_indexes=()):
     """Expose tabular data as a read-only eponymous SQLite virtual table
     (queryable directly as ``name`` with no CREATE VIRTUAL TABLE, since the
     module's xCreate is its xConnect).
@@ -791,6 +1170,25 @@ def register_table(db, name, data, columns=None, *, text_as_blob=False):
       length is passed), but C-string readers and most SQL text functions truncate
       at the first NUL; read it via ``sqlite3_column_bytes`` + the text/blob
       pointer, or use ``text_as_blob=True`` for full fidelity.
+
+    Indexes:
+
+    - ``indexes`` names numeric columns to index: each gets a sorted rowid
+      permutation built at registration (8 bytes per row), so an EQ / range
+      constraint on it scans only the matching rows, located by binary search,
+      instead of the whole table. xBestIndex costs such a plan at
+      O(log N + matches), which lets SQLite pick it as the inner loop of a join.
+    - ``hash_indexes`` names integer columns to additionally hash: an EQ
+      constraint with an integer value finds its rows in O(1). A hash-indexed
+      column needs no separate entry in ``indexes``.
+    - A single-term ``ORDER BY`` on an indexed column (ASC or DESC, NULLs --
+      NaN -- placed as SQLite places them) or ``ORDER BY rowid`` is served in
+      order by the scan itself, so SQLite skips its sorter -- unless a
+      constraint on another indexed column makes probing and sorting cheaper.
+    - Indexes are snapshots of the data at registration -- one more reason the
+      arrays must not be mutated while registered. A NaN cell never matches a
+      constraint; an unknown, string/blob or (for ``hash_indexes``)
+      non-integer column raises ``ValueError``.
     """
     if isinstance(data, np.ndarray):
         built = _build_descriptor(data, columns, text_as_blob)
@@ -802,5 +1200,6 @@ def register_table(db, name, data, columns=None, *, text_as_blob=False):
     else:
         raise TypeError("data must be a numpy.ndarray or a mapping of name -> 1-D array, "
                         "got %r" % (type(data),))
+    _build_indexes(built, indexes, hash_indexes)
     handle = _VTableHandle(built)
     _register_with_destroy(db, name, _THE_MODULE_P, built.c.ctypes.data, handle)
@@ -6,14 +6,20 @@ the PartitionReport surfaced as CompiledKernel.partition. Everything here
 operates on `core.variable` Variables/CompiledNodes and plain values; the
 only numba interaction is Dispatcher.compile probes and typeof.
 """
-from bisect import insort
+import time
+
 from dataclasses import dataclass, field
+from functools import cached_property
+from heapq import heappop, heappush
 from typing import Any, Callable
 
+import numpy
+
 from numba import njit, typeof
 from numba.core.dispatcher import Dispatcher
 from numba.core.errors import NumbaError
 
+from numbox.core.variable.timing import RuntimeProfile
 from numbox.core.variable.variable import Variable, CompiledNode
 
 
@@ -59,6 +65,14 @@ class _JitStep:
     dispatcher: Dispatcher
     in_vars: tuple[Variable, ...]
     out_vars: tuple[Variable, ...]
+    nodes: tuple[CompiledNode, ...] = ()    # the fused run: batch-twin regeneration, profile labels
+
+    @cached_property
+    def label(self) -> tuple[str, str, int]:
+        """(name, kind, node count) under which a `RuntimeProfile` records the step."""
+        quals = [n.variable.qual_name() for n in self.nodes] or [v.qual_name() for v in self.out_vars]
+        name = quals[0] if len(quals) == 1 else f"{quals[0]}..{quals[-1]}"
+        return name, "jit", len(quals)
 
 
 @dataclass(frozen=True)
@@ -67,6 +81,10 @@ class _PyStep:
     py_callable: Callable
     in_vars: tuple[Variable, ...]
 
+    @cached_property
+    def label(self) -> tuple[str, str, int]:
+        return self.var.qual_name(), "python", 1
+
 
 @dataclass(frozen=True)
 class _Plan:
@@ -74,14 +92,63 @@ class _Plan:
     external_vars: tuple[Variable, ...]     # kernel-argument order
     output_vars: tuple[Variable, ...]       # required order
 
-    def run(self, args: tuple) -> tuple:
+    def run(self, args: tuple, profile: RuntimeProfile | None = None) -> tuple:
+        slots = self.trace(args, profile)
+        return tuple(slots[v] for v in self.output_vars)
+
+    def trace(self, args: tuple, profile: RuntimeProfile | None = None) -> dict[Variable, Any]:
+        """Run the plan and return every slot ({Variable: value}), not just the outputs.
+        Each step is timed into `profile` when one is given."""
         slots = dict(zip(self.external_vars, args))
+        _run_steps(self.steps, slots, profile)
+        return slots
+
+
+def _run_steps(steps: tuple, slots: dict, profile: RuntimeProfile | None) -> None:
+    """Run plan steps in order, reading live-ins from and writing outputs to `slots`."""
+    for step in steps:
+        vals = [slots[v] for v in step.in_vars]
+        t0 = 0 if profile is None else time.monotonic_ns()
+        if isinstance(step, _JitStep):
+            slots.update(zip(step.out_vars, step.dispatcher(*vals)))
+        else:
+            slots[step.var] = step.py_callable(*vals)
+        if profile is not None:
+            profile.record(*step.label, time.monotonic_ns() - t0)
+
+
+def _column_dtype(value) -> numpy.dtype:
+    """Column dtype holding one per-row `value` in a batched plan: the value's own
+    numpy dtype for a numeric scalar, else object (only a Python step can consume it)."""
+    arr = numpy.asarray(value)
+    if arr.ndim == 0 and arr.dtype.kind in "biufcmM":
+        return arr.dtype
+    return numpy.dtype(object)
+
+
+@dataclass(frozen=True)
+class _BatchPlan:
+    """Row-batched twin of _Plan: every slot holds a column (one entry per row).
+    A jit step's dispatcher is a batch segment that loops the rows natively,
+    writing its live-outs into columns preallocated here; a Python step is
+    called once per row."""
+    steps: tuple[_JitStep | _PyStep, ...]
+    external_vars: tuple[Variable, ...]     # kernel-argument order
+    output_vars: tuple[Variable, ...]       # required order
+
+    def run(self, columns: tuple, n_rows: int, dtypes: dict[Variable, numpy.dtype]) -> tuple:
+        slots = dict(zip(self.external_vars, columns))
         for step in self.steps:
-            vals = [slots[v] for v in step.in_vars]
+            ins = [slots[v] for v in step.in_vars]
             if isinstance(step, _JitStep):
-                slots.update(zip(step.out_vars, step.dispatcher(*vals)))
+                outs = [numpy.empty(n_rows, dtype=dtypes[v]) for v in step.out_vars]
+                step.dispatcher(n_rows, *ins, *outs)
+                slots.update(zip(step.out_vars, outs))
             else:
-                slots[step.var] = step.py_callable(*vals)
+                out = numpy.empty(n_rows, dtype=dtypes[step.var])
+                for i in range(n_rows):
+                    out[i] = step.py_callable(*[col[i] for col in ins])
+                slots[step.var] = out
         return tuple(slots[v] for v in self.output_vars)
 
 
@@ -92,13 +159,8 @@ class _ConePlan:
     reads live-ins from and writes every step output back to the shared store."""
     steps: tuple[_JitStep | _PyStep, ...]
 
-    def run_into(self, store: dict) -> None:
-        for step in self.steps:
-            vals = [store[v] for v in step.in_vars]
-            if isinstance(step, _JitStep):
-                store.update(zip(step.out_vars, step.dispatcher(*vals)))
-            else:
-                store[step.var] = step.py_callable(*vals)
+    def run_into(self, store: dict, profile: RuntimeProfile | None = None) -> None:
+        _run_steps(self.steps, store, profile)
 
 
 def _qual(node: CompiledNode) -> str:
@@ -115,9 +177,12 @@ def _linearize_from(nodes: list[CompiledNode], demoted: set[Variable], start_jit
             if producer is not None:    # external inputs are pre-satisfied
                 indeg[n] += 1
                 dependents.setdefault(producer, []).append(n)
+    # Ready queues are min-heaps on qual_name (unique per node, so the node
+    # itself is never compared): O(log n) per push/pop on wide graphs.
     jit_q, py_q = [], []
-    for n in sorted((n for n in nodes if indeg[n] == 0), key=_qual):
-        (py_q if n.variable in demoted else jit_q).append(n)
+    for n in nodes:
+        if indeg[n] == 0:
+            heappush(py_q if n.variable in demoted else jit_q, (_qual(n), n))
     order = []
     on_jit = start_jit
     while jit_q or py_q:
@@ -125,12 +190,12 @@ def _linearize_from(nodes: list[CompiledNode], demoted: set[Variable], start_jit
         if not queue:
             on_jit = not on_jit
             continue
-        n = queue.pop(0)
+        _, n = heappop(queue)
         order.append(n)
-        for d in sorted(dependents.get(n, []), key=_qual):
+        for d in dependents.get(n, ()):
             indeg[d] -= 1
             if indeg[d] == 0:
-                insort(py_q if d.variable in demoted else jit_q, d, key=_qual)
+                heappush(py_q if d.variable in demoted else jit_q, (_qual(d), d))
     return order
 
 
@@ -192,7 +257,8 @@ def segment_liveness(
             continue
         if seen_any:
             after.update(n.inputs)
-    live_out = {v for v in produced if v in after or v in set(required_vars)}
+    required = set(required_vars)
+    live_out = {v for v in produced if v in after or v in required}
     key = lambda v: v.qual_name()   # noqa: E731 - tiny local sort key
     return tuple(sorted(live_in, key=key)), tuple(sorted(live_out, key=key))
 
@@ -268,21 +334,57 @@ def _call_exotic(binding, args: list, arg_types: tuple, flags: dict | None = Non
     return shim(*args)
 
 
-def _dominators(nodes: list[CompiledNode], sources: set[Variable]) -> dict[Variable, frozenset]:
-    """Dominator set per node for the DAG rooted at a virtual super-source
+def _dominator_intervals(nodes: list[CompiledNode], sources: set[Variable]) -> dict[Variable, tuple[int, int]]:
+    """Dominator-tree intervals for the DAG rooted at a virtual super-source
     (represented by None) with an edge to every node that is in `sources` or
-    has an external input. `nodes` must be topologically ordered. Each node's
-    set includes the node itself."""
-    by_var = {n.variable: n for n in nodes}
-    dom: dict[Variable, frozenset] = {}
+    has an external input. `nodes` must be topologically ordered.
+
+    Immediate dominators come from one topological pass (a dominator always
+    precedes the nodes it dominates, so intersecting predecessors walks up
+    the tree by topological index); an iterative DFS over the tree then
+    numbers each node with (enter, exit) so that ``a`` dominates ``b`` iff
+    ``a``'s interval contains ``b``'s. Unlike per-node dominator sets, this
+    stays near-linear on deep chains."""
+    index = {n.variable: i for i, n in enumerate(nodes)}
+    idom: dict[Variable, Variable | None] = {}
+
+    def intersect(a, b):
+        while a != b:
+            while a is not None and (b is None or index[a] > index[b]):
+                a = idom[a]
+            while b is not None and (a is None or index[b] > index[a]):
+                b = idom[b]
+        return a
+
     for n in nodes:
         var = n.variable
-        seeds = [dom[inp] for inp in n.inputs if inp in by_var]
-        if var in sources or any(inp not in by_var for inp in n.inputs):
-            seeds.append(frozenset({None}))
-        inter = frozenset.intersection(*seeds) if seeds else frozenset({None})
-        dom[var] = inter | {var}
-    return dom
+        preds = [inp for inp in n.inputs if inp in index]
+        if var in sources or len(preds) < len(n.inputs) or not preds:
+            idom[var] = None
+            continue
+        dominator = preds[0]
+        for pred in preds[1:]:
+            dominator = intersect(dominator, pred)
+        idom[var] = dominator
+    children: dict[Variable | None, list[Variable]] = {}
+    for n in nodes:
+        children.setdefault(idom[n.variable], []).append(n.variable)
+    intervals = {}
+    clock = 0
+    stack = [(None, iter(children.get(None, ())))]
+    while stack:
+        var, pending = stack[-1]
+        child = next(pending, None)
+        if child is not None:
+            intervals[child] = (clock, None)
+            clock += 1
+            stack.append((child, iter(children.get(child, ()))))
+            continue
+        stack.pop()
+        if var is not None:
+            intervals[var] = (intervals[var][0], clock)
+            clock += 1
+    return intervals
 
 
 def compute_boundary(
@@ -293,7 +395,7 @@ def compute_boundary(
     reach the consumer without reaching the node, making it a cone live-in).
     Nodes that dominate all their consumers are fuse-through (not persisted)."""
     by_var = {n.variable: n for n in nodes}
-    dom = _dominators(nodes, sources)
+    intervals = _dominator_intervals(nodes, sources)
     consumers: dict[Variable, list[Variable]] = {}
     for n in nodes:
         for inp in n.inputs:
@@ -302,8 +404,12 @@ def compute_boundary(
     boundary = set(required)
     for n in nodes:
         var = n.variable
-        if any(var not in dom[c] for c in consumers.get(var, ())):
-            boundary.add(var)
+        enter, exit_ = intervals[var]
+        for c in consumers.get(var, ()):
+            c_enter, c_exit = intervals[c]
+            if not (enter <= c_enter and c_exit <= exit_):
+                boundary.add(var)
+                break
     return boundary
 
 
@@ -319,9 +425,10 @@ def _evaluate(
     (no probing). Demoted nodes run their py_func; exotic bindings run via the
     @njit shim; the rest run their Dispatcher.
 
-    Invoked by `CompiledKernel._ensure_store` to seed the value store on the
+    Invoked by `Session._ensure_store` to seed the value store on the
     first `recompute()` of a declared kernel -- the declarations supply the
-    demotion set directly, so no discovery/probing is needed. (This is not a
+    demotion set directly, so no discovery/probing is needed -- and of any
+    `Session`, which reuses the kernel's verdicts. (This is not a
     NumbaError fallback: the NumbaError-driven re-discovery path is
     `_run_segmented`/`discover`, which a declared kernel deliberately skips.)"""
     for node in ordered_nodes:
@@ -54,13 +54,20 @@ unrelated modules' ``__getattr__`` on every compile) -- change such a value and
 clear the cache.
 """
 import hashlib
+import threading
+import time
 import warnings
 
-from collections import OrderedDict
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from types import FunctionType, ModuleType
 from typing import Any, Callable, NamedTuple
 
-from numba import njit, typeof
+import numpy
+
+from numba import get_num_threads, njit, prange, set_num_threads, typeof
+from numba.core import event as ev
 from numba.core.caching import NullCache
 from numba.core.ccallback import CFunc
 from numba.core.dispatcher import Dispatcher
@@ -69,9 +76,10 @@ from numba.np.ufunc.dufunc import DUFunc
 
 from numbox.core.configurations import jit_options as _default_jit_options
 from numbox.core.variable._kernel_partition import (
-    PartitionReport, Segment, _ConePlan, _JitStep, _Plan, _PyStep,
-    _evaluate, build_runs, compute_boundary, cone_liveness, discover, linearize, segment_liveness,
+    PartitionReport, Segment, _BatchPlan, _ConePlan, _JitStep, _Plan, _PyStep,
+    _column_dtype, _evaluate, build_runs, compute_boundary, cone_liveness, discover, linearize, segment_liveness,
 )
+from numbox.core.variable.timing import RuntimeProfile
 from numbox.core.variable.utils import (
     _assign_identifiers, _check_formula_arity, _validate_declared_return, _wrap_formula,
 )
@@ -101,6 +109,134 @@ class _KernelCtx(NamedTuple):
     external: set
 
 
+@dataclass(frozen=True)
+class UnitCompile:
+    """One compiled unit -- the fused kernel or a jit segment -- as logged in
+    `CompiledKernel.compile_log`."""
+    unit: str                      # "fused" | "segment"
+    nodes: tuple[str, ...]         # qual_names fused into the unit
+    signature: str                 # argument types the unit was compiled for
+    seconds: float                 # wall time of the compile or on-disk cache load
+    cache: str                     # "hit" (loaded from disk) | "miss" (compiled) | "off" (uncached)
+
+
+@dataclass
+class UnitProfile:
+    """Compile-time breakdown of one unit, see `CompileProfile`. The numba phases
+    come from the overload's compile metadata and are zero on a cache hit."""
+    unit: str                      # "fused" | "segment"
+    nodes: int                     # graph nodes fused into the unit
+    source_bytes: int              # size of the generated unit source
+    cache: str                     # as `UnitCompile.cache`
+    seconds: float                 # the whole dispatcher compile
+    typing: float = 0.0            # type inference, including first compiles of the formulas it calls
+    lowering: float = 0.0          # native lowering: LLVM IR generation, optimization and codegen
+    llvm: float = 0.0              # time holding numba's LLVM lock (overlaps typing and lowering)
+    cache_load: float = 0.0        # on-disk cache load (a hit)
+    cache_store: float = 0.0       # on-disk cache store after a fresh compile (a miss)
+
+
+@dataclass
+class CompileProfile:
+    """Where `compile_kernel` spends its time, collected with
+    ``compile_kernel(..., profile=True)`` and exposed as
+    `CompiledKernel.compile_profile`.
+
+    `phases` accumulates seconds per Python-side build phase: ``"graph"``
+    (`Graph.compile`), ``"validate"`` (declared-return probes), ``"codegen"``
+    (kernel and segment source generation) and ``"fingerprint"`` (the formula
+    fingerprints of the cache digest). `units` gets one `UnitProfile` per
+    compiled fused kernel or jit segment -- at build for a fully-declared graph,
+    at the first call otherwise."""
+    phases: dict[str, float] = field(default_factory=dict)
+    units: list[UnitProfile] = field(default_factory=list)
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values()) + sum(u.seconds for u in self.units)
+
+    def format(self) -> str:
+        lines = [f"compile profile: {self.total:.3f}s"]
+        lines += [f"  {name:<12}{seconds:10.3f}s" for name, seconds in self.phases.items()]
+        if self.units:
+            lines.append(f"  {'unit':<10}{'nodes':>6}{'source':>9}{'cache':>6}{'total':>9}"
+                         f"{'typing':>9}{'lowering':>9}{'llvm':>9}{'load':>9}{'store':>9}")
+            for u in self.units:
+                lines.append(
+                    f"  {u.unit:<10}{u.nodes:>6}{u.source_bytes:>9}{u.cache:>6}{u.seconds:9.3f}"
+                    f"{u.typing:9.3f}{u.lowering:9.3f}{u.llvm:9.3f}{u.cache_load:9.3f}{u.cache_store:9.3f}"
+                )
+        return "\n".join(lines)
+
+
+def _phase(profile: CompileProfile | None, name: str):
+    return nullcontext() if profile is None else profile.phase(name)
+
+
+class _CompileSpan(ev.Listener):
+    """Wall time of one dispatcher's ``numba:compile`` event. The event brackets
+    the compile proper but not the cache store that follows it; callee
+    dispatchers compiled meanwhile fire their own events and are ignored."""
+    def __init__(self, disp: Dispatcher) -> None:
+        self._disp = disp
+        self._t0 = None
+        self.seconds = 0.0
+
+    def on_start(self, event):
+        if event.data["dispatcher"] is self._disp:
+            self._t0 = time.perf_counter()
+
+    def on_end(self, event):
+        if event.data["dispatcher"] is self._disp and self._t0 is not None:
+            self.seconds += time.perf_counter() - self._t0
+
+
+def _pass_seconds(metadata: dict, fragment: str) -> float:
+    return sum(t.run for passes in metadata.get("pipeline_times", {}).values()
+               for name, t in passes.items() if fragment in name)
+
+
+def _timed_compile(
+    disp: Dispatcher, sig: tuple, unit: str, nodes: tuple[str, ...],
+    profile: CompileProfile | None = None, source: str = "",
+) -> UnitCompile:
+    """`disp.compile(sig)`, timed. numba counts an on-disk load in the
+    dispatcher's `cache_hits` and a fresh compile in `cache_misses`; an uncached
+    dispatcher (a ``NullCache``) counts neither. With a `profile`, the unit's
+    numba phases are appended to it as well."""
+    hits = sum(disp.stats.cache_hits.values())
+    span = _CompileSpan(disp)
+    t0 = time.perf_counter()
+    with nullcontext() if profile is None else ev.install_listener("numba:compile", span):
+        disp.compile(sig)
+    seconds = time.perf_counter() - t0
+    if isinstance(disp._cache, NullCache):
+        status = "off"
+    else:
+        status = "hit" if sum(disp.stats.cache_hits.values()) > hits else "miss"
+    if profile is not None:
+        metadata = disp.overloads[tuple(sig)].metadata or {}
+        profile.units.append(UnitProfile(
+            unit=unit, nodes=len(nodes), source_bytes=len(source.encode("utf-8")), cache=status,
+            seconds=seconds,
+            typing=_pass_seconds(metadata, "type_inference"),
+            lowering=_pass_seconds(metadata, "native_lowering"),
+            llvm=metadata.get("timers", {}).get("llvm_lock", 0.0),
+            cache_load=seconds if status == "hit" else 0.0,
+            cache_store=max(seconds - span.seconds, 0.0) if status == "miss" else 0.0,
+        ))
+    return UnitCompile(unit=unit, nodes=nodes, signature="(" + ", ".join(str(t) for t in sig) + ")",
+                       seconds=seconds, cache=status)
+
+
 def _formula_fingerprint(formula) -> tuple[str, bool]:
     """Behavioral identity of a formula for the cache digest.
 
@@ -285,13 +421,38 @@ def _assemble_source(params: list[tuple[str, str, str]], lines: list[str], out_i
     return f"def _kernel({sig}):\n{body}{ret}\n"
 
 
+def _assemble_batch_source(
+    params: list[tuple[str, str, str]], lines: list[str], out_ids: list[str], parallel: bool = False,
+) -> str:
+    """Row-batched twin of `_assemble_source`: the row count `_n` comes first, then
+    one input column `_c_<ident>` per parameter and one output column `_o<k>` per
+    output; the same body lines run once per row inside a native loop and each
+    row's outputs are written in place. Generated identifiers never start with an
+    underscore, so the `_`-prefixed loop names cannot collide with them.
+
+    With `parallel` the row loop is a `prange` (compile with ``parallel=True``):
+    every body temporary is row-local SSA and every row writes only its own output
+    slots, so rows share no mutable state."""
+    cols = [f"_c_{ident}" for _, _, ident in params]
+    outs = [f"_o{k}" for k in range(len(out_ids))]
+    loop = [f"    for _i in {'prange' if parallel else 'range'}(_n):"]
+    loads = [f"        {ident} = _c_{ident}[_i]" for _, _, ident in params]
+    body = ["    " + line for line in lines]
+    stores = [f"        {out}[_i] = {ident}" for out, ident in zip(outs, out_ids)]
+    sig = ", ".join(["_n"] + cols + outs)
+    return f"def _kernel({sig}):\n" + "\n".join(loop + loads + body + stores) + "\n"
+
+
 def _emit_lines(
     nodes: list[CompiledNode], skip: set[Variable],
     idents: dict[Variable, str], bindings: dict[str, Any], flags: dict | None = None,
 ) -> list[str]:
     """Emit one body line per node (excluding `skip`), filling `bindings`;
-    raises on a missing formula, a non-callable formula, or an arity mismatch."""
+    raises on a missing formula, a non-callable formula, or an arity mismatch.
+    A formula object shared by many nodes is wrapped and arity-checked once."""
     lines = []
+    wrapped = {}    # id(formula) -> njit-callable
+    checked = set()     # (id(formula), n_inputs) already arity-checked
     for node in nodes:
         var = node.variable
         if var in skip:
@@ -303,11 +464,16 @@ def _emit_lines(
             )
         temp = idents[var]
         fg = "f_" + temp
-        try:
-            bindings[fg] = _wrap_formula(var.formula, flags)
-        except TypeError as e:
-            raise TypeError(f"{var.qual_name()!r}: {e}") from e
-        _check_formula_arity(var.formula, len(node.inputs), var.qual_name())
+        binding = wrapped.get(id(var.formula))
+        if binding is None:
+            try:
+                binding = wrapped[id(var.formula)] = _wrap_formula(var.formula, flags)
+            except TypeError as e:
+                raise TypeError(f"{var.qual_name()!r}: {e}") from e
+        bindings[fg] = binding
+        if (id(var.formula), len(node.inputs)) not in checked:
+            _check_formula_arity(var.formula, len(node.inputs), var.qual_name())
+            checked.add((id(var.formula), len(node.inputs)))
         arg_ids = ", ".join(idents[inp] for inp in node.inputs)
         in_names = ", ".join(repr(inp.qual_name()) for inp in node.inputs)
         lines.append(f"    {temp} = {fg}({arg_ids})  # {var.qual_name()!r} = f({in_names})")
@@ -317,9 +483,12 @@ def _emit_lines(
 def _generate_segment_body(
     run_nodes: list[CompiledNode], live_in: tuple[Variable, ...],
     live_out: tuple[Variable, ...], idents: dict[Variable, str], flags: dict | None = None,
+    batch: bool = False, parallel: bool = False,
 ) -> tuple[str, dict, list, list]:
     """Like _generate_body, for one jit segment: live-ins are parameters,
     live-outs the return tuple. Same source shape so _compile applies verbatim.
+    With `batch`, live-ins/live-outs are columns instead (`_assemble_batch_source`,
+    a `prange` row loop when `parallel`).
 
     Returns (source, bindings, params, outputs) with params/outputs in the
     caller-provided (qual-sorted) live_in/live_out order.
@@ -329,15 +498,23 @@ def _generate_segment_body(
     lines = _emit_lines(run_nodes, set(), idents, bindings, flags)
     outputs = [v.qual_name() for v in live_out]
     out_ids = [idents[v] for v in live_out]
-    source = _assemble_source(params, lines, out_ids)
+    if batch:
+        source = _assemble_batch_source(params, lines, out_ids, parallel)
+    else:
+        source = _assemble_source(params, lines, out_ids)
     return source, bindings, params, outputs
 
 
 def _generate_body(
     compiled: CompiledGraph, required: list[str], idents: dict[Variable, str], flags: dict | None = None,
+    batch: bool = False, parallel: bool = False,
 ) -> tuple[str, dict, list, list]:
     """Generate `def _kernel(...): ...` source (no decorator) + bindings.
 
+    With `batch`, the source is the row-batched kernel (`_assemble_batch_source`):
+    external columns in, output columns written in place, one native row loop
+    (a `prange` loop when `parallel`).
+
     Returns (source, bindings, params, outputs):
       source   - the kernel def as text (function name is the literal _kernel)
       bindings - {formula_global_name: njit-callable}
@@ -366,13 +543,16 @@ def _generate_body(
         outputs.append(q)
         out_ids.append(idents[var])
 
-    source = _assemble_source(params, lines, out_ids)
+    if batch:
+        source = _assemble_batch_source(params, lines, out_ids, parallel)
+    else:
+        source = _assemble_source(params, lines, out_ids)
     return source, bindings, params, outputs
 
 
 def _compile(
     source: str, bindings: dict[str, Any], jit_options: dict | None, cache: bool | None,
-    declared_sigs: tuple = (),
+    declared_sigs: tuple = (), profile: CompileProfile | None = None,
 ) -> Dispatcher:
     """Content-addressed compile of the kernel source into an @njit dispatcher.
 
@@ -380,15 +560,21 @@ def _compile(
     external signature for an eager fused kernel, each segment's live-in/out
     signature for an eager segment -- folded into the digest via `repr` so two
     declared-type variants of one type-free source get distinct anchors. Empty
-    for undeclared (Case C) units."""
+    for undeclared (Case C) units. Formula fingerprinting is timed into
+    `profile` when one is given."""
     fingerprints = []
     cacheable = True
     self_cached = []
+    inspected = {}      # id(formula) -> (fingerprint, ok, self-cached); shared formulas are inspected once
     for fg, formula in bindings.items():
-        fp, ok = _formula_fingerprint(formula)
+        if id(formula) not in inspected:
+            with _phase(profile, "fingerprint"):
+                fp, ok = _formula_fingerprint(formula)
+                inspected[id(formula)] = (fp, ok, _references_self_cached(formula, set()))
+        fp, ok, is_self_cached = inspected[id(formula)]
         fingerprints.append(f"{fg}: {fp}")
         cacheable = cacheable and ok
-        if _references_self_cached(formula, set()):
+        if is_self_cached:
             cacheable = False
             self_cached.append(_self_cached_name(formula))
     if self_cached:
@@ -454,11 +640,17 @@ def _compile(
     # __name__ must be an importable module so numba can rebuild the cached
     # overload's environment in another process (importlib.import_module needs
     # a real name, not None); mirrors make_graph / make_structref.
-    ns = {**bindings, "njit": njit, "_kernel_jit_options": opts, "__name__": __name__}
+    ns = {**bindings, "njit": njit, "prange": prange, "_kernel_jit_options": opts, "__name__": __name__}
     exec(code, ns)  # nosec B102 - JIT codegen of internal source
     return ns.pop(name)
 
 
+def _session_state(name: str) -> property:
+    """Kernel attribute forwarding to the same-named state of its default session."""
+    return property(lambda self: getattr(self._session, name),
+                    lambda self, value: setattr(self._session, name, value))
+
+
 class CompiledKernel:
     """A fused @njit kernel compiled from a Variable graph.
 
@@ -471,6 +663,12 @@ class CompiledKernel:
       recompute   - value-only incremental refresh of only the cone affected
                     by a change, over a store seeded by a prior `kernel` call;
                     returns a tuple in `outputs` order (see `recompute`).
+      session     - a new `Session`: independent recompute state (store, boundary)
+                    sharing this kernel's dispatchers and cone-plan cache; safe
+                    to use from multiple threads (see `Session`).
+      kernel_batch - row-batched hot path: one input column per `params` entry
+                    -> tuple of output columns, all rows in one native loop
+                    (see `kernel_batch` / `execute_batch`).
       params      - external input qual_names, kernel-argument order.
       outputs     - requested variable qual_names, return-tuple order.
       source      - generated kernel source text.
@@ -482,6 +680,15 @@ class CompiledKernel:
                     eagerly at build; False for a discovery (undeclared) kernel.
                     Declared kernels enforce the `recompute()` type contract
                     instead of re-discovering.
+      compile_log - list of UnitCompile, one per fused-kernel or segment compile
+                    (eager at build for declared graphs, at resolution
+                    otherwise): compile time and on-disk cache hit/miss.
+      compile_profile - CompileProfile with the per-phase and per-unit compile
+                    time breakdown when built with ``profile=True``, else None.
+      profile     - opt-in RuntimeProfile (None by default): when set, full calls
+                    and recomputes of this kernel and its sessions record call
+                    counts and wall time per jit segment, per Python-demoted node,
+                    or for the whole fused kernel. Read `kernel` after setting it.
     """
 
     def __init__(self, kernel: Dispatcher, params: list[tuple[str, str, str]],
@@ -493,6 +700,9 @@ class CompiledKernel:
         self._mode = "virgin"
         self._plan = None
         self.partition = None
+        self.compile_log = []
+        self.compile_profile = None
+        self.profile: RuntimeProfile | None = None
         self._ctx = ctx
         self._param_keys = [(src, name) for src, name, _ in params]
         self.params = [make_qual_name(src, name) for src, name, _ in params]
@@ -501,13 +711,20 @@ class CompiledKernel:
         self.identifiers = identifiers
         self._required_vars = required_vars
         self._external_vars = external_vars
-        self._store = None          # {Variable: value}; seeded on first recompute
         self._demoted = {}          # {Variable: reason}; frozen demotion verdicts
-        self._last_args = None      # external args of the most recent full resolution
-        self._sources = None        # change-source Variables (externals; may grow on interior override)
-        self._boundary = None       # set[Variable]; persisted-node set, computed lazily
-        self._cone_cache = OrderedDict()  # LRU cache of cone sub-plans, keyed on cone+live-in
+        self._lock = threading.RLock()  # guards mode resolution and the shared cone-plan cache
+        self._session = Session(self, _default=True)  # the kernel's own recompute state
+        self._cone_cache = OrderedDict()  # LRU cache of cone sub-plans, shared by all sessions
+        self._seed_plans = {}       # {demoted qual_names: whole-graph seeding plan}, built lazily
         self._cone_cap = 64         # max distinct cone plans retained before LRU eviction
+        self._batch_fused = {}      # {parallel: row-batched twin of the fused kernel}, built lazily
+        self._batch_plans = {}      # {parallel: (scalar _Plan, its _BatchPlan twin)}, rebuilt on re-discovery
+
+    # The kernel's own incremental state lives in its default session.
+    _store = _session_state("_store")
+    _last_args = _session_state("_last_args")
+    _sources = _session_state("_sources")
+    _boundary = _session_state("_boundary")
 
     @property
     def kernel(self) -> Callable:
@@ -515,7 +732,7 @@ class CompiledKernel:
             # Fused is permanent: later signatures go through numba's own
             # dispatch, and a typing failure there raises -- no segmentation
             # fallback from fused mode.
-            return self._fused
+            return self._fused if self.profile is None else self._profiled_fused
         if self._mode == "fused-pending":
             return self._fused_pending_call
         if self._mode == "segmented":
@@ -527,12 +744,21 @@ class CompiledKernel:
         # the mode has flipped to "fused", go straight to the dispatcher without
         # re-stamping _last_args (the first call already captured the seeding args).
         if self._mode == "fused":
-            return self._fused(*args)
-        result = self._fused(*args)
+            return self._call_fused(args)
+        result = self._call_fused(args)
         self._last_args = args
         self._mode = "fused"
         return result
 
+    def _call_fused(self, args: tuple) -> tuple:
+        return self._fused(*args) if self.profile is None else self._profiled_fused(*args)
+
+    def _profiled_fused(self, *args) -> tuple:
+        t0 = time.monotonic_ns()
+        result = self._fused(*args)
+        self.profile.record("fused", "fused", len(self.partition.segments[0].nodes), time.monotonic_ns() - t0)
+        return result
+
     def _fused_report(self) -> PartitionReport:
         compiled, external = self._ctx.compiled, self._ctx.external
         nodes = tuple(
@@ -547,29 +773,32 @@ class CompiledKernel:
     def _resolve_and_call(self, *args) -> tuple:
         if self._mode != "virgin":
             return self.kernel(*args)
+        result = self._resolve(args)
+        self._last_args = args
+        return result
+
+    def _resolve(self, args: tuple, seed: bool = True) -> tuple:
+        """Resolve the mode of a virgin kernel on `args` and run it. With `seed`,
+        a discovery run seeds the kernel's own value store."""
         try:
             arg_types = tuple(typeof(a) for a in args)
         except (ValueError, TypeError):
             arg_types = None
         if arg_types is not None:
             try:
-                self._fused.compile(arg_types)
+                record = _timed_compile(self._fused, arg_types, "fused", self._fused_report().segments[0].nodes,
+                                        self.compile_profile, self.source)
             except NumbaError:
-                result = self._discover_and_run(args)
-                self._last_args = args
-                return result
+                return self._discover_and_run(args, seed)
+            self.compile_log.append(record)
             self._mode = "fused"
             self.partition = self._fused_report()
-            result = self._fused(*args)
-            self._last_args = args
-            return result
-        result = self._discover_and_run(args)
-        self._last_args = args
-        return result
+            return self._call_fused(args)
+        return self._discover_and_run(args, seed)
 
     def _run_segmented(self, *args) -> tuple:
         try:
-            result = self._plan.run(args)
+            result = self._plan.run(args, self.profile)
         except NumbaError:
             # Deliberately broad: a segment failing to compile for new input
             # types triggers re-discovery. A NumbaError raised inside a
@@ -584,7 +813,7 @@ class CompiledKernel:
             self._last_args = args
         return result
 
-    def _discover_and_run(self, args: tuple) -> tuple:
+    def _discover_and_run(self, args: tuple, seed: bool = True) -> tuple:
         compiled, idents, bindings_by_var, jit_options, cache, external = self._ctx
         flags = _effective_flags(jit_options)
         values = dict(zip(self._external_vars, args))
@@ -617,12 +846,15 @@ class CompiledKernel:
             live_in, live_out = segment_liveness(
                 run_nodes, external, self._required_vars, order
             )
-            src, seg_bindings, _, _ = _generate_segment_body(
-                run_nodes, live_in, live_out, idents, flags
-            )
-            disp = _compile(src, seg_bindings, jit_options, cache)
-            disp.compile(tuple(typeof(values[v]) for v in live_in))
-            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out))
+            with _phase(self.compile_profile, "codegen"):
+                src, seg_bindings, _, _ = _generate_segment_body(
+                    run_nodes, live_in, live_out, idents, flags
+                )
+            disp = _compile(src, seg_bindings, jit_options, cache, profile=self.compile_profile)
+            self.compile_log.append(_timed_compile(
+                disp, tuple(typeof(values[v]) for v in live_in), "segment", quals, self.compile_profile, src))
+            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out,
+                                  nodes=tuple(run_nodes)))
             segments.append(Segment(
                 kind="jit", nodes=quals,
                 inputs=tuple(v.qual_name() for v in live_in),
@@ -634,40 +866,436 @@ class CompiledKernel:
             external_vars=tuple(self._external_vars),
             output_vars=tuple(self._required_vars),
         )
-        self._store = values              # seed store from the already-computed values
+        if seed:
+            self._store = values          # seed store from the already-computed values
         self._demoted = demoted           # freeze demotion verdicts for cone builds
         self._mode = "segmented"
         self.partition = PartitionReport(mode="segmented", segments=tuple(segments))
         return tuple(values[v] for v in self._required_vars)
 
+    def recompute(self, changed: dict) -> tuple:
+        """Incrementally re-evaluate only the cone affected by `changed`.
+
+        Mirrors :meth:`numbox.core.variable.variable.CompiledGraph.recompute`: this
+        is a value-only refresh, not a recompile. `changed` is
+        ``{source: {name: value}}``; the returned tuple is in `outputs` order. The
+        same variables may carry different values across calls, but their numba types
+        must stay the same as the seeding call (a type change is recovered from once,
+        see below, but the contract is same-types).
+
+        Precondition: a prior full call (``kernel(...)`` / ``execute(...)``) must have
+        seeded the value store. Calling `recompute` first raises ``RuntimeError``.
+
+        What it does: it writes the changed values into a persistent value store,
+        collects the downstream cone of the changed nodes, and re-fuses just that cone
+        -- reading every unchanged input from the store. The cone sub-plan is compiled
+        on first use and kept in a bounded LRU cache keyed on the cone and its live-in
+        boundary, so a recurring change pattern reuses its compiled plan without
+        re-fusing. Nodes that were demoted to plain Python at seed time stay Python in
+        the cone; the jittable remainder fuses into ``@njit`` segments.
+
+        Persistence: every cone segment compiles through the same content-addressed
+        on-disk anchors as the kernel itself, keyed on the cone and its live-in
+        boundary (the generated source) and the live-in types (numba's cache index).
+        When the per-node formulas are not compiled in this process -- a worker that
+        loaded the kernel from the on-disk cache -- the store is seeded by a whole-graph
+        plan compiled the same way instead of node by node. A restarted worker thus
+        loads both from disk rather than JIT-compiling them.
+
+        Interior overrides: a `changed` name may resolve to an interior (computed) node
+        rather than an external input -- mirroring the interpreted path. Its value is
+        overridden in the store and only its downstream cone recomputes; the overridden
+        node's own formula is *not* re-run -- unless the node is itself downstream of
+        another changed input in the same call, in which case graph priority applies and
+        it is recomputed from its formula. The first override of a not-yet-seen interior
+        node expands the change-source set and rebuilds the persisted-node boundary (and
+        invalidates cached cone plans, whose boundaries have shifted).
+
+        Limitations:
+
+        - Do not interleave input-changing ``kernel(...)`` throughput calls between
+          `recompute` calls. `recompute` is the stateful entry point: the store is
+          seeded once, and a throughput call does not update it, so a subsequent
+          `recompute` would read stale unchanged values. Use `recompute` for the
+          incremental workflow and the bare kernel for independent one-shot calls,
+          or hold one `Session` (see `session`) per independent scenario.
+        - An interior plain-Python (demoted) node must return a stable numba type across
+          recomputes. The same-types contract extends to demoted outputs: a demoted
+          node whose output type drifts between recomputes is not supported.
+
+        On a live-in type change a cached cone dispatcher fails to compile; the whole
+        cone-plan cache is flushed once, the store re-seeded from the last full call, the
+        change re-applied, and the cone rebuilt against the new types.
+
+        Declared kernels enforce a contract instead of recovering. For a kernel
+        built from a fully-declared graph, a changed value is checked for numba
+        assignability to the node's declared type: a value numba cannot assign to
+        the declared type raises a crisp ``declared type X, got Y`` error, while a
+        benign difference numba accepts -- a C-contiguous array against an
+        ``'A'``-layout array declaration, or a safe scalar promotion -- is accepted.
+        The check is convertibility, not type identity, and is scoped to declared
+        (eager) kernels; an individually-declared node inside an otherwise
+        discovered kernel keeps the flush-and-reseed recovery above.
+        """
+        return self._session.recompute(changed)
+
+    def session(self) -> "Session":
+        """A new :class:`Session` over this kernel: independent incremental state
+        sharing this kernel's dispatchers and cone-plan cache (see `Session`)."""
+        return Session(self)
+
+    def _shared_call(self, args: tuple) -> tuple:
+        """Full call on behalf of a `Session`: lock-free once the mode has resolved,
+        under the kernel lock while it resolves (or re-discovers). Resolves the mode
+        as a kernel call would, but leaves the kernel's own `recompute` state alone."""
+        if self._mode == "fused":
+            return self._call_fused(args)
+        if self._mode == "segmented":
+            plan = self._plan
+            try:
+                return plan.run(args, self.profile)
+            except NumbaError:
+                pass
+        with self._lock:
+            if self._mode == "virgin":
+                return self._resolve(args, seed=False)
+            if self._mode != "segmented":
+                result = self._call_fused(args)
+                self._mode = "fused"
+                return result
+            try:
+                return self._plan.run(args, self.profile)
+            except NumbaError:
+                if self.is_declared:
+                    raise
+                return self._discover_and_run(args, seed=False)
+
+    def _args_from(self, external_values: dict) -> list:
+        args = []
+        for src, name in self._param_keys:
+            try:
+                args.append(external_values[src][name])
+            except KeyError as e:
+                raise KeyError(
+                    f"Missing external value for {make_qual_name(src, name)!r}"
+                ) from e
+        return args
+
+    def execute(self, external_values: dict) -> dict:
+        """Dict-in / dict-out convenience, symmetric with CompiledGraph.execute."""
+        result = self.kernel(*self._args_from(external_values))
+        return dict(zip(self.outputs, result))
+
+    def kernel_batch(self, *columns, parallel: bool = False, n_threads: int | None = None) -> tuple:
+        """Evaluate many scenarios in one call: positional input columns (in `params`
+        order, equal lengths, one entry per row) -> tuple of output columns (in
+        `outputs` order, dtypes inferred from the first row).
+
+        A fused graph runs a row-batched twin of the fused kernel -- the same body
+        lines inside a native row loop, one numba call for the whole batch. A
+        segmented graph runs a batch twin of its plan: every jit segment loops the
+        rows natively, while each Python-demoted node is called once per row.
+
+        The first row is evaluated once through the scalar `kernel` beforehand; this
+        resolves the mode of a not-yet-called kernel (exactly as a first `kernel(...)`
+        call would, including seeding `recompute`) and fixes the column dtypes. Per-row
+        values must be numeric scalars, except values produced and consumed only by
+        Python-demoted nodes, which are held in object columns.
+
+        `parallel=True` (opt-in) generates the row loop as a `numba.prange` and
+        compiles the batch kernel/segments with ``parallel=True``, spreading rows
+        across numba's threading layer; Python-demoted nodes still run row by row on
+        the calling thread. Formulas must be free of shared mutable state (each row
+        must be independent). `n_threads` caps the worker threads for this call
+        (``numba.set_num_threads``, restored afterwards); `None` uses numba's current
+        setting (``NUMBA_NUM_THREADS`` by default).
+        """
+        columns = self._batch_columns(columns)
+        values = self._batch_trace(columns)
+        n_rows = len(columns[0])
+        outs = tuple(numpy.empty(n_rows, dtype=_column_dtype(values[v])) for v in self._required_vars)
+        self._run_batch(columns, outs, values, parallel, n_threads)
+        return outs
+
+    def execute_batch(
+        self, inputs: numpy.ndarray, out_dtype=None, *, parallel: bool = False, n_threads: int | None = None,
+    ) -> numpy.ndarray:
+        """Structured-array-in / structured-array-out convenience over `kernel_batch`.
+
+        :param inputs: structured array with one field per `params` qual_name (extra
+            fields are ignored) and one row per scenario.
+        :param out_dtype: (optional) structured dtype of the result, one field per
+            `outputs` qual_name. Inferred from the first row when omitted; required
+            for an empty `inputs`.
+        :param parallel: run the row loop as a `prange` (see `kernel_batch`).
+        :param n_threads: worker-thread cap for a `parallel` call (see `kernel_batch`).
+        :return: structured array of `outputs`, one row per input row. A fused kernel
+            writes straight into its fields.
+        """
+        names = inputs.dtype.names or ()
+        missing = [q for q in self.params if q not in names]
+        if missing:
+            raise KeyError(f"Missing input field(s) {missing} for external value(s)")
+        columns = self._batch_columns(tuple(inputs[q] for q in self.params))
+        if len(inputs) == 0:
+            if out_dtype is None:
+                raise ValueError("execute_batch of an empty inputs array requires out_dtype")
+            return numpy.empty(0, dtype=out_dtype)
+        values = self._batch_trace(columns)
+        if out_dtype is None:
+            out_dtype = [(q, _column_dtype(values[v])) for q, v in zip(self.outputs, self._required_vars)]
+        out = numpy.empty(len(inputs), dtype=out_dtype)
+        self._run_batch(columns, tuple(out[q] for q in self.outputs), values, parallel, n_threads)
+        return out
+
+    def _batch_columns(self, columns: tuple) -> tuple:
+        if not self.params:
+            raise ValueError(
+                "a batched kernel needs at least one external input column to size the batch")
+        if len(columns) != len(self.params):
+            raise TypeError(f"expected {len(self.params)} input column(s) {self.params}, got {len(columns)}")
+        columns = tuple(numpy.asarray(c) for c in columns)
+        if any(c.ndim != 1 for c in columns) or len({len(c) for c in columns}) != 1:
+            raise ValueError("input columns must be 1-d and of equal length")
+        return columns
+
+    def _batch_trace(self, columns: tuple) -> dict:
+        """Evaluate the first row through the scalar path and return {Variable: value}
+        for every column a batched run allocates. The `kernel(...)` call resolves a
+        virgin kernel (and re-learns a segmented one whose types changed)."""
+        row = tuple(c[0] for c in columns)
+        result = self.kernel(*row)
+        if self._mode == "segmented":
+            return self._plan.trace(row)
+        return dict(zip(self._required_vars, result))
+
+    def _run_batch(
+        self, columns: tuple, outs: tuple, values: dict, parallel: bool = False, n_threads: int | None = None,
+    ) -> None:
+        if n_threads is None:
+            self._run_batch_on(columns, outs, values, parallel)
+            return
+        saved = get_num_threads()
+        set_num_threads(n_threads)
+        try:
+            self._run_batch_on(columns, outs, values, parallel)
+        finally:
+            set_num_threads(saved)
+
+    def _run_batch_on(self, columns: tuple, outs: tuple, values: dict, parallel: bool) -> None:
+        n_rows = len(columns[0])
+        if self._mode != "segmented":
+            for q, out in zip(self.outputs, outs):
+                if out.dtype.hasobject:
+                    raise TypeError(f"{q!r}: a fused batch kernel cannot write non-numeric per-row values")
+            self._ensure_batch_fused(parallel)(n_rows, *columns, *outs)
+            return
+        plan = self._ensure_batch_plan(parallel)
+        dtypes = {v: _column_dtype(val) for v, val in values.items()}
+        for step in plan.steps:
+            if isinstance(step, _JitStep):
+                for v in step.in_vars + step.out_vars:
+                    if dtypes[v].hasobject:
+                        raise TypeError(
+                            f"{v.qual_name()!r}: a batch jit segment cannot carry non-numeric per-row values")
+        for out, col in zip(outs, plan.run(columns, n_rows, dtypes)):
+            out[:] = col
+
+    def _batch_jit_options(self, parallel: bool) -> dict | None:
+        """Jit options of a batch kernel/segment: the kernel's own, plus
+        ``parallel=True`` for a `prange` row loop. Only the batch unit is compiled
+        parallel; its formulas keep the kernel's effective flags."""
+        jit_options = self._ctx.jit_options
+        return {**(jit_options or {}), "parallel": True} if parallel else jit_options
+
+    def _ensure_batch_fused(self, parallel: bool = False) -> Dispatcher:
+        disp = self._batch_fused.get(parallel)
+        if disp is None:
+            compiled, idents, _, jit_options, cache, _ = self._ctx
+            flags = _effective_flags(jit_options)
+            source, bindings, _, _ = _generate_body(
+                compiled, self.outputs, idents, flags, batch=True, parallel=parallel)
+            disp = _compile(source, bindings, self._batch_jit_options(parallel), cache)
+            self._batch_fused[parallel] = disp
+        return disp
+
+    def _ensure_batch_plan(self, parallel: bool = False) -> _BatchPlan:
+        """The batch twin of the current segmented plan: each jit step is regenerated
+        from its fused run as a batch segment; Python steps are reused as-is."""
+        cached = self._batch_plans.get(parallel)
+        if cached is not None and cached[0] is self._plan:
+            return cached[1]
+        _, idents, _, jit_options, cache, _ = self._ctx
+        flags = _effective_flags(jit_options)
+        steps = []
+        for step in self._plan.steps:
+            if isinstance(step, _PyStep):
+                steps.append(step)
+                continue
+            src, seg_bindings, _, _ = _generate_segment_body(
+                list(step.nodes), step.in_vars, step.out_vars, idents, flags, batch=True, parallel=parallel
+            )
+            disp = _compile(src, seg_bindings, self._batch_jit_options(parallel), cache)
+            steps.append(_JitStep(dispatcher=disp, in_vars=step.in_vars, out_vars=step.out_vars,
+                                  nodes=step.nodes))
+        batch_plan = _BatchPlan(steps=tuple(steps), external_vars=self._plan.external_vars,
+                                output_vars=self._plan.output_vars)
+        self._batch_plans[parallel] = (self._plan, batch_plan)
+        return batch_plan
+
+
+class Session:
+    """Independent incremental state over a shared `CompiledKernel`.
+
+    Created by :meth:`CompiledKernel.session`. A session owns the state behind
+    `recompute` -- its value store, the external args of its last full call, its
+    change-source set and persisted-node boundary -- so each user can hold their own
+    scenario against the same graph. The fused dispatchers, the segment plan, the
+    demotion verdicts and the LRU cone-plan cache belong to the kernel and are
+    shared: a cone fused for one session is reused by every other.
+
+    Sessions are safe to use from multiple threads: each session serializes its
+    own calls, and the kernel's lock guards mode resolution and the shared cone-plan
+    cache, so a cone plan is compiled once however many sessions race for it. The
+    kernel's own `recompute` runs on a default session of its own.
+
+    Unlike the bare kernel, a session's full call (`kernel` / `execute`) is the
+    seeding call: it records the args and drops the store, so the next `recompute`
+    re-seeds from them.
+    """
+
+    def __init__(self, kernel: CompiledKernel, _default: bool = False) -> None:
+        self._kernel = kernel
+        self._default = _default      # the kernel's own state: flushes the shared cache on invalidation
+        self._lock = threading.RLock()
+        self._store = None            # {Variable: value}; seeded on first recompute
+        self._last_args = None        # external args of the most recent full call
+        self._sources = None          # change-source Variables (externals; may grow on interior override)
+        self._boundary = None         # set[Variable]; persisted-node set, computed lazily
+
+    @property
+    def outputs(self) -> list[str]:
+        return self._kernel.outputs
+
+    def kernel(self, *args) -> tuple:
+        """Full call: positional external args (in `params` order) -> tuple (in
+        `outputs` order). Seeds this session's next `recompute`."""
+        result = self._kernel._shared_call(args)
+        with self._lock:
+            self._last_args = args
+            self._store = None
+        return result
+
+    def execute(self, external_values: dict) -> dict:
+        """Dict-in / dict-out full call, symmetric with `CompiledKernel.execute`."""
+        result = self.kernel(*self._kernel._args_from(external_values))
+        return dict(zip(self.outputs, result))
+
+    def recompute(self, changed: dict) -> tuple:
+        """Incrementally re-evaluate only the cone affected by `changed`, over this
+        session's store; see :meth:`CompiledKernel.recompute` for the contract."""
+        with self._lock:
+            return self._recompute(changed)
+
+    def _recompute(self, changed: dict) -> tuple:
+        kernel = self._kernel
+        self._ensure_store()
+        changed_vars = self._apply_changes(changed)
+        if not changed_vars:
+            return tuple(self._store[v] for v in kernel._required_vars)
+        compiled = kernel._ctx.compiled
+        self._ensure_boundary()
+        affected = compiled._collect_affected(changed_vars)
+        if not affected:
+            return tuple(self._store[v] for v in kernel._required_vars)
+        plan = self._cone_plan_cached(affected)
+        try:
+            plan.run_into(self._store, kernel.profile)
+        except NumbaError:
+            # A live-in type change invalidates the compiled cone plan; drop it,
+            # reseed the store, re-apply the change against the fresh store, and
+            # rebuild against the new types. Declared kernels fix every type by
+            # contract, so the (d) contract check already rejected off-contract
+            # types crisply; flushing here would be pointless.
+            if kernel.is_declared:
+                raise
+            self._flush_and_reseed(affected)
+            self._apply_changes(changed)
+            affected = compiled._collect_affected(changed_vars)
+            plan = self._cone_plan_cached(affected)
+            plan.run_into(self._store, kernel.profile)
+        return tuple(self._store[v] for v in kernel._required_vars)
+
     def _ensure_store(self):
         if self._store is not None:
             return
-        if self._mode == "virgin" or self._last_args is None:
+        kernel = self._kernel
+        if kernel._mode == "virgin" or self._last_args is None:
+            if self._default:
+                raise RuntimeError(
+                    "CompiledKernel.recompute requires a prior full call: call the kernel "
+                    "once with the current inputs to seed the value store before recompute()."
+                )
             raise RuntimeError(
-                "CompiledKernel.recompute requires a prior full call: call the kernel "
-                "once with the current inputs to seed the value store before recompute()."
+                "Session.recompute requires a prior full call: call the session's kernel "
+                "or execute once with the current inputs to seed its value store."
             )
-        compiled, _, bindings_by_var, jit_options, cache, external = self._ctx
+        compiled, _, bindings_by_var, jit_options, cache, external = kernel._ctx
         flags = _effective_flags(jit_options)
         # A fused first call discarded interior values, so seed by evaluating the
         # whole graph once from the captured args. Fused-graph formulas are njit-pure,
         # so the one extra evaluation is observationally safe. Seeding only the
         # persisted-node closure instead is a possible future optimization.
-        values = dict(zip(self._external_vars, self._last_args))
-        if self.is_declared:
-            # Seed interior values with the frozen declared demotion set; re-running
-            # discover would re-probe and could disagree with the declarations.
-            _evaluate(compiled.ordered_nodes, external, values, bindings_by_var, flags, self._demoted)
-        else:
-            self._demoted = discover(compiled.ordered_nodes, external, values, bindings_by_var, flags)
+        values = dict(zip(kernel._external_vars, self._last_args))
+        seed = None
+        with kernel._lock:
+            if self._default and not kernel.is_declared and kernel._mode == "segmented":
+                kernel._demoted = discover(compiled.ordered_nodes, external, values, bindings_by_var, flags)
+            elif self._formulas_compiled():
+                # Seed interior values with the frozen demotion set (declared, or
+                # discovered by the kernel); re-running discover would re-probe and
+                # could disagree with the verdicts the shared cone plans were built on.
+                _evaluate(compiled.ordered_nodes, external, values, bindings_by_var, flags, kernel._demoted)
+            else:
+                seed = self._seed_plan(values)
+        if seed is not None:
+            seed.run_into(values)
         self._store = values
 
+    def _formulas_compiled(self) -> bool:
+        """True when every jitted per-node formula already holds a compiled overload
+        in this process (e.g. typed while compiling the fused kernel), so seeding node
+        by node costs no JIT. False after a warm restart that loaded the fused kernel
+        from the on-disk cache, leaving the formula dispatchers uncompiled."""
+        kernel = self._kernel
+        _, _, bindings_by_var, _, _, external = kernel._ctx
+        return all(
+            binding.overloads for var, binding in bindings_by_var.items()
+            if isinstance(binding, Dispatcher) and var not in external and var not in kernel._demoted
+        )
+
+    def _seed_plan(self, values: dict) -> _ConePlan:
+        """Whole-graph cone plan persisting every interior node, used to seed the
+        store when per-node seeding would JIT each formula. Its jit segments compile
+        through `_compile`, content-addressed on the kernel's on-disk anchors like any
+        cone plan, so a restarted worker loads them instead of compiling. Kept on the
+        kernel per demotion set; called under the kernel lock."""
+        kernel = self._kernel
+        key = frozenset(v.qual_name() for v in kernel._demoted)
+        plan = kernel._seed_plans.get(key)
+        if plan is None:
+            compiled, external = kernel._ctx.compiled, kernel._ctx.external
+            nodes = [n for n in compiled.ordered_nodes if n.variable not in external]
+            plan = self._build_cone_plan(nodes, persisted={n.variable for n in nodes}, store=values)
+            kernel._seed_plans[key] = plan
+        return plan
+
     def _apply_changes(self, changed: dict) -> set:
         """Write changed values into the store; return the set of changed Variables.
         External names resolve via required_external_variables; interior names via
         ordered_nodes (overriding an interior node expands the change-source set)."""
-        compiled = self._ctx.compiled
+        kernel = self._kernel
+        compiled = kernel._ctx.compiled
         # First pass: resolve every (src, name) -> var and run the declared
         # contract check, collecting (var, val, is_external). If ANY check
         # fails, raise here -- before mutating _store -- so a caught-and-retried
@@ -684,10 +1312,10 @@ class CompiledKernel:
                     if var is None:
                         warnings.warn(f"{qual} is not in the calculation path, update has no effect.")
                         continue
-                if self.is_declared and _is_typed(var):
+                if kernel.is_declared and _is_typed(var):
                     try:
                         got = typeof(val)
-                        ok = self._fused.typingctx.can_convert(got, var.params.type) is not None
+                        ok = kernel._fused.typingctx.can_convert(got, var.params.type) is not None
                     except (ValueError, TypeError):
                         ok, got = False, type(val).__name__
                     if not ok:
@@ -708,43 +1336,50 @@ class CompiledKernel:
 
     def _expand_sources(self, new_sources: set):
         """Add overridden interior nodes to the change-source set, force the
-        persisted-node boundary to recompute, and invalidate cached cone plans
-        (their boundaries have changed)."""
+        persisted-node boundary to recompute. The kernel's own state also drops the
+        cached cone plans (their boundaries have changed); a session leaves them to
+        the other sessions, as its boundary is part of the cone key."""
         if self._sources is None:
-            self._sources = set(self._external_vars)
+            self._sources = set(self._kernel._external_vars)
         self._sources |= new_sources
         self._boundary = None
-        self._cone_cache.clear()
+        if self._default:
+            with self._kernel._lock:
+                self._kernel._cone_cache.clear()
 
     def _ensure_boundary(self):
         if self._boundary is not None:
             return
-        compiled = self._ctx.compiled
+        kernel = self._kernel
         if self._sources is None:
-            self._sources = set(self._external_vars)
+            self._sources = set(kernel._external_vars)
         self._boundary = compute_boundary(
-            compiled.ordered_nodes, self._sources, set(self._required_vars)
+            kernel._ctx.compiled.ordered_nodes, self._sources, set(kernel._required_vars)
         )
 
-    def _cone_live_in_type(self, v: Variable):
+    def _cone_live_in_type(self, v: Variable, store: dict):
         """The numba type to compile a cone jit-segment live-in against. For a
         declared kernel whose live-in declares a type, use the declared type (so the
         cone matches the eager build's signature); otherwise fall back to the stored
         value's runtime type, as the undeclared path always does."""
-        if self.is_declared and _is_typed(v):
+        if self._kernel.is_declared and _is_typed(v):
             return v.params.type
-        return typeof(self._store[v])
+        return typeof(store[v])
 
-    def _build_cone_plan(self, affected: list) -> _ConePlan:
+    def _build_cone_plan(self, affected: list, persisted: set | None = None, store: dict | None = None) -> _ConePlan:
         """Linearize the affected cone, split into runs, and compile each jit run
         against its live-in types (declared types for a declared kernel, else the
         store's current runtime types; Python runs become _PyStep chains).
         `_demoted` is restricted to cone nodes so only nodes demoted at seed time stay
-        Python. Called by `_cone_plan_cached` on a cache miss."""
-        compiled, idents, _, jit_options, cache, _ = self._ctx
+        Python. Called by `_cone_plan_cached` on a cache miss, under the kernel lock.
+        `persisted` and `store` default to this session's boundary and store."""
+        kernel = self._kernel
+        persisted = self._boundary if persisted is None else persisted
+        store = self._store if store is None else store
+        compiled, idents, _, jit_options, cache, _ = kernel._ctx
         flags = _effective_flags(jit_options)
         cone_vars = {n.variable for n in affected}
-        demoted_in_cone = {v for v in self._demoted if v in cone_vars}
+        demoted_in_cone = {v for v in kernel._demoted if v in cone_vars}
         order = linearize(affected, demoted_in_cone)
         runs = build_runs(order, demoted_in_cone)
         steps = []
@@ -757,143 +1392,62 @@ class CompiledKernel:
                         in_vars=tuple(n.inputs),
                     ))
                 continue
-            live_in, live_out = cone_liveness(run_nodes, order, self._required_vars, self._boundary)
+            live_in, live_out = cone_liveness(run_nodes, order, kernel._required_vars, persisted)
             src, seg_bindings, _, _ = _generate_segment_body(run_nodes, live_in, live_out, idents, flags)
             disp = _compile(src, seg_bindings, jit_options, cache)
-            disp.compile(tuple(self._cone_live_in_type(v) for v in live_in))
-            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out))
+            disp.compile(tuple(self._cone_live_in_type(v, store) for v in live_in))
+            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out, nodes=tuple(run_nodes)))
         return _ConePlan(steps=tuple(steps))
 
-    def _cone_key(self, affected) -> tuple[frozenset, frozenset]:
+    def _cone_key(self, affected) -> tuple[frozenset, frozenset, frozenset, frozenset]:
         """Cache key for a cone sub-plan: (cone node qual_names, live-in boundary
-        qual_names). Including the live-in boundary keeps an external change and an
-        interior override that share a cone from colliding (their boundaries differ)."""
+        qual_names, persisted cone qual_names, demoted cone qual_names). Including the
+        live-in boundary keeps an external change and an interior override that share
+        a cone from colliding (their boundaries differ); the persisted and demoted
+        cone nodes pin the remaining per-session inputs of `_build_cone_plan`, so
+        sessions with different change-source sets never share a plan wrongly."""
         cone_vars = {n.variable for n in affected}
         live_in_boundary = {inp for n in affected for inp in n.inputs if inp not in cone_vars}
+        demoted = self._kernel._demoted
         return (frozenset(v.qual_name() for v in cone_vars),
-                frozenset(v.qual_name() for v in live_in_boundary))
+                frozenset(v.qual_name() for v in live_in_boundary),
+                frozenset(v.qual_name() for v in cone_vars if v in self._boundary),
+                frozenset(v.qual_name() for v in cone_vars if v in demoted))
 
     def _cone_plan_cached(self, affected) -> _ConePlan:
-        key = self._cone_key(affected)
-        plan = self._cone_cache.get(key)
-        if plan is not None:
-            self._cone_cache.move_to_end(key)
-            return plan
-        plan = self._build_cone_plan(affected)
-        self._cone_cache[key] = plan
-        if len(self._cone_cache) > self._cone_cap:
-            self._cone_cache.popitem(last=False)
+        kernel = self._kernel
+        with kernel._lock:
+            key = self._cone_key(affected)
+            plan = kernel._cone_cache.get(key)
+            if plan is not None:
+                kernel._cone_cache.move_to_end(key)
+                return plan
+            plan = self._build_cone_plan(affected)
+            kernel._cone_cache[key] = plan
+            if len(kernel._cone_cache) > kernel._cone_cap:
+                kernel._cone_cache.popitem(last=False)
         return plan
 
-    def _flush_and_reseed(self):
-        """Drop the cone-plan cache and re-seed the store + boundary from the last full
+    def _flush_and_reseed(self, affected: list):
+        """Drop cached cone plans and re-seed the store + boundary from the last full
         call. Used to recover when a boundary live-in's type change makes a cached cone
-        dispatcher fail to compile."""
-        self._cone_cache.clear()
+        dispatcher fail to compile. The kernel's own state flushes the whole cache; a
+        session drops only the failing cone's plan, leaving the other sessions' plans."""
+        kernel = self._kernel
+        with kernel._lock:
+            if self._default:
+                kernel._cone_cache.clear()
+            else:
+                kernel._cone_cache.pop(self._cone_key(affected), None)
         self._store = None
         self._boundary = None
         self._ensure_store()
         self._ensure_boundary()
 
-    def recompute(self, changed: dict) -> tuple:
-        """Incrementally re-evaluate only the cone affected by `changed`.
-
-        Mirrors :meth:`numbox.core.variable.variable.CompiledGraph.recompute`: this
-        is a value-only refresh, not a recompile. `changed` is
-        ``{source: {name: value}}``; the returned tuple is in `outputs` order. The
-        same variables may carry different values across calls, but their numba types
-        must stay the same as the seeding call (a type change is recovered from once,
-        see below, but the contract is same-types).
-
-        Precondition: a prior full call (``kernel(...)`` / ``execute(...)``) must have
-        seeded the value store. Calling `recompute` first raises ``RuntimeError``.
-
-        What it does: it writes the changed values into a persistent value store,
-        collects the downstream cone of the changed nodes, and re-fuses just that cone
-        -- reading every unchanged input from the store. The cone sub-plan is compiled
-        on first use and kept in a bounded LRU cache keyed on the cone and its live-in
-        boundary, so a recurring change pattern reuses its compiled plan without
-        re-fusing. Nodes that were demoted to plain Python at seed time stay Python in
-        the cone; the jittable remainder fuses into ``@njit`` segments.
-
-        Interior overrides: a `changed` name may resolve to an interior (computed) node
-        rather than an external input -- mirroring the interpreted path. Its value is
-        overridden in the store and only its downstream cone recomputes; the overridden
-        node's own formula is *not* re-run -- unless the node is itself downstream of
-        another changed input in the same call, in which case graph priority applies and
-        it is recomputed from its formula. The first override of a not-yet-seen interior
-        node expands the change-source set and rebuilds the persisted-node boundary (and
-        invalidates cached cone plans, whose boundaries have shifted).
-
-        Limitations:
-
-        - Do not interleave input-changing ``kernel(...)`` throughput calls between
-          `recompute` calls. `recompute` is the stateful entry point: the store is
-          seeded once, and a throughput call does not update it, so a subsequent
-          `recompute` would read stale unchanged values. Use `recompute` for the
-          incremental workflow and the bare kernel for independent one-shot calls.
-        - An interior plain-Python (demoted) node must return a stable numba type across
-          recomputes. The same-types contract extends to demoted outputs: a demoted
-          node whose output type drifts between recomputes is not supported.
-
-        On a live-in type change a cached cone dispatcher fails to compile; the whole
-        cone-plan cache is flushed once, the store re-seeded from the last full call, the
-        change re-applied, and the cone rebuilt against the new types.
-
-        Declared kernels enforce a contract instead of recovering. For a kernel
-        built from a fully-declared graph, a changed value is checked for numba
-        assignability to the node's declared type: a value numba cannot assign to
-        the declared type raises a crisp ``declared type X, got Y`` error, while a
-        benign difference numba accepts -- a C-contiguous array against an
-        ``'A'``-layout array declaration, or a safe scalar promotion -- is accepted.
-        The check is convertibility, not type identity, and is scoped to declared
-        (eager) kernels; an individually-declared node inside an otherwise
-        discovered kernel keeps the flush-and-reseed recovery above.
-        """
-        self._ensure_store()
-        changed_vars = self._apply_changes(changed)
-        if not changed_vars:
-            return tuple(self._store[v] for v in self._required_vars)
-        compiled = self._ctx.compiled
-        self._ensure_boundary()
-        affected = compiled._collect_affected(changed_vars)
-        if not affected:
-            return tuple(self._store[v] for v in self._required_vars)
-        plan = self._cone_plan_cached(affected)
-        try:
-            plan.run_into(self._store)
-        except NumbaError:
-            # A live-in type change invalidates every compiled cone plan; flush
-            # the whole cache once, reseed the store, re-apply the change against
-            # the fresh store, and rebuild against the new types. Declared kernels
-            # fix every type by contract, so the (d) contract check already
-            # rejected off-contract types crisply; flushing here would be pointless.
-            if self.is_declared:
-                raise
-            self._flush_and_reseed()
-            self._apply_changes(changed)
-            affected = compiled._collect_affected(changed_vars)
-            plan = self._cone_plan_cached(affected)
-            plan.run_into(self._store)
-        return tuple(self._store[v] for v in self._required_vars)
-
-    def execute(self, external_values: dict) -> dict:
-        """Dict-in / dict-out convenience, symmetric with CompiledGraph.execute."""
-        args = []
-        for src, name in self._param_keys:
-            try:
-                args.append(external_values[src][name])
-            except KeyError as e:
-                raise KeyError(
-                    f"Missing external value for {make_qual_name(src, name)!r}"
-                ) from e
-        result = self.kernel(*args)
-        return dict(zip(self.outputs, result))
-
 
 def compile_kernel(
     graph: Graph, required: str | list[str], *,
-    jit_options: dict | None = None, cache: bool | None = None,
+    jit_options: dict | None = None, cache: bool | None = None, profile: bool = False,
 ) -> CompiledKernel:
     """Compile `graph` into a fused @njit kernel for the `required` variables.
 
@@ -910,10 +1464,15 @@ def compile_kernel(
     :param cache: tri-state. `None` (default) defers to
         `jit_options["cache"]`, then the `NUMBOX_JIT_OPTIONS` env default,
         then `True`. An explicit `True`/`False` wins over both.
+    :param profile: collect a `CompileProfile` -- time per build phase and, per
+        compiled unit, numba typing/lowering/LLVM and cache load/store time plus
+        the generated source size -- as `CompiledKernel.compile_profile`.
 
     Error timing: structural problems raise here (unknown or malformed
     `required` entries, non-callable formulas, arity mismatches against the
-    declared inputs, graphs deeper than the recursion limit). For an undeclared
+    declared inputs). Graph traversal is iterative and linear in the graph size,
+    so arbitrarily deep chains compile without raising Python's recursion limit.
+    For an undeclared
     (or partially-declared) graph, numba typing problems surface at the kernel's
     first call (auto-njit of plain-Python formulas is lazy). For a fully-declared
     graph (every node carries `params`, every consumed external is typed) the
@@ -987,20 +1546,20 @@ def compile_kernel(
             raise ValueError(
                 f"required entry {entry!r} is not qualified (expected 'source{QUAL_SEP}name')"
             )
-    dupes = sorted({entry for entry in required if required.count(entry) > 1})
+    dupes = sorted(entry for entry, count in Counter(required).items() if count > 1)
     if dupes:
         raise ValueError(
             f"required has duplicate entries {dupes}; each requested output must "
             f"appear once (the kernel's return tuple is positional)"
         )
+    prof = CompileProfile() if profile else None
     try:
-        compiled = graph.compile(required)
+        with _phase(prof, "graph"):
+            compiled = graph.compile(required)
     except KeyError as e:
         raise ValueError(
             f"required name or one of its dependencies cannot be resolved in the graph: {e}"
         ) from e
-    except RecursionError:
-        raise RecursionError("Consider raising recursion limit.") from None
     external = {v for vs in compiled.required_external_variables.values() for v in vs.values()}
     case, dispositions, consumed = _classify(compiled)
     idents = _assign_identifiers([n.variable for n in compiled.ordered_nodes])
@@ -1012,14 +1571,16 @@ def compile_kernel(
             if var in external or dispositions.get(var) != "STATIC_JIT":
                 continue
             in_types = tuple(i.params.type for i in node.inputs)
-            fp, fingerprintable = _formula_fingerprint(var.formula)
-            key = (fp, in_types, var.params.type, flags_key)
-            if fingerprintable and key in _validated_returns:
-                continue
-            _validate_declared_return(var.formula, in_types, var.params.type, flags)
+            with _phase(prof, "validate"):
+                fp, fingerprintable = _formula_fingerprint(var.formula)
+                key = (fp, in_types, var.params.type, flags_key)
+                if fingerprintable and key in _validated_returns:
+                    continue
+                _validate_declared_return(var.formula, in_types, var.params.type, flags)
             if fingerprintable:
                 _validated_returns.add(key)
-    source, bindings, params, outputs = _generate_body(compiled, required, idents, flags)
+    with _phase(prof, "codegen"):
+        source, bindings, params, outputs = _generate_body(compiled, required, idents, flags)
 
     def _registry_var(qual):
         src, name = qual.rsplit(QUAL_SEP, 1)
@@ -1034,7 +1595,7 @@ def compile_kernel(
     if case == "A":
         consumed_sig = tuple(v.params.type for v in external_vars if v in consumed)
         declared_sigs = (consumed_sig,)
-    kernel = _compile(source, bindings, jit_options, cache, declared_sigs)
+    kernel = _compile(source, bindings, jit_options, cache, declared_sigs, prof)
     bindings_by_var = {
         n.variable: bindings["f_" + idents[n.variable]]
         for n in compiled.ordered_nodes if n.variable not in external
@@ -1044,14 +1605,17 @@ def compile_kernel(
     if case == "A":
         ck = CompiledKernel(kernel, params, outputs, source, identifiers, ctx,
                             required_vars, external_vars, is_declared=True)
+        ck.compile_profile = prof
         sig_vars = [v for v in external_vars if v in consumed]
         # Eager-compile only when every kernel param is consumed; a pass-through
         # external output is a kernel arg but has no declared type, so a partial
         # signature would be wrong-arity. Such graphs compile lazily on first call.
+        ck.partition = ck._fused_report()
         if len(sig_vars) == len(external_vars):
-            ck._fused.compile(tuple(v.params.type for v in sig_vars))
+            ck.compile_log.append(_timed_compile(
+                ck._fused, tuple(v.params.type for v in sig_vars), "fused", ck.partition.segments[0].nodes,
+                prof, source))
         ck._mode = "fused-pending"
-        ck.partition = ck._fused_report()
         return ck
     if case == "B":
         demoted = {n.variable: "declared non-jittable" for n in compiled.ordered_nodes
@@ -1059,7 +1623,7 @@ def compile_kernel(
         nodes = [n for n in compiled.ordered_nodes if n.variable not in external]
         order = linearize(nodes, demoted)
         runs = build_runs(order, demoted)
-        steps, segments = [], []
+        steps, segments, log = [], [], []
         # Same segment structure as _discover_and_run, but with declared types and a static demotion set (no probing).
         for kind, run_nodes in runs:
             quals = tuple(n.variable.qual_name() for n in run_nodes)
@@ -1078,12 +1642,14 @@ def compile_kernel(
                                         outputs=quals, source=None, reasons=reasons))
                 continue
             live_in, live_out = segment_liveness(run_nodes, external, required_vars, order)
-            src, seg_bindings, _, _ = _generate_segment_body(run_nodes, live_in, live_out, idents, flags)
+            with _phase(prof, "codegen"):
+                src, seg_bindings, _, _ = _generate_segment_body(run_nodes, live_in, live_out, idents, flags)
             seg_sigs = (tuple(v.params.type for v in live_in),
                         tuple(v.params.type for v in live_out))
-            disp = _compile(src, seg_bindings, jit_options, cache, seg_sigs)
-            disp.compile(tuple(v.params.type for v in live_in))
-            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out))
+            disp = _compile(src, seg_bindings, jit_options, cache, seg_sigs, prof)
+            log.append(_timed_compile(disp, tuple(v.params.type for v in live_in), "segment", quals, prof, src))
+            steps.append(_JitStep(dispatcher=disp, in_vars=live_in, out_vars=live_out,
+                                  nodes=tuple(run_nodes)))
             segments.append(Segment(kind="jit", nodes=quals,
                                     inputs=tuple(v.qual_name() for v in live_in),
                                     outputs=tuple(v.qual_name() for v in live_out),
@@ -1093,9 +1659,13 @@ def compile_kernel(
         ck._plan = _Plan(steps=tuple(steps), external_vars=tuple(external_vars),
                          output_vars=tuple(required_vars))
         ck._demoted = demoted
+        ck.compile_log = log
+        ck.compile_profile = prof
         ck._mode = "segmented"
         ck.partition = PartitionReport(mode="segmented", segments=tuple(segments))
         return ck
-    return CompiledKernel(
+    ck = CompiledKernel(
         kernel, params, outputs, source, identifiers, ctx, required_vars, external_vars
     )
+    ck.compile_profile = prof
+    return ck
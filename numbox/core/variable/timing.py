@@ -0,0 +1,73 @@
+"""Opt-in runtime profiling of Variable graph evaluation.
+
+A `RuntimeProfile` accumulates call counts and cumulative wall time per
+evaluated unit: per node on the interpreted `CompiledGraph` path (pass it as
+``profile=`` to `execute` / `recompute`), and per jit segment, Python-demoted
+node or fused kernel on a `CompiledKernel` (assign it to the kernel's
+``profile`` attribute). `report` sorts the entries, e.g. to find the
+Python-demoted nodes whose rewrite would pay off most.
+
+Times are read with ``time.monotonic_ns``, the CLOCK_MONOTONIC source that
+`numbox.utils.clock.monotonic_ns` reads from jitted code. A jit segment is
+timed from the Python orchestrator around its dispatcher call, so its time
+includes the dispatch overhead the orchestration actually pays.
+"""
+import threading
+
+from dataclasses import dataclass
+
+
+@dataclass
+class NodeTiming:
+    """Accumulated timing of one profiled unit."""
+    name: str                      # qual_name, or "first..last" for a multi-node jit segment
+    kind: str                      # "node" (CompiledGraph) | "jit" | "python" | "fused" (CompiledKernel)
+    nodes: int = 1                 # graph nodes evaluated by the unit
+    calls: int = 0
+    total_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+class RuntimeProfile:
+    """Per-unit call counts and cumulative wall time; safe to share between
+    threads (e.g. the sessions of one `CompiledKernel`)."""
+    _SORT_KEYS = ("total_ns", "mean_ns", "calls", "name")
+
+    def __init__(self) -> None:
+        self.timings: dict[tuple[str, str], NodeTiming] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, kind: str, nodes: int, elapsed_ns: int) -> None:
+        with self._lock:
+            timing = self.timings.get((kind, name))
+            if timing is None:
+                timing = self.timings[(kind, name)] = NodeTiming(name=name, kind=kind, nodes=nodes)
+            timing.calls += 1
+            timing.total_ns += elapsed_ns
+
+    def clear(self) -> None:
+        with self._lock:
+            self.timings.clear()
+
+    def report(self, sort: str = "total_ns", kind: str | None = None) -> list[NodeTiming]:
+        """Timings of `kind` (all kinds if None), sorted by `sort` -- one of
+        ``total_ns``, ``mean_ns``, ``calls`` (descending) or ``name``."""
+        if sort not in self._SORT_KEYS:
+            raise ValueError(f"sort must be one of {self._SORT_KEYS}, got {sort!r}")
+        with self._lock:
+            rows = [t for t in self.timings.values() if kind is None or t.kind == kind]
+        return sorted(rows, key=lambda t: getattr(t, sort), reverse=sort != "name")
+
+    def format(self, sort: str = "total_ns", kind: str | None = None, limit: int | None = 20) -> str:
+        rows = self.report(sort, kind)
+        total = sum(t.total_ns for t in rows)
+        lines = [f"  {'name':<40}{'kind':>7}{'nodes':>6}{'calls':>9}{'total ms':>11}{'mean us':>10}{'share':>7}"]
+        for t in rows[:limit]:
+            lines.append(
+                f"  {t.name:<40}{t.kind:>7}{t.nodes:>6}{t.calls:>9}{t.total_ns / 1e6:11.3f}"
+                f"{t.mean_ns / 1e3:10.2f}{t.total_ns / total if total else 0.0:7.1%}"
+            )
+        return "\n".join(lines)
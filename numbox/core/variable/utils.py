@@ -23,7 +23,7 @@ from numbox.core.variable.variable import Variable
 
 # Names injected into the kernel exec namespace; identifiers must avoid them.
 # Kept in lockstep with the exec namespace assembled in compile_kernel._compile.
-_RESERVED = frozenset({"njit", "_kernel_jit_options"})
+_RESERVED = frozenset({"njit", "prange", "_kernel_jit_options"})
 
 
 def _sanitize(qual_name: str) -> str:
@@ -1,4 +1,5 @@
 import sys
+import time
 import warnings
 
 from abc import ABC, abstractmethod
@@ -8,6 +9,8 @@ from typing import (
     Protocol, TypeAlias, TypedDict
 )
 
+from numbox.core.variable.timing import RuntimeProfile
+
 
 class Namespace(ABC):
     name: str
@@ -147,7 +150,7 @@ class External(Namespace):
         return variable
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Variable:
     """
     An instance of `Variable` is anything that can be calculated
@@ -176,6 +179,10 @@ class Variable:
         value of this `Variable` from its inputs.
     :param metadata: any possible metadata associated with
         this variable.
+
+    `Variable` is used as a key of every dict on the execution path,
+    so its name, source, and qualified name are interned and its hash
+    is computed once, at construction.
     """
     name: str
     source: str = field(default="")
@@ -183,6 +190,8 @@ class Variable:
     formula: Callable = field(default=None)
     metadata: str | None = field(default=None)
     params: Params | None = field(default=None)
+    _qual_name: str = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # Only the variable name is restricted: qualified names compose as
@@ -195,19 +204,33 @@ class Variable:
                 f"separator {QUAL_SEP!r}; variable names must not contain it "
                 f"(qualified names are decomposed via rsplit({QUAL_SEP!r}, 1))."
             )
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "source", sys.intern(self.source))
+        object.__setattr__(self, "_qual_name", sys.intern(make_qual_name(self.source, self.name)))
+        object.__setattr__(self, "_hash", hash((self.source, self.name)))
 
     def __hash__(self):
-        return hash((self.source, self.name))
+        return self._hash
 
     def __eq__(self, other):
-        return isinstance(other, Variable) and self.name == other.name and self.source == other.source
+        return self is other or (
+            isinstance(other, Variable) and
+            self._hash == other._hash and
+            self.name == other.name and
+            self.source == other.source
+        )
+
+    def __reduce__(self):
+        # String hashes are salted per process, so the cached hash
+        # must be recomputed rather than restored when unpickling.
+        return Variable, (self.name, self.source, self.inputs, self.formula, self.metadata, self.params)
 
     def qual_name(self) -> str:
         """
         Qualified name of `Variable` incorporates both the name
         of the `Variable` and the name of its source / namespace.
         """
-        return make_qual_name(self.source, self.name)
+        return self._qual_name
 
 
 class Variables(Namespace):
@@ -250,37 +273,129 @@ class Value:
     value: VarValue | _Null = field(default=_null)
 
 
+class _SlotValue(Value):
+    """
+    `Value` view onto one slot of a slot-backed `Values`:
+    reads and writes of `value` go straight to the slot.
+    Until its variable is laid out, the slot is a private
+    one-element list; binding re-points the same object to
+    the shared slots, so a `Value` handed out stays live.
+    """
+    __slots__ = ("_slots", "_index")
+
+    def __init__(self, variable: Variable, slots: list, index: int):
+        self.variable = variable
+        self._slots = slots
+        self._index = index
+
+    @property
+    def value(self) -> VarValue | _Null:
+        return self._slots[self._index]
+
+    @value.setter
+    def value(self, value: VarValue | _Null):
+        self._slots[self._index] = value
+
+
+class _SlotLayout:
+    """
+    Append-only map from `Variable` to an integer slot.
+
+    Shared by all `CompiledGraph` instances of one `Graph`, so that
+    a single `Values` storage can back any of them. Slots are only
+    ever appended, so an assigned index never changes.
+    """
+    def __init__(self):
+        self.index: dict[Variable, int] = {}
+        self.variables: list[Variable] = []
+
+    def add(self, variable: Variable) -> int:
+        index = self.index.get(variable)
+        if index is None:
+            index = self.index[variable] = len(self.variables)
+            self.variables.append(variable)
+        return index
+
+
 class Values:
     """ Values of all `Variable` instances, computed and external,
-    will be held here. """
+    will be held here.
+
+    Once used with a `CompiledGraph`, the values are kept in a flat
+    list of slots laid out by that graph's `Graph`, and `get` returns
+    `Value` views over these slots. """
     def __init__(self):
         self._values: dict[Variable, Value] = {}
+        self._layout: _SlotLayout | None = None
+        self._slots: list = []
 
     def get(self, variable: Variable) -> Value:
-        if variable not in self._values:
-            self._values[variable] = Value(variable=variable)
-        return self._values[variable]
+        value = self._values.get(variable)
+        if value is None:
+            index = self._layout.index.get(variable) if self._layout is not None else None
+            if index is None:
+                value = _SlotValue(variable, [_null], 0)
+            else:
+                value = _SlotValue(variable, self._slots, index)
+            self._values[variable] = value
+        return value
+
+    def _slots_for(self, layout: _SlotLayout) -> list | None:
+        """
+        Return the flat list of slots laid out by `layout`, binding
+        this storage to `layout` on first use. Returns `None` if this
+        storage is already bound to a different layout, in which case
+        the caller falls back to `get`.
+        """
+        if self._layout is not layout:
+            if self._layout is not None:
+                return None
+            self._layout = layout
+        slots = self._slots
+        if len(slots) < len(layout.variables):
+            start = len(slots)
+            slots.extend([_null] * (len(layout.variables) - start))
+            for index in range(start, len(slots)):
+                variable = layout.variables[index]
+                value = self._values.get(variable)
+                if value is None:
+                    continue
+                slots[index] = value.value
+                if isinstance(value, _SlotValue):
+                    value._slots = slots
+                    value._index = index
+                else:
+                    self._values[variable] = _SlotValue(variable, slots, index)
+        return slots
 
     def __iter__(self) -> Iterator[Variable]:
-        return iter(self._values.keys())
+        variables = dict.fromkeys(self._values)
+        if self._layout is not None:
+            for variable, value in zip(self._layout.variables, self._slots):
+                if value is not _null:
+                    variables.setdefault(variable)
+        return iter(variables)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompiledNode:
     variable: Variable
     inputs: list[Variable]
 
     def __hash__(self):
-        return hash((self.variable.source, self.variable.name))
+        return self.variable._hash
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             isinstance(other, CompiledNode) and
-            self.variable.name == other.variable.name and
-            self.variable.source == other.variable.source
+            self.variable == other.variable
         )
 
 
+_Step: TypeAlias = tuple[Callable, int, tuple[int, ...], CompiledNode]
+""" Compiled evaluation step: formula, output slot, input slots, and node. """
+
+
 @dataclass(frozen=True)
 class CompiledGraph:
     ordered_nodes: list[CompiledNode]
@@ -288,16 +403,40 @@ class CompiledGraph:
     debug: bool = False
     dependents: dict[Variable, list[CompiledNode]] = field(default_factory=lambda: {})
     affected_cache: dict[frozenset[Variable], list[CompiledNode]] = field(default_factory=lambda: {})
+    slot_layout: _SlotLayout = field(default_factory=_SlotLayout, repr=False, compare=False)
+    steps: list[_Step] = field(default_factory=lambda: [], repr=False, compare=False)
+    external_slots: list[tuple[str, str, int]] = field(default_factory=lambda: [], repr=False, compare=False)
+    affected_steps_cache: dict[frozenset[Variable], tuple[list[int], list[_Step]]] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
 
     def __post_init__(self):
+        layout = self.slot_layout
         for node in self.ordered_nodes:
+            slot = layout.add(node.variable)
+            input_slots = tuple(layout.add(inp) for inp in node.inputs)
             for inp in node.inputs:
                 self.dependents.setdefault(inp, []).append(node)
+            if node.variable.formula is not None:
+                self.steps.append((node.variable.formula, slot, input_slots, node))
+        for source_name, variables in self.required_external_variables.items():
+            for var_name, variable in variables.items():
+                self.external_slots.append((source_name, var_name, layout.add(variable)))
+
+    def _slots_of(self, values: Storage) -> list | None:
+        """
+        Flat list of slots of `values` laid out by `self.slot_layout`,
+        or `None` if `values` is not slot-backed (e.g., a custom
+        `Storage`), in which case values are accessed via `get`.
+        """
+        slots_for = getattr(values, "_slots_for", None)
+        return slots_for(self.slot_layout) if slots_for is not None else None
 
     def execute(
         self,
         external_values: dict[str, dict[str, VarValue]],
         values: Storage,
+        profile: RuntimeProfile | None = None,
     ):
         """
         Main entry point to calculate values of nodes of the compiled
@@ -310,9 +449,11 @@ class CompiledGraph:
             source to the variable's actual value.
         :param values: runtime storage of all values, e.g., an instance
             of `Values`.
+        :param profile: (optional) `RuntimeProfile` accumulating call
+            counts and wall time per evaluated node.
         """
         self._assign_external_values(external_values, values)
-        self._calculate(self.ordered_nodes, values)
+        self._calculate(self.ordered_nodes, values, profile)
 
     def _assign_external_values(
         self,
@@ -329,6 +470,18 @@ class CompiledGraph:
         :param values: an instance of `Values` storage of all calculated
         and external values.
         """
+        slots = self._slots_of(values)
+        if slots is not None:
+            for source_name, var_name, slot in self.external_slots:
+                provided = external_values.get(source_name)
+                if provided is None:
+                    raise KeyError(f"Missing external source '{source_name}'")
+                if var_name not in provided:
+                    raise KeyError(
+                        f"Missing value for external variable '{make_qual_name(source_name, var_name)}'"
+                    )
+                slots[slot] = provided[var_name]
+            return
         for source_name, variables in self.required_external_variables.items():
             provided = external_values.get(source_name)
             if provided is None:
@@ -363,7 +516,24 @@ class CompiledGraph:
         self.affected_cache[key] = affected_list
         return affected_list
 
-    def _calculate(self, nodes: list[CompiledNode], values: Storage):
+    def _collect_affected_steps(self, changed_vars: set[Variable]) -> tuple[list[int], list[_Step]]:
+        """
+        Slot-level counterpart of `_collect_affected`: slots of all
+        nodes affected by `changed_vars`, to be reset, and the steps
+        recomputing them, in the order of `self.ordered_nodes`.
+        """
+        key = frozenset(changed_vars)
+        cached = self.affected_steps_cache.get(key)
+        if cached is not None:
+            return cached
+        affected = set(self._collect_affected(changed_vars))
+        index = self.slot_layout.index
+        reset_slots = [index[node.variable] for node in self.ordered_nodes if node in affected]
+        steps = [step for step in self.steps if step[3] in affected]
+        self.affected_steps_cache[key] = reset_slots, steps
+        return reset_slots, steps
+
+    def _calculate(self, nodes: list[CompiledNode], values: Storage, profile: RuntimeProfile | None = None):
         """
         Calculate values of the `Variable`s using their own `formula`
         by evaluating them as functions of the values of the specified
@@ -375,6 +545,15 @@ class CompiledGraph:
         supplied as a topologically ordered list `self.ordered_nodes`,
         or as an ordered sub-set thereof (see, e.g., `recompute`).
         """
+        slots = self._slots_of(values)
+        if slots is not None:
+            if nodes is self.ordered_nodes:
+                steps = self.steps
+            else:
+                selected = set(nodes)
+                steps = [step for step in self.steps if step[3] in selected]
+            self._run_steps(steps, slots, profile)
+            return
         for node in nodes:
             if node.variable.formula is None:
                 continue
@@ -386,20 +565,55 @@ class CompiledGraph:
                 args[i] = arg
             if self.debug:
                 print(f"Calculating {node}\nwith metadata\n{node.variable.metadata}", file=sys.stderr)
-            result = node.variable.formula(*args)
+            if profile is None:
+                result = node.variable.formula(*args)
+            else:
+                t0 = time.monotonic_ns()
+                result = node.variable.formula(*args)
+                profile.record(node.variable.qual_name(), "node", 1, time.monotonic_ns() - t0)
             values.get(node.variable).value = result
 
-    def recompute(self, changed: dict[str, dict[str, VarValue]], values: Storage):
+    def _run_steps(self, steps: list[_Step], slots: list, profile: RuntimeProfile | None = None):
+        """
+        Evaluate the compiled `steps` over the flat list of `slots`:
+        inputs are read and outputs are written by integer slot index.
+        Each step is timed into `profile` when one is given.
+        """
+        debug = self.debug
+        for formula, slot, input_slots, node in steps:
+            args = [slots[i] for i in input_slots]
+            for arg in args:
+                if arg is _null:
+                    input_ = node.inputs[next(i for i, a in enumerate(args) if a is _null)]
+                    raise RuntimeError(f"Uninitialized input {input_.qual_name()} for {node.variable}")
+            if debug:
+                print(f"Calculating {node}\nwith metadata\n{node.variable.metadata}", file=sys.stderr)
+            if profile is None:
+                slots[slot] = formula(*args)
+            else:
+                t0 = time.monotonic_ns()
+                slots[slot] = formula(*args)
+                profile.record(node.variable.qual_name(), "node", 1, time.monotonic_ns() - t0)
+
+    def recompute(
+        self,
+        changed: dict[str, dict[str, VarValue]],
+        values: Storage,
+        profile: RuntimeProfile | None = None,
+    ):
         """
         :param changed: dict of sources to names to new values of changed
             `Variable` instances coming from either `External` or `Variables` source.
         :param values: storage of all `Variable` values.
+        :param profile: (optional) `RuntimeProfile` accumulating call
+            counts and wall time per recomputed node.
 
         Recompute takes priority: each node in the affected downstream cone is reset and
         recomputed from its formula, so the graph structure decides the final values. A
         supplied value persists only for a node not downstream of any other change; a
         co-changed downstream value is recomputed, not held.
         """
+        slots = self._slots_of(values)
         changed_vars = set()
         for src, vals in changed.items():
             for name, val in vals.items():
@@ -411,12 +625,21 @@ class CompiledGraph:
                     except StopIteration:
                         warnings.warn(f"{qual_name} is not in the calculation path, update has no effect.")
                         continue
-                values.get(variable).value = val
+                if slots is not None:
+                    slots[self.slot_layout.index[variable]] = val
+                else:
+                    values.get(variable).value = val
                 changed_vars.add(variable)
+        if slots is not None:
+            reset_slots, steps = self._collect_affected_steps(changed_vars)
+            for slot in reset_slots:
+                slots[slot] = _null
+            self._run_steps(steps, slots, profile)
+            return
         affected_nodes = self._collect_affected(changed_vars)
         for node in affected_nodes:
             values.get(node.variable).value = _null
-        self._calculate(affected_nodes, values)
+        self._calculate(affected_nodes, values, profile)
 
 
 class Graph:
@@ -450,6 +673,7 @@ class Graph:
             self.registry[external_name] = external_
         self.compiled_graphs = {}
         self.reverse_dependencies = None
+        self.slot_layout = _SlotLayout()
 
     def compile(self, required: list[str] | str, debug: bool = False) -> CompiledGraph:
         """
@@ -472,7 +696,8 @@ class Graph:
         compiled = CompiledGraph(
             ordered_nodes=ordered_nodes,
             required_external_variables=required_external_variables,
-            debug=debug
+            debug=debug,
+            slot_layout=self.slot_layout
         )
         self.compiled_graphs[required_tup] = compiled
         return compiled
@@ -491,6 +716,10 @@ class Graph:
         """
         :param required: qualified name(s) of `Variable` instance(s)
         for which a topological ordering of a DAG is to be determined.
+
+        Post-order DFS driven by an explicit stack of input iterators
+        rather than recursion, so the depth of the graph is not bounded
+        by Python's recursion limit and each edge is visited once.
         """
         if isinstance(required, str):
             required = [required]
@@ -501,26 +730,36 @@ class Graph:
 
         used_external_vars: set[Variable] = set()
 
-        def visit(qual_name: str):
-            """ DFS traversal of graph nodes. """
-            if qual_name in visited:
-                return
-            if qual_name in visiting:
-                raise RuntimeError(f"Cycle detected at {qual_name}")
+        def enter(qual_name: str):
+            """ Mark `qual_name` as being visited and push its inputs. """
             visiting.add(qual_name)
             source_name, variable_name = qual_name.rsplit(QUAL_SEP, 1)
             source = self._get_source(source_name)
             variable = source[variable_name]
             if isinstance(source, External):
                 used_external_vars.add(variable)
-            for input_name, input_source in variable.inputs.items():
-                visit(make_qual_name(input_source, input_name))
-            visiting.remove(qual_name)
-            visited.add(qual_name)
-            ordered_variables.append(variable)
+            stack.append((qual_name, variable, iter(variable.inputs.items())))
 
+        stack = []
         for r in required:
-            visit(r)
+            if r in visited:
+                continue
+            enter(r)
+            while stack:
+                qual_name, variable, inputs = stack[-1]
+                for input_name, input_source in inputs:
+                    input_qual_name = make_qual_name(input_source, input_name)
+                    if input_qual_name in visited:
+                        continue
+                    if input_qual_name in visiting:
+                        raise RuntimeError(f"Cycle detected at {input_qual_name}")
+                    enter(input_qual_name)
+                    break
+                else:
+                    stack.pop()
+                    visiting.remove(qual_name)
+                    visited.add(qual_name)
+                    ordered_variables.append(variable)
         return ordered_variables, used_external_vars
 
     @staticmethod
@@ -589,25 +828,35 @@ class Graph:
         derived = set()
         derivation = []
 
-        def collect(qual_name_: str):
-            if qual_name_ in derived:
-                return
+        def enter(qual_name_: str):
             derived.add(qual_name_)
             source_name, variable_name = qual_name_.rsplit(QUAL_SEP, 1)
             variable_source = self.registry[source_name]
             variable = variable_source[variable_name]
-            inputs_qual_names = []
-            for input_name, input_source in variable.inputs.items():
-                inputs_qual_names.append(make_qual_name(input_source, input_name))
-                collect(make_qual_name(input_source, input_name))
-            if isinstance(variable_source, External):
-                derivation.append(f"'{variable_name}' comes from external source '{source_name}'\n")
+            inputs_qual_names = [
+                make_qual_name(input_source, input_name) for input_name, input_source in variable.inputs.items()
+            ]
+            stack.append((qual_name_, variable_source, variable, inputs_qual_names, iter(inputs_qual_names)))
+
+        # Same post-order as a recursive walk, with an explicit stack so that
+        # arbitrarily deep dependency chains can be explained.
+        stack = []
+        enter(qual_name)
+        while stack:
+            qual_name_, variable_source, variable, inputs_qual_names, pending = stack[-1]
+            for input_qual_name in pending:
+                if input_qual_name not in derived:
+                    enter(input_qual_name)
+                    break
             else:
-                derivation.append(
-                    f"""'{qual_name_}' depends on {tuple(sorted(inputs_qual_names))} via\n\n{variable.metadata}"""
-                )
+                stack.pop()
+                if isinstance(variable_source, External):
+                    derivation.append(f"'{variable.name}' comes from external source '{variable_source.name}'\n")
+                else:
+                    derivation.append(
+                        f"""'{qual_name_}' depends on {tuple(sorted(inputs_qual_names))} via\n\n{variable.metadata}"""
+                    )
 
-        collect(qual_name)
         derivation = reversed(derivation) if right_to_left else derivation
         derivation_txt = "\n" + "\n".join(derivation)
         return derivation_txt
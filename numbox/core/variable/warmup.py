@@ -0,0 +1,96 @@
+"""Ahead-of-time warmup of `compile_kernel` graphs.
+
+A fully-declared graph (every node in the required cone carries `params`, every
+consumed external is typed) resolves its execution mode at build: the fused
+kernel, or every jit segment of a declared jit/Python mix, is compiled eagerly
+and -- with caching on -- written to numba's on-disk cache next to its
+content-addressed anchor. `warmup` runs that build once and reports, per
+compiled unit, the compile time and whether numba loaded it from the cache, so
+a warm cache can be baked into an image (e.g. by running
+``python -m numbox.warmup`` at image build time) and verified afterward (a
+second warmup against the baked cache reports every unit as a cache hit).
+
+Undeclared graphs compile at their first call, against the runtime types of its
+arguments, so there is nothing to warm ahead of time; `warmup` refuses them.
+"""
+import time
+
+from dataclasses import dataclass, field
+
+from numbox.core.variable.compile_kernel import CompiledKernel, UnitCompile, compile_kernel
+from numbox.core.variable.variable import QUAL_SEP, Graph, Params
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """Outcome of `warmup`: the kernel's mode and its compiled units."""
+    outputs: tuple[str, ...]       # required qual_names
+    mode: str                      # "fused-pending" | "segmented"
+    units: tuple[UnitCompile, ...]
+    seconds: float                 # whole build, including graph compile and validation
+    kernel: CompiledKernel = field(repr=False, compare=False)
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(1 for u in self.units if u.cache == "hit")
+
+    @property
+    def warm(self) -> bool:
+        """True when every unit was loaded from the on-disk cache."""
+        return bool(self.units) and self.cache_hits == len(self.units)
+
+    def format(self) -> str:
+        lines = [f"{', '.join(self.outputs)}: {self.mode}, {len(self.units)} unit(s)"]
+        for i, u in enumerate(self.units):
+            lines.append(
+                f"  [{i}] {u.unit:<8}{len(u.nodes):>5} node(s)  {u.seconds:9.3f}s  "
+                f"cache {u.cache:<4}  {u.signature}"
+            )
+        lines.append(
+            f"  total {self.seconds:.3f}s, {self.cache_hits}/{len(self.units)} unit(s) loaded from cache"
+        )
+        return "\n".join(lines)
+
+
+def declare_externals(graph: Graph, types: dict) -> None:
+    """Declare `types` (``{external qual_name: numba type}``) on `graph`'s
+    external sources, before the graph is compiled."""
+    for qual, typ in types.items():
+        src, sep, name = qual.rpartition(QUAL_SEP)
+        if not sep or src not in graph.external:
+            raise ValueError(f"{qual!r} does not name a variable of an external source of the graph")
+        graph.external[src].declare(name, Params(type=typ))
+
+
+def warmup(
+    graph: Graph, required: str | list[str], *,
+    types: dict | None = None, jit_options: dict | None = None, cache: bool | None = None,
+) -> WarmupReport:
+    """Build the declared kernel for `required` eagerly and report its units.
+
+    :param graph: a graph whose required cone is fully declared; it must not
+        have compiled `required` yet (a `Graph` caches its compiled result, so
+        declarations attached afterward are not picked up).
+    :param required: as for `compile_kernel`.
+    :param types: optional ``{external qual_name: numba type}`` declared on the
+        graph's external sources first (see `declare_externals`); externals the
+        graph already declares need no entry.
+    :param jit_options: as for `compile_kernel`; they are part of each unit's
+        cache digest, so warm with the options the application will use.
+    :param cache: as for `compile_kernel`.
+
+    Raises `ValueError` when the cone is not fully declared (such a kernel can
+    only compile at its first call).
+    """
+    if types:
+        declare_externals(graph, types)
+    t0 = time.perf_counter()
+    ck = compile_kernel(graph, required, jit_options=jit_options, cache=cache)
+    seconds = time.perf_counter() - t0
+    if not ck.is_declared:
+        raise ValueError(
+            "warmup requires a fully-declared graph: every node in the required cone "
+            "must carry params and every consumed external must be typed"
+        )
+    return WarmupReport(outputs=tuple(ck.outputs), mode=ck._mode, units=tuple(ck.compile_log),
+                        seconds=seconds, kernel=ck)
@@ -0,0 +1,137 @@
+"""Row-batched evaluation of a `Work` graph over structured arrays.
+
+Driving a graph row by row through `load_array_row_into_dict`, `load`,
+`calculate`, `combine` and `load_dict_into_array` boxes every input and
+output value in an `Any`, looks every one up by name in a `Dict` and
+traverses the whole graph twice per row. `run_rows` resolves the input
+and output fields to their nodes once and then, in a single jitted loop,
+stores each input row straight into the nodes' ``data``, invalidates
+their downstream nodes, evaluates the roots through their schedules
+(see :mod:`numbox.core.work.schedule`) and copies the outputs straight
+into the output row (see :func:`numbox.core.work.combine_utils.make_harvester`).
+"""
+import numpy
+
+from inspect import getfile, getmodule
+from io import StringIO
+from numba import njit
+from typing import Collection
+
+from numbox.core.configurations import jit_options
+from numbox.core.work.combine_utils import _resolve_loaded, make_harvester
+from numbox.core.work.schedule import _reset_downstream, _source_view, make_schedule, run_schedule  # noqa: F401
+from numbox.core.work.work import Work
+from numbox.utils.meminfo import borrow_structref  # noqa: F401
+
+
+__all__ = ["RowRunner", "make_row_runner", "run_rows"]
+
+
+def _make_run_rows_code(nodes_fields):
+    code_txt = StringIO()
+    code_txt.write("""
+def _load_row_(row_, handles_):""")
+    for node_ind, field_name in enumerate(nodes_fields):
+        code_txt.write(f"""
+    work_{node_ind} = borrow_structref(view_{node_ind}, handles_[{node_ind}])
+    work_{node_ind}.data = row_.{field_name}""")
+    code_txt.write("""
+    return
+
+
+def _run_rows_(inputs_, outputs_, in_handles_, load_ind_, schedules_, harvest_, out_handles_):
+    for row_ind in range(len(inputs_)):
+        _load_row_(inputs_[row_ind], in_handles_)
+        for schedule_ind, schedule in enumerate(schedules_):
+            _, _, flags, _, _, consumers_ptr, consumers_ind, queue, marks = schedule
+            _reset_downstream(load_ind_[schedule_ind], flags, consumers_ptr, consumers_ind, queue, marks)
+        for schedule in schedules_:
+            steps, handles, flags, sources_ptr, sources_ind, _, _, _, _ = schedule
+            run_schedule(steps, handles, flags, sources_ptr, sources_ind)
+        harvest_(outputs_, row_ind, out_handles_)
+    return
+""")
+    return code_txt.getvalue()
+
+
+class RowRunner:
+    """`run_rows` over the graph of `roots` for fixed input and output
+    fields; see :func:`make_row_runner`."""
+    __slots__ = ("roots", "schedules", "harvester", "in_handles", "load_ind", "_run")
+
+    def __init__(self, roots, schedules, harvester, in_handles, load_ind, run):
+        self.roots = roots
+        self.schedules = schedules
+        self.harvester = harvester
+        self.in_handles = in_handles
+        self.load_ind = load_ind
+        self._run = run
+
+    def __call__(self, inputs_array, outputs_array):
+        if len(inputs_array) != len(outputs_array):
+            raise ValueError(
+                f"Got {len(inputs_array)} input rows and {len(outputs_array)} output rows, expected as many"
+            )
+        schedules = tuple(
+            (*schedule.as_tuple(), schedule.consumers_ptr, schedule.consumers_ind, *schedule.as_load_tuple()[-2:])
+            for schedule in self.schedules
+        )
+        self._run(
+            inputs_array, outputs_array, self.in_handles, self.load_ind, schedules,
+            self.harvester.harvest, self.harvester.handles
+        )
+
+
+def make_row_runner(access: Work | Collection[Work], inputs_dtype, outputs_dtype) -> RowRunner:
+    """Prepare :func:`run_rows` over the graph of `access` -- a root `Work`
+    or several, such as the access nodes returned by `make_graph` -- for
+    input records of `inputs_dtype` and output records of `outputs_dtype`,
+    to be run on many arrays of them.
+
+    Each input field is named after the nodes it is loaded into, all the
+    nodes of that name as `load` loads them, each output field after the
+    node it is harvested from, matched as `combine` matches them; a name not
+    in the graph raises `ValueError`. Input values are
+    stored into the nodes' ``data`` as given, so the field types should be
+    the nodes' data types.
+    """
+    roots = [access] if isinstance(access, Work) else list(access)
+    inputs_names = list(numpy.dtype(inputs_dtype).names)
+    outputs_dtype = numpy.dtype(outputs_dtype)
+    in_nodes = [
+        (field_name, handle, work_ty)
+        for field_name, nodes in zip(inputs_names, _resolve_loaded(roots, inputs_names))
+        for handle, work_ty in nodes
+    ]
+    in_handles = numpy.array([handle for _, handle, _ in in_nodes], dtype=numpy.intp)
+    schedules = [make_schedule(root) for root in roots]
+    seeds = [numpy.concatenate([schedule.named(name) for name in inputs_names]) for schedule in schedules]
+    load_ind = numpy.full((len(schedules), max(map(len, seeds), default=0)), -1, dtype=numpy.intp)
+    for schedule_ind, schedule_seeds in enumerate(seeds):
+        load_ind[schedule_ind, :len(schedule_seeds)] = schedule_seeds
+    harvester = make_harvester(roots, {name: outputs_dtype.fields[name][0] for name in outputs_dtype.names})
+    ns = {**getmodule(_make_run_rows_code).__dict__, **{
+        f"view_{node_ind}": _source_view(work_ty) for node_ind, (_, _, work_ty) in enumerate(in_nodes)
+    }}
+    code_txt = _make_run_rows_code([field_name for field_name, _, _ in in_nodes])
+    code = compile(code_txt, getfile(_make_run_rows_code), mode="exec")
+    exec(code, ns)  # nosec B102 - JIT codegen of internal source
+    # the views are bound per runner, so there is no stable key to cache it under
+    ns["_load_row_"] = njit(**{**jit_options, "cache": False})(ns["_load_row_"])
+    run = njit(**{**jit_options, "cache": False})(ns["_run_rows_"])
+    return RowRunner(roots, schedules, harvester, in_handles, load_ind, run)
+
+
+def run_rows(access: Work | Collection[Work], inputs_array, outputs_array):
+    """For each row of the structured array `inputs_array`, load its fields
+    into the nodes of the same names in the graph of `access`, calculate
+    `access` and write the data of the nodes named by the fields of
+    `outputs_array` into its row -- all in one jitted loop, with no `Dict`
+    lookup or `Any` boxing per value.
+
+    Equivalent to ``load`` / ``calculate`` / ``combine`` per row, with only
+    the nodes downstream of the inputs recalculated. Builds a
+    :class:`RowRunner` each call; call :func:`make_row_runner` once to run
+    many arrays of the same layout.
+    """
+    make_row_runner(access, inputs_array.dtype, outputs_array.dtype)(inputs_array, outputs_array)
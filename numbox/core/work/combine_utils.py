@@ -11,7 +11,9 @@ from typing import Collection
 from numbox.core.any.any_type import AnyType, make_any
 from numbox.core.configurations import jit_options
 from numbox.core.work.node import Node
+from numbox.core.work.schedule import _get_inputs_reader, _source_view, _work_handle
 from numbox.core.work.work import Work
+from numbox.utils.meminfo import borrow_structref  # noqa: F401 - used by the generated _harvest_
 
 
 RequestedTy = Node | str | Work
@@ -73,3 +75,117 @@ def load_dict_into_array(array, sheaf):
 
 def make_requested_dtype(requested: dict):
     return numpy.dtype([(getattr(node, "name", node), ty) for node, ty in requested.items()], align=True)
+
+
+def _make_harvest_code(fields_names):
+    code_txt = StringIO()
+    code_txt.write("""
+def _harvest_(array_, row_ind_, handles_):
+    row = array_[row_ind_]""")
+    for field_ind, field_name in enumerate(fields_names):
+        code_txt.write(f"""
+    row.{field_name} = borrow_structref(view_{field_ind}, handles_[{field_ind}]).data""")
+    code_txt.write("""
+    return""")
+    return code_txt.getvalue()
+
+
+def _check_found(roots, names, found):
+    missing = [name for name in names if name not in found]
+    if missing:
+        roots_names = [root.name for root in roots]
+        raise ValueError(f"Requested nodes {missing} not found in the graph of {roots_names}")
+    return [found[name] for name in names]
+
+
+def _resolve_requested(roots, names):
+    """Map each of `names` to ``(handle, work type)`` of the node `combine`
+    harvests it from, following its traversal: a node before its sources and
+    the sources in order, a node every time it is reached, and a later node
+    of a name overwriting an earlier one until every name has been met. The
+    `roots` are searched in turn, each for the names not found in the ones
+    before it. Costs one `combine` traversal."""
+    found = {}
+    for root in roots:
+        pending = {name for name in names if name not in found}
+        harvested = set()
+        stack = [(_work_handle(root), root._numba_type_)]
+        while stack and len(harvested) < len(pending):
+            handle, work_ty = stack.pop()
+            sources_ty = work_ty.field_dict["sources"]
+            name, source_handles = _get_inputs_reader(len(sources_ty))(handle)
+            if name in pending:
+                harvested.add(name)
+                found[name] = (handle, work_ty)
+            stack.extend(reversed(list(zip(source_handles, sources_ty))))
+    return _check_found(roots, names, found)
+
+
+def _resolve_loaded(roots, names):
+    """Map each of `names` to the list of ``(handle, work type)`` of all the
+    nodes of that name in the graph of the `roots` -- the nodes `load` loads
+    -- each once, in depth-first order."""
+    found = {}
+    visited = set()
+    stack = [(_work_handle(root), root._numba_type_) for root in reversed(roots)]
+    while stack:
+        handle, work_ty = stack.pop()
+        if handle in visited:
+            continue
+        visited.add(handle)
+        sources_ty = work_ty.field_dict["sources"]
+        name, source_handles = _get_inputs_reader(len(sources_ty))(handle)
+        if name in names:
+            found.setdefault(name, []).append((handle, work_ty))
+        stack.extend(reversed(list(zip(source_handles, sources_ty))))
+    return _check_found(roots, names, found)
+
+
+class Harvester:
+    """Precompiled `combine` of the nodes `requested` from the graph of
+    `root`; see :func:`make_harvester`.
+
+    ``harvester()`` copies the nodes' data into the preallocated one-row
+    `record` and returns it; ``harvester.harvest(array, i, harvester.handles)``
+    fills row `i` of any array of `dtype`, from Python or jitted code.
+    """
+    __slots__ = ("root", "dtype", "handles", "record", "harvest")
+
+    def __init__(self, root, dtype, handles, harvest):
+        self.root = root
+        self.dtype = dtype
+        self.handles = handles
+        self.record = numpy.zeros(shape=(1,), dtype=dtype)
+        self.harvest = harvest
+
+    def __call__(self):
+        self.harvest(self.record, 0, self.handles)
+        return self.record
+
+
+def make_harvester(root: Work | Collection[Work], requested: dict) -> Harvester:
+    """Resolve the nodes `requested` -- a mapping of node (or node name) to
+    numpy type, as taken by :func:`make_requested_dtype` -- in the graph of
+    `root` (or of several roots, searched in turn) once, rather than on every
+    ``root.combine(sheaf)``.
+
+    Each harvest is then a flat sequence of typed loads of the nodes' data
+    into a record of the :func:`make_requested_dtype` layout: no `Dict` is
+    allocated, no name compared and no value boxed in `Any`. A name matches
+    the node `combine` harvests, the last one of that name it meets when
+    several share it; a name not in the graph raises `ValueError`. The
+    harvester holds `root` alive, and with it every node it reads.
+    """
+    dtype = make_requested_dtype(requested)
+    fields_names = list(dtype.names)
+    resolved = _resolve_requested([root] if isinstance(root, Work) else list(root), fields_names)
+    handles = numpy.array([handle for handle, _ in resolved], dtype=numpy.intp)
+    ns = {**getmodule(_load_dict_into_array).__dict__, **{
+        f"view_{field_ind}": _source_view(work_ty) for field_ind, (_, work_ty) in enumerate(resolved)
+    }}
+    code_txt = _make_harvest_code(fields_names)
+    code = compile(code_txt, getfile(_load_dict_into_array), mode="exec")
+    exec(code, ns)  # nosec B102 - JIT codegen of internal source
+    # the views are bound per harvester, so there is no stable key to cache it under
+    harvest = njit(**{**jit_options, "cache": False})(ns["_harvest_"])
+    return Harvester(root, dtype, handles, harvest)
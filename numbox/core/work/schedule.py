@@ -0,0 +1,592 @@
+"""Non-recursive, schedule-driven evaluation of a `Work` graph.
+
+`Work.calculate` is generated per number of sources and calls ``calculate`` on
+each source, so the method of every distinct `Work` type in a chain is
+compiled nested inside its consumer's, and evaluation recurses as deep as the
+graph. `make_schedule` flattens the graph below a root once instead: the nodes
+in sources-first (DFS post-order) order -- the order the recursive
+`calculate` derives them in -- each as an erased handle (its MemInfo pointer)
+paired with the entry point of a small per-type *step* that derives that one
+node from its sources' data. `run_schedule` walks the schedule in a single
+loop, compiled once whatever the depth; a step never nests another, and is
+compiled once per distinct shape of node -- its data and derive types and
+its sources' data types -- not per `Work` type.
+
+The per-node ``derived`` flag keeps its meaning. As in `calculate`, a node
+already derived is not recalculated and its sources are not visited, so only
+the not-yet-derived nodes reachable from the root through not-yet-derived
+nodes are derived, each once. The flags are read and cleared in place, at
+addresses resolved when the schedule is made, so only the nodes actually
+derived cost a call. Steps are called through numba's calling
+convention, so an exception raised by a derive propagates out of
+`run_schedule` as it does out of `calculate`.
+
+`Work.load` likewise visits every node below the root -- each as many times
+as it is reachable -- and tests its name against the loaded data. The
+schedule also keeps a name-to-nodes index and the reverse (consumers) edges of
+the graph, with which `load_schedule` sets only the named nodes and clears
+the ``derived`` flag of exactly them and their downstream nodes.
+
+Each node also sits on a level one above its highest source, so the nodes of
+a level are independent of each other: `run_schedule_parallel` derives them
+concurrently, level by level, for graphs with wide fan-in.
+"""
+import numpy as np
+
+from numba import get_num_threads, njit, prange, set_num_threads
+from numba.core import cgutils
+from numba.core.callconv import Status
+from numba.core.registry import cpu_target
+from numba.core.types import BaseTuple, int8, intp, none, NoneType, StructRef, unicode_type, UniTuple
+from numba.experimental.structref import register
+from numba.extending import intrinsic
+from numba.typed.typeddict import Dict
+
+from numbox.core.any.any_type import AnyType
+from numbox.core.configurations import jit_options
+from numbox.core.work.node_base import NodeBaseType
+from numbox.core.work.work import _call_derive, _cast_to_work_data, Work
+from numbox.utils.meminfo import borrow_structref, structref_meminfo
+
+
+__all__ = ["Schedule", "load_schedule", "make_schedule", "run_schedule", "run_schedule_parallel"]
+
+
+@register
+class _WorkViewTypeClass(StructRef):
+    pass
+
+
+def _source_view(source_ty):
+    fields = source_ty.field_dict
+    return _WorkViewTypeClass([("name", fields["name"]), ("inputs", fields["inputs"]), ("data", fields["data"])])
+
+
+def _work_view(work_ty):
+    """Shallow stand-in for `work_ty`: its fields up to ``derived``, with each
+    source typed by its own fields up to ``data``.
+
+    A structref payload lays its fields out in order, and a structref value is
+    its MemInfo pointer whatever its type, so these prefixes address the same
+    memory as the full types -- the layout compatibility the cast to
+    `NodeBaseType` already relies on. Unlike a `Work` type, which nests the
+    types of the whole graph below it, the view depends only on the node's own
+    data / derive types and its sources' data types and input counts, so the
+    nodes of a deep graph built from a few derives share a few steps.
+    """
+    fields = work_ty.field_dict
+    sources_ty = BaseTuple.from_types([_source_view(source_ty) for source_ty in fields["sources"]])
+    return _WorkViewTypeClass([
+        ("name", fields["name"]),
+        ("inputs", fields["inputs"]),
+        ("data", fields["data"]),
+        ("sources", sources_ty),
+        ("derive", fields["derive"]),
+        ("derived", fields["derived"]),
+    ])
+
+
+_step_sig = none(intp)
+_step_registry = {}
+
+
+def _derived_offset(view_ty):
+    """Byte offset of the ``derived`` flag in the payload of `view_ty`."""
+    context = cpu_target.target_context
+    payload_ll = context.get_data_type(view_ty.get_data_type())
+    return payload_ll.get_element_offset(context.target_data, list(view_ty.field_dict).index("derived"))
+
+
+def _make_step(view_ty):
+    """Compile the step of `view_ty`: ``step(work_p)`` derives the node unless
+    it is derived already."""
+    if isinstance(view_ty.field_dict["derive"], NoneType):
+        def _step(work_p):
+            work = borrow_structref(view_ty, work_p)
+            work.derived = True
+    else:
+        def _step(work_p):
+            work = borrow_structref(view_ty, work_p)
+            if not work.derived:
+                work.data = _call_derive(work.derive, work.sources)
+                work.derived = True
+    # the step closes over `view_ty`, so there is no stable key to cache it under
+    step_jit = njit(_step_sig, **{**jit_options, "cache": False})(_step)
+    step_cres = step_jit.get_compile_result(_step_sig)
+    step_p = step_cres.library.get_pointer_to_function(step_cres.fndesc.llvm_func_name)
+    return step_p, step_jit, _derived_offset(view_ty)
+
+
+def _get_step(work_ty):
+    """``(step_p, step_jit, derived_offset)`` of the shape of `work_ty`."""
+    view_ty = _work_view(work_ty)
+    step = _step_registry.get(view_ty)
+    if step is None:
+        step = _step_registry[view_ty] = _make_step(view_ty)
+    return step
+
+
+_setter_sig = none(intp, intp)
+_setter_registry = {}
+
+
+def _get_setter(work_ty):
+    """``(setter_p, setter_jit)``; ``setter(work_p, any_p)`` sets the node's
+    data from the `Any` at `any_p`, as `load` does, without touching
+    ``derived``. Compiled once per data type and number of sources."""
+    view_ty = _source_view(work_ty)
+    setter = _setter_registry.get(view_ty)
+    if setter is not None:
+        return setter
+
+    def _setter(work_p, any_p):
+        work = borrow_structref(view_ty, work_p)
+        any_ = borrow_structref(AnyType, any_p)
+        work.data = _cast_to_work_data(work, any_.p)
+
+    setter_jit = njit(_setter_sig, **{**jit_options, "cache": False})(_setter)
+    setter_cres = setter_jit.get_compile_result(_setter_sig)
+    setter_p = setter_cres.library.get_pointer_to_function(setter_cres.fndesc.llvm_func_name)
+    setter = _setter_registry[view_ty] = (setter_p, setter_jit)
+    return setter
+
+
+@njit(**jit_options)
+def _work_handle(work):
+    meminfo_p, _ = structref_meminfo(work)
+    return meminfo_p
+
+
+_inputs_reader_registry = {}
+
+
+def _get_inputs_reader(num_sources):
+    """``reader(work_p) -> (name, source handles)`` for a node of
+    `num_sources` sources, read through its `NodeBase` prefix and inputs."""
+    reader = _inputs_reader_registry.get(num_sources)
+    if reader is not None:
+        return reader
+    view_ty = _WorkViewTypeClass([("name", unicode_type), ("inputs", UniTuple(NodeBaseType, num_sources))])
+
+    # closes over `view_ty`, like the steps
+    @njit(**{**jit_options, "cache": False})
+    def _read_inputs(work_p):
+        work = borrow_structref(view_ty, work_p)
+        source_handles = np.empty(num_sources, dtype=np.intp)
+        for k, source in enumerate(work.inputs):
+            source_handles[k] = _work_handle(source)
+        return work.name, source_handles
+
+    def reader(work_p):
+        name, source_handles = _read_inputs(work_p)
+        return name, source_handles.tolist()
+    _inputs_reader_registry[num_sources] = reader
+    return reader
+
+
+def _emit_erased_call(context, builder, fn_p, res_ty, arg_tys, args):
+    """Call the compiled function at `fn_p` through numba's calling convention,
+    propagating the exception it raises, if any."""
+    func_ty = context.call_conv.get_function_type(res_ty, arg_tys)
+    fn = builder.inttoptr(fn_p, func_ty.as_pointer())
+    status, res = context.call_conv.call_function(builder, fn, res_ty, arg_tys, args)
+    with cgutils.if_unlikely(builder, status.is_error):
+        context.call_conv.return_status_propagate(builder, status)
+    return res
+
+
+@intrinsic
+def _call_step(typingctx, step_p_ty, work_p_ty):
+    sig = none(intp, intp)
+
+    def codegen(context, builder, signature, arguments):
+        step_p, work_p = arguments
+        _emit_erased_call(context, builder, step_p, none, (intp,), (work_p,))
+        return context.get_dummy_value()
+    return sig, codegen
+
+
+@intrinsic
+def _try_step(typingctx, step_p_ty, work_p_ty):
+    """Like `_call_step`, but returns the error status of the step -- its
+    return code, 0 on success, and exception info pointer -- rather than
+    propagating its exception, which a `prange` body cannot do; see
+    `_raise_status`."""
+    sig = UniTuple(intp, 2)(intp, intp)
+
+    def codegen(context, builder, signature, arguments):
+        step_p, work_p = arguments
+        func_ty = context.call_conv.get_function_type(none, (intp,))
+        step_fn = builder.inttoptr(step_p, func_ty.as_pointer())
+        status, _ = context.call_conv.call_function(builder, step_fn, none, (intp,), (work_p,))
+        intp_t = context.get_value_type(intp)
+        code = builder.select(status.is_ok, intp_t(0), builder.sext(status.code, intp_t))
+        return context.make_tuple(builder, signature.return_type, (code, builder.ptrtoint(status.excinfoptr, intp_t)))
+    return sig, codegen
+
+
+@intrinsic
+def _raise_status(typingctx, code_ty, excinfo_p_ty):
+    """Propagate the exception of a failed step, from the nonzero error
+    status `_try_step` returned for it, out of the calling function, as
+    `_call_step` would have."""
+    sig = none(intp, intp)
+
+    def codegen(context, builder, signature, arguments):
+        code, excinfo_p = arguments
+        func_ty = context.call_conv.get_function_type(none, ())
+        code = builder.trunc(code, func_ty.return_type)
+        status = Status(
+            code=code, is_ok=cgutils.false_bit, is_none=cgutils.false_bit, is_error=cgutils.true_bit,
+            is_stop_iteration=builder.icmp_signed("==", code, code.type(-3)),
+            is_python_exc=builder.icmp_signed("==", code, code.type(-1)),
+            is_user_exc=builder.icmp_signed(">", code, code.type(0)),
+            excinfoptr=builder.inttoptr(excinfo_p, func_ty.args[1].pointee),
+        )
+        context.call_conv.return_status_propagate(builder, status)
+        return context.get_dummy_value()
+    return sig, codegen
+
+
+@intrinsic
+def _payload_address(typingctx, meminfo_p_ty):
+    sig = intp(intp)
+
+    def codegen(context, builder, signature, arguments):
+        meminfo = builder.inttoptr(arguments[0], cgutils.voidptr_t)
+        return builder.ptrtoint(context.nrt.meminfo_data(builder, meminfo), context.get_value_type(intp))
+    return sig, codegen
+
+
+@njit(**jit_options)
+def _payload_addresses(handles):
+    addresses = np.empty_like(handles)
+    for i in range(len(handles)):
+        addresses[i] = _payload_address(handles[i])
+    return addresses
+
+
+@intrinsic
+def _load_flag(typingctx, flag_p_ty):
+    sig = int8(intp)
+
+    def codegen(context, builder, signature, arguments):
+        return builder.load(builder.inttoptr(arguments[0], cgutils.int8_t.as_pointer()))
+    return sig, codegen
+
+
+@intrinsic
+def _clear_flag(typingctx, flag_p_ty):
+    sig = none(intp)
+
+    def codegen(context, builder, signature, arguments):
+        builder.store(cgutils.int8_t(0), builder.inttoptr(arguments[0], cgutils.int8_t.as_pointer()))
+        return context.get_dummy_value()
+    return sig, codegen
+
+
+@intrinsic
+def _call_setter(typingctx, setter_p_ty, work_p_ty, any_p_ty):
+    sig = none(intp, intp, intp)
+
+    def codegen(context, builder, signature, arguments):
+        setter_p, work_p, any_p = arguments
+        _emit_erased_call(context, builder, setter_p, none, (intp, intp), (work_p, any_p))
+        return context.get_dummy_value()
+    return sig, codegen
+
+
+@njit(**jit_options)
+def _needed_nodes(flags, sources_ptr, sources_ind):
+    """Nodes the root (the last node) needs derived: those not derived yet and
+    reachable from it through nodes not derived yet."""
+    num_nodes = len(flags)
+    needed = np.zeros(num_nodes, dtype=np.bool_)
+    root = num_nodes - 1
+    needed[root] = _load_flag(flags[root]) == 0
+    for i in range(root, -1, -1):
+        if not needed[i]:
+            continue
+        for k in range(sources_ptr[i], sources_ptr[i + 1]):
+            j = sources_ind[k]
+            if not needed[j] and _load_flag(flags[j]) == 0:
+                needed[j] = True
+    return needed
+
+
+@njit(**jit_options)
+def run_schedule(steps, handles, flags, sources_ptr, sources_ind):
+    """Derive the root (the last node) of a flattened graph and whatever it
+    needs. Node ``i`` has step ``steps[i]``, handle ``handles[i]``, its
+    ``derived`` flag at address ``flags[i]`` and sources
+    ``sources_ind[sources_ptr[i]:sources_ptr[i + 1]]``."""
+    if len(handles) == 0:
+        return
+    needed = _needed_nodes(flags, sources_ptr, sources_ind)
+    for i in range(len(handles)):
+        if needed[i]:
+            _call_step(steps[i], handles[i])
+
+
+@njit(**{**jit_options, "parallel": True})
+def run_schedule_parallel(steps, handles, flags, sources_ptr, sources_ind, levels_ptr, levels_ind):
+    """`run_schedule` deriving the needed nodes of each level -- the nodes
+    ``levels_ind[levels_ptr[k]:levels_ptr[k + 1]]`` of level ``k``, whose
+    sources all sit on lower levels -- concurrently, level by level.
+
+    A level with a single node to derive is run on the calling thread. If a
+    derive raises in a worker, the level completes and the exception of its
+    first failed node is re-raised on the calling thread; no derive is run
+    twice. The exceptions of any further failed nodes of that level are
+    dropped."""
+    num_nodes = len(handles)
+    if num_nodes == 0:
+        return
+    needed = _needed_nodes(flags, sources_ptr, sources_ind)
+    batch = np.empty(num_nodes, dtype=np.intp)
+    codes = np.empty(num_nodes, dtype=np.intp)
+    excinfos = np.empty(num_nodes, dtype=np.intp)
+    for level in range(len(levels_ptr) - 1):
+        batch_size = 0
+        for k in range(levels_ptr[level], levels_ptr[level + 1]):
+            i = levels_ind[k]
+            if needed[i]:
+                batch[batch_size] = i
+                batch_size += 1
+        if batch_size == 1:
+            _call_step(steps[batch[0]], handles[batch[0]])
+        elif batch_size > 1:
+            for k in prange(batch_size):
+                codes[k], excinfos[k] = _try_step(steps[batch[k]], handles[batch[k]])
+            for k in range(batch_size):
+                if codes[k] != 0:
+                    _raise_status(codes[k], excinfos[k])
+
+
+@njit(**jit_options)
+def _reset_downstream(seeds, flags, consumers_ptr, consumers_ind, queue, marks):
+    """Clear the ``derived`` flag of the nodes `seeds` (negative entries are
+    skipped, repeated ones visited once) and of every node downstream of
+    them, following the consumers
+    ``consumers_ind[consumers_ptr[i]:consumers_ptr[i + 1]]`` of each node
+    ``i``. `queue` (intp) and `marks` (all False, and left so) are scratch
+    arrays of one entry per node. Returns the number of nodes reset."""
+    tail = 0
+    for i in seeds:
+        if i >= 0 and not marks[i]:
+            marks[i] = True
+            queue[tail] = i
+            tail += 1
+    head = 0
+    while head < tail:
+        i = queue[head]
+        head += 1
+        _clear_flag(flags[i])
+        for k in range(consumers_ptr[i], consumers_ptr[i + 1]):
+            j = consumers_ind[k]
+            if not marks[j]:
+                marks[j] = True
+                queue[tail] = j
+                tail += 1
+    for k in range(tail):
+        marks[queue[k]] = False
+    return tail
+
+
+@njit(**jit_options)
+def load_schedule(
+    data, index, named_ptr, named_ind, setters, handles, flags, consumers_ptr, consumers_ind, queue, marks
+):
+    """Schedule-driven equivalent of ``work.load(data)``: set the data of the
+    nodes named in `data` -- every node of that name, as `load` does -- and
+    clear the ``derived`` flag of them and of every node downstream of them,
+    up to the root. Returns whether any node of the graph was loaded.
+
+    Names are looked up in `index`, mapping each name to its group
+    ``named_ind[named_ptr[k]:named_ptr[k + 1]]`` of nodes, rather than tested
+    against every node, and invalidation follows the consumer edges rather
+    than traversing the graph, so the cost is proportional to the number of
+    nodes loaded and invalidated. `queue` and `marks` are the scratch arrays
+    of `_reset_downstream`."""
+    seeds = np.empty(len(named_ind), dtype=np.intp)
+    num_seeds = 0
+    for name, value in data.items():
+        if name not in index:
+            continue
+        k = index[name]
+        value_handle = _work_handle(value)
+        for m in range(named_ptr[k], named_ptr[k + 1]):
+            i = named_ind[m]
+            _call_setter(setters[i], handles[i], value_handle)
+            seeds[num_seeds] = i
+            num_seeds += 1
+    return _reset_downstream(seeds[:num_seeds], flags, consumers_ptr, consumers_ind, queue, marks) > 0
+
+
+class Schedule:
+    """Flattened `Work` graph below `work`; see :func:`make_schedule`.
+
+    Holds `work` -- and through its sources every node of the graph -- alive
+    for as long as the handles are used, and the compiled steps with them.
+    """
+    __slots__ = (
+        "work", "names", "steps", "handles", "flags", "sources_ptr", "sources_ind", "levels_ptr", "levels_ind",
+        "index", "named_ptr", "named_ind", "setters", "consumers_ptr", "consumers_ind", "_queue", "_marks",
+        "_compiled",
+    )
+
+    def __init__(
+        self, work, names, steps, handles, flags, sources_ptr, sources_ind, levels_ptr, levels_ind, index,
+        named_ptr, named_ind, setters, consumers_ptr, consumers_ind, compiled
+    ):
+        self.work = work
+        self.names = names
+        self.steps = steps
+        self.handles = handles
+        self.flags = flags
+        self.sources_ptr = sources_ptr
+        self.sources_ind = sources_ind
+        self.levels_ptr = levels_ptr
+        self.levels_ind = levels_ind
+        self.index = index
+        self.named_ptr = named_ptr
+        self.named_ind = named_ind
+        self.setters = setters
+        self.consumers_ptr = consumers_ptr
+        self.consumers_ind = consumers_ind
+        self._queue = np.empty(len(names), dtype=np.intp)
+        self._marks = np.zeros(len(names), dtype=np.bool_)
+        self._compiled = compiled
+
+    def __len__(self):
+        return len(self.names)
+
+    def calculate(self, parallel: bool = False, n_threads: int | None = None):
+        """Schedule-driven equivalent of ``self.work.calculate()``.
+
+        `parallel=True` (opt-in) derives the independent nodes of each level
+        concurrently on numba's threading layer; derives must then be free of
+        shared mutable state. `n_threads` caps the worker threads for this
+        call (``numba.set_num_threads``, restored afterwards); `None` uses
+        numba's current setting.
+        """
+        if not parallel:
+            run_schedule(*self.as_tuple())
+            return
+        if n_threads is None:
+            run_schedule_parallel(*self.as_parallel_tuple())
+            return
+        saved = get_num_threads()
+        set_num_threads(n_threads)
+        try:
+            run_schedule_parallel(*self.as_parallel_tuple())
+        finally:
+            set_num_threads(saved)
+
+    def named(self, name):
+        """Indices of the nodes named `name`, in schedule order (empty if
+        there is none)."""
+        k = self.index.get(name)
+        if k is None:
+            return np.empty(0, dtype=np.intp)
+        return self.named_ind[self.named_ptr[k]:self.named_ptr[k + 1]]
+
+    def load(self, data):
+        """Schedule-driven equivalent of ``self.work.load(data)``."""
+        return load_schedule(data, *self.as_load_tuple())
+
+    def as_tuple(self):
+        """``(steps, handles, flags, sources_ptr, sources_ind)``, the arguments
+        of :func:`run_schedule`, for calling it from jitted code."""
+        return self.steps, self.handles, self.flags, self.sources_ptr, self.sources_ind
+
+    def as_parallel_tuple(self):
+        """The arguments of :func:`run_schedule_parallel`, for calling it from
+        jitted code."""
+        return (*self.as_tuple(), self.levels_ptr, self.levels_ind)
+
+    def as_load_tuple(self):
+        """The arguments of :func:`load_schedule` following `data`, for
+        calling it from jitted code."""
+        return (
+            self.index, self.named_ptr, self.named_ind, self.setters, self.handles, self.flags, self.consumers_ptr,
+            self.consumers_ind, self._queue, self._marks
+        )
+
+
+def make_schedule(work: Work) -> Schedule:
+    """Flatten the graph below `work` into a :class:`Schedule`.
+
+    The traversal is iterative, so graph depth is bounded by memory rather
+    than the interpreter stack, and reads each node through a shallow view,
+    so it compiles nothing per `Work` type. A node shared by several
+    consumers appears once. The graph's structure is fixed at `make_work`
+    time, so a schedule stays valid for the life of `work`; `load` /
+    `combine` and the ``derived`` flags it reads at run time can change
+    freely.
+    """
+    index = {}
+    order = []
+    sources_of = {}
+    stack = [(_work_handle(work), work._numba_type_, False)]
+    while stack:
+        handle, work_ty, expanded = stack.pop()
+        if handle in index:
+            continue
+        if expanded:
+            index[handle] = len(order)
+            order.append((handle, work_ty))
+            continue
+        sources_ty = work_ty.field_dict["sources"]
+        name, source_handles = _get_inputs_reader(len(sources_ty))(handle)
+        sources_of[handle] = (name, source_handles)
+        stack.append((handle, work_ty, True))
+        for source_handle, source_ty in reversed(list(zip(source_handles, sources_ty))):
+            if source_handle not in index:
+                stack.append((source_handle, source_ty, False))
+    num_nodes = len(order)
+    steps = np.empty(num_nodes, dtype=np.intp)
+    derived_offsets = np.empty(num_nodes, dtype=np.intp)
+    setters = np.empty(num_nodes, dtype=np.intp)
+    handles = np.empty(num_nodes, dtype=np.intp)
+    sources_ptr = np.zeros(num_nodes + 1, dtype=np.intp)
+    sources_ind = []
+    names = []
+    named = {}
+    compiled = []
+    for i, (handle, work_ty) in enumerate(order):
+        step_p, step_jit, derived_offsets[i] = _get_step(work_ty)
+        setter_p, setter_jit = _get_setter(work_ty)
+        steps[i] = step_p
+        setters[i] = setter_p
+        handles[i] = handle
+        compiled.extend((step_jit, setter_jit))
+        name, source_handles = sources_of[handle]
+        names.append(name)
+        named.setdefault(name, []).append(i)
+        sources_ind.extend(index[h] for h in source_handles)
+        sources_ptr[i + 1] = len(sources_ind)
+    sources_ind = np.array(sources_ind, dtype=np.intp)
+    name_index = Dict.empty(key_type=unicode_type, value_type=intp)
+    named_ptr = np.zeros(len(named) + 1, dtype=np.intp)
+    for k, (name, nodes) in enumerate(named.items()):
+        name_index[name] = k
+        named_ptr[k + 1] = named_ptr[k] + len(nodes)
+    named_ind = np.array([i for nodes in named.values() for i in nodes], dtype=np.intp)
+    consumers_ptr = np.zeros(num_nodes + 1, dtype=np.intp)
+    np.cumsum(np.bincount(sources_ind, minlength=num_nodes), out=consumers_ptr[1:])
+    consumer_of_edge = np.repeat(np.arange(num_nodes, dtype=np.intp), np.diff(sources_ptr))
+    consumers_ind = consumer_of_edge[np.argsort(sources_ind, kind="stable")]
+    levels = np.zeros(num_nodes, dtype=np.intp)
+    for i in range(num_nodes):
+        node_sources = sources_ind[sources_ptr[i]:sources_ptr[i + 1]]
+        if len(node_sources):
+            levels[i] = levels[node_sources].max() + 1
+    levels_ptr = np.zeros((levels.max() + 2) if num_nodes else 1, dtype=np.intp)
+    np.cumsum(np.bincount(levels, minlength=len(levels_ptr) - 1), out=levels_ptr[1:])
+    levels_ind = np.argsort(levels, kind="stable")
+    flags = _payload_addresses(handles) + derived_offsets
+    return Schedule(
+        work, names, steps, handles, flags, sources_ptr, sources_ind, levels_ptr, levels_ind, name_index,
+        named_ptr, named_ind, setters, consumers_ptr, consumers_ind, compiled
+    )
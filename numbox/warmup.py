@@ -0,0 +1,65 @@
+"""Prime numba's on-disk cache for a declared `compile_kernel` graph.
+
+    python -m numbox.warmup mypkg.graphs:make_graph -r vars.y -r vars.z -t ext.x=float64
+
+`factory` is a ``module:callable`` returning a `Graph`; each ``--type``
+declares an external as ``qual_name=numba type expression`` (evaluated against
+``numba.types``, e.g. ``float64``, ``int64[:]``). The fused kernel or every jit
+segment is compiled (or loaded) eagerly and a per-unit report is printed. With
+``--check`` the exit status is 1 unless every unit was loaded from the cache,
+which verifies a baked cache. See `numbox.core.variable.warmup`.
+"""
+import argparse
+import importlib
+import sys
+
+from numba import types as nb_types
+
+from numbox.core.variable.warmup import warmup
+
+
+def _load_factory(spec: str):
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not attr:
+        raise argparse.ArgumentTypeError(f"factory must be 'module:callable', got {spec!r}")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _parse_type(spec: str) -> tuple[str, object]:
+    qual, sep, expr = spec.partition("=")
+    if not sep or not qual or not expr:
+        raise argparse.ArgumentTypeError(f"type must be 'qual_name=type', got {spec!r}")
+    try:
+        typ = eval(expr, {"__builtins__": {}}, vars(nb_types))  # nosec B307 - CLI type expression
+    except Exception as e:
+        raise argparse.ArgumentTypeError(f"cannot parse numba type {expr!r}: {e}") from e
+    if not isinstance(typ, nb_types.Type):
+        raise argparse.ArgumentTypeError(f"{expr!r} is not a numba type")
+    return qual, typ
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m numbox.warmup", description=__doc__.splitlines()[0])
+    parser.add_argument("factory", type=_load_factory, help="module:callable returning the Graph")
+    parser.add_argument("-r", "--required", action="append", required=True,
+                        help="required qual_name (repeatable, output order)")
+    parser.add_argument("-t", "--type", dest="types", action="append", type=_parse_type, default=[],
+                        help="external declaration qual_name=numba type (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="compile without the on-disk cache")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 unless every unit was loaded from the on-disk cache")
+    args = parser.parse_args(argv)
+    try:
+        report = warmup(args.factory(), args.required, types=dict(args.types),
+                        cache=False if args.no_cache else None)
+    except ValueError as e:
+        parser.error(str(e))
+    print(report.format())
+    return 1 if args.check and not report.warm else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,7 @@ Run it (from the repo root, with numbox installed)::
     python -m test.compile_kernel_benchmark --profile cheap       # dispatch-bound regime
     python -m test.compile_kernel_benchmark --compile-report      # + cache/compile
     python -m test.compile_kernel_benchmark --recompute           # incremental recompute
+    python -m test.compile_kernel_benchmark --batch --size 100000 # batched + prange scenarios
     python test/compile_kernel_benchmark.py --help
 
 ``--profile {cheap,mixed,expensive}`` selects the per-node cost mix, so every
@@ -32,10 +33,17 @@ claim below is reproducible from this one file: ``cheap`` reproduces the
 dispatch-bound regime (large fusion win), ``mixed`` (default) the heterogeneous
 numbers reported here, ``expensive`` the compute-bound extreme.
 
-``--nodes`` drives a linear (depth-N) chain, so it is bounded by Python's
-recursion limit inside ``Graph.compile`` (a recursive topological sort); tested
-to 1000. The fused kernel compile is intentionally slow on a cold cache -- both
-the perf path and the compile report print a heads-up before compiling.
+``--batch`` evaluates the chain over ``--size`` independent scalar scenarios and
+reports ``kernel_batch`` (sequential and ``parallel=True`` at every power-of-two
+thread count up to ``NUMBA_NUM_THREADS``) against a Python loop of per-row
+``kernel`` calls; the ``speedup`` column is each thread count over the sequential
+batch. On a single-core box only the 1-thread row appears (~1.0x); the batch
+itself removes the per-row round trip (~3.7x over the loop at N=50, S=200000).
+
+``--nodes`` drives a linear (depth-N) chain; ``Graph.compile`` traverses it
+iteratively, so the depth is not bounded by Python's recursion limit. The fused
+kernel compile is intentionally slow on a cold cache -- both the perf path and
+the compile report print a heads-up before compiling.
 
 ----------------------------------------------------------------------------
 Sample results (AMD Ryzen 5 7640HS, Linux x86-64, CPython 3.12, numba 0.65.1;
@@ -73,6 +81,13 @@ balloons to ~57 MiB across ~4000 files -- larger than the monolithic njit cache.
 So "proxy = smaller cache" holds for the kernel, but reverses for the whole
 on-disk footprint once the formulas are distinct and made cacheable. proxy also
 needs an explicit signature + a named, source-resolvable function per formula.
+
+Each worker line is followed by its ``CompiledKernel.compile_profile``: seconds
+per build phase (graph compile, fingerprinting, source generation) and, for the
+fused kernel, numba typing / lowering / LLVM-lock time, cache load or store, and
+the generated source size. Cold, the njit kernel's time is almost all typing --
+the N formulas compile as callees during type inference -- and lowering; warm,
+it is the cache load alone.
 ----------------------------------------------------------------------------
 """
 import argparse
@@ -405,6 +420,62 @@ def run_python_nodes_mode(n_nodes, size, repeats, profile, k):
         print(f"  {name:<26}{best / 1e3:10.2f}{med / 1e3:10.2f}{best / seg_best:13.2f}x")
 
 
+# --- batched scenario report (the --batch mode) ------------------------------
+# Evaluates the same chain over S independent SCALAR scenarios (one row per
+# scenario: ``a`` and ``b`` are float64 scalars per row). Contrasts a Python loop
+# of per-row ``kernel(...)`` calls (one Python->numba round trip and one tuple
+# boxing per row) with ``kernel_batch`` -- one native call whose row loop lives in
+# the fused source -- and with its ``parallel=True`` prange variant at each thread
+# count up to ``numba.config.NUMBA_NUM_THREADS``, reporting the speedup of each
+# thread count over the sequential batch.
+
+def _thread_counts():
+    top = numba.config.NUMBA_NUM_THREADS
+    counts, n = [], 1
+    while n < top:
+        counts.append(n)
+        n *= 2
+    return counts + [top]
+
+
+def run_batch_mode(n_nodes, rows, repeats, profile):
+    formulas = load_formulas(n_nodes, profile)
+    a, b = make_externals(rows)
+    graph, required = build_graph(n_nodes, "njit", formulas)
+
+    print(f"compiling fused + batch kernels for N={n_nodes} nodes (cold cache is slow)...",
+          flush=True)
+    t0 = time.perf_counter()
+    ck = compile_kernel(graph, required)
+    (seq_out,) = ck.kernel_batch(a, b)
+    (par_out,) = ck.kernel_batch(a, b, parallel=True)
+    print(f"  ready in {time.perf_counter() - t0:.1f}s", flush=True)
+
+    ref = numpy.array([ck.kernel(x, y)[0] for x, y in zip(a[:100], b[:100])])
+    assert numpy.max(numpy.abs(seq_out[:100] - ref)) < 1e-9, "batch kernel mismatch"
+    assert numpy.max(numpy.abs(par_out - seq_out)) < 1e-9, "parallel batch kernel mismatch"
+
+    def per_row():
+        kernel = ck.kernel
+        for x, y in zip(a, b):
+            kernel(x, y)
+
+    loop_best = best_median(per_row, max(1, repeats // 10))[0]
+    seq_best = best_median(lambda: ck.kernel_batch(a, b), repeats)[0]
+    rows_ = [("per-row kernel loop", loop_best, None),
+             ("kernel_batch", seq_best, None)]
+    for t in _thread_counts():
+        best = best_median(lambda: ck.kernel_batch(a, b, parallel=True, n_threads=t), repeats)[0]
+        rows_.append((f"kernel_batch parallel, {t} thr", best, seq_best / best))
+
+    print(f"\nbatched scenarios, profile={profile}, N={n_nodes} nodes, S={rows} scalar "
+          f"rows, best of {repeats} (milliseconds/batch):")
+    print(f"  {'path':<32}{'best':>10}{'vs loop':>10}{'speedup':>10}")
+    for name, best, speedup in rows_:
+        sp = f"{speedup:9.2f}x" if speedup is not None else f"{'':>10}"
+        print(f"  {name:<32}{best / 1e6:10.2f}{loop_best / best:9.2f}x{sp}")
+
+
 # --- compile / cache report (his CPUDispatcher-vs-proxy question) ------------
 # Each measurement runs in a fresh subprocess with an isolated NUMBA_CACHE_DIR so
 # the cache is clean and measurable; the same process re-runs warm to show the
@@ -429,7 +500,7 @@ def _compile_worker(n_nodes, kind, profile):
     with warnings.catch_warnings(record=True) as caught:
         warnings.simplefilter("always")
         t1 = time.perf_counter_ns()
-        ck = compile_kernel(graph, required)
+        ck = compile_kernel(graph, required, profile=True)
         out = ck.kernel(a, b)[0]
         kernel_ms = (time.perf_counter_ns() - t1) / 1e6
         cannot_cache = any(
@@ -442,6 +513,7 @@ def _compile_worker(n_nodes, kind, profile):
     print(f"  {kind:<13} build={build_ms:9.1f}ms  kernel_compile={kernel_ms:10.1f}ms  "
           f"total={build_ms + kernel_ms:10.1f}ms  cache={size / 1024:9.1f}KiB "
           f"({nfiles} files)  cacheable={'NO' if cannot_cache else 'yes'}")
+    print("\n".join("    " + line for line in ck.compile_profile.format().splitlines()))
 
 
 def run_compile_report(n_nodes, profile):
@@ -676,7 +748,8 @@ def main():
                    help="per-node cost mix (default mixed: ~1/3 expensive). 'cheap' "
                         "is dispatch-bound (big fusion win); 'expensive' compute-bound")
     p.add_argument("--compile-report", action="store_true",
-                   help="also run the CPUDispatcher-vs-proxy compile/cache comparison")
+                   help="also run the CPUDispatcher-vs-proxy compile/cache comparison, "
+                        "with each kernel's compile profile")
     p.add_argument("--python-nodes", type=int, default=0,
                    help="inject K evenly-spaced non-jittable nodes and run the "
                         "segmented-orchestration report instead of the fused perf "
@@ -692,14 +765,13 @@ def main():
                         "to exercise LRU thrash)")
     p.add_argument("--fan-depth", type=int, default=12,
                    help="fan-out regime: per-column chain depth (default 12)")
+    p.add_argument("--batch", action="store_true",
+                   help="run the batched-scenario report (per-row kernel loop vs "
+                        "kernel_batch vs parallel kernel_batch per thread count) instead "
+                        "of the fused perf run; --size is the scenario (row) count")
     p.add_argument("--_worker", help=argparse.SUPPRESS)  # internal: one compile measurement
     args = p.parse_args()
 
-    # Graph.compile's topological sort is a recursive DFS; a depth-N chain needs
-    # headroom over the default ~1000 limit. Set here (not at import) so merely
-    # importing this module never perturbs the process-wide recursion limit.
-    sys.setrecursionlimit(20000)
-
     if args._worker:
         _compile_worker(args.nodes if args.nodes is not None else 200,
                         args._worker, args.profile)
@@ -713,6 +785,10 @@ def main():
         return
 
     nodes = args.nodes if args.nodes is not None else 200
+    if args.batch:
+        run_batch_mode(nodes, args.size if args.size is not None else 100000,
+                       args.repeats, args.profile)
+        return
     size = args.size if args.size is not None else 1000
     if args.python_nodes > 0:
         run_python_nodes_mode(nodes, size, args.repeats, args.profile,
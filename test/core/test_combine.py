@@ -1,10 +1,13 @@
 import numpy
+import pytest
 
 from numba import njit, typeof
 from numba.core.types import CharSeq, float64
 from numpy import isclose
 
-from numbox.core.work.combine_utils import load_dict_into_array, make_requested_dtype, make_sheaf_dict
+from numbox.core.work.combine_utils import (
+    load_dict_into_array, make_harvester, make_requested_dtype, make_sheaf_dict
+)
 from numbox.core.work.lowlevel_work_utils import ll_make_work
 from numbox.core.work.work import make_work
 from numbox.core.work.work_utils import make_work_helper
@@ -107,5 +110,55 @@ def test_combine_4():
         raise RuntimeError("didn't stop after locating 'w1' in `w1` via `w2`, went on to `w1_pretend` via `w3`")
 
 
+def test_harvester():
+    w0 = make_work_helper("w0", 1.72)
+    w1 = make_work_helper("w1", 1.41)
+    w2 = make_w2()
+    w3 = make_work("w3", 0.0, sources=(w0, w1, w2), derive=derive_w3)
+    w3.calculate()
+    harvester = make_harvester(w3, {w0: numpy.float64, "w2": "|S8", w3: numpy.float64})
+    assert harvester.dtype == make_requested_dtype({"w0": numpy.float64, "w2": "|S8", "w3": numpy.float64})
+    collected = harvester()
+    assert isclose(collected[0]["w0"], 1.72)
+    assert collected[0]["w2"] == b"double"
+    assert isclose(collected[0]["w3"], 1.72 + 2 * 1.41)
+
+    @njit
+    def harvest_rows(w, harvest, handles, w0_values):
+        rows = numpy.empty(len(w0_values), dtype=collected.dtype)
+        for i, w0_value in enumerate(w0_values):
+            w.sources[0].data = w0_value
+            w.derived = False
+            w.calculate()
+            harvest(rows, i, handles)
+        return rows
+
+    rows = harvest_rows(w3, harvester.harvest, harvester.handles, numpy.array([0.0, 1.0]))
+    assert numpy.allclose(rows["w0"], [0.0, 1.0])
+    assert numpy.allclose(rows["w3"], [2 * 1.41, 1.0 + 2 * 1.41])
+
+
+def test_harvester_matches_combine_and_rejects_missing():
+    w1 = make_work_helper("w1", 1.41)
+    w1_pretend = make_work_helper("w1", 1.72)
+    w2 = make_work_helper("w2", 0.0, sources=(w1,), derive_py=lambda w1_: w1_)
+    w3 = make_work_helper("w3", 0.0, sources=(w1_pretend,), derive_py=lambda w1_: w1_)
+    w4 = make_work_helper("w4", 0.0, sources=(w2, w3), derive_py=lambda w2_, w3_: (w2_ + w3_) / 2.0)
+    sheaf = make_sheaf_dict(w1)
+    w4.combine(sheaf)
+    assert make_harvester(w4, {w1: numpy.float64})()[0]["w1"] == sheaf["w1"].get_as(typeof(w1.data)) == 1.41
+    with pytest.raises(ValueError, match="not found"):
+        make_harvester(w4, {"w5": numpy.float64})
+
+
+def test_harvester_matches_combine_on_repeated_name():
+    a = make_work("x", 1.0, sources=(make_work("x", 2.0), make_work("y", 3.0)))
+    sheaf = make_sheaf_dict(["x", "y"])
+    a.combine(sheaf)
+    collected = make_harvester(a, {"x": numpy.float64, "y": numpy.float64})()[0]
+    assert collected["x"] == sheaf["x"].get_as(float64) == 2.0
+    assert collected["y"] == sheaf["y"].get_as(float64) == 3.0
+
+
 if __name__ == "__main__":
     collect_and_run_tests(__name__)
@@ -531,6 +531,45 @@ def test_readonly_cache_dir_degrades_gracefully(tmp_path):
         cache_dir.chmod(0o700)
 
 
+def test_compile_profile_is_opt_in_and_covers_first_call_units():
+    assert compile_kernel(_diamond_graph(), "variables.u", cache=False).compile_profile is None
+    ck = compile_kernel(_chain_graph_with_python_middle(), "calc.n5", cache=False, profile=True)
+    prof = ck.compile_profile
+    assert set(prof.phases) == {"graph", "codegen", "fingerprint"} and prof.units == []
+    assert ck.kernel(1.0) == ((((1.0 + 1.0) * 2.0 * 3.0) - 4.0) / 2.0,)
+    # the fused attempt fails to type, so only the two discovered segments compile
+    assert [(u.unit, u.nodes, u.cache) for u in prof.units] == [("segment", 2, "off"), ("segment", 2, "off")]
+    assert [u.nodes for u in ck.compile_log] == [("calc.n1", "calc.n2"), ("calc.n4", "calc.n5")]
+    for u in prof.units:
+        assert u.source_bytes > 0 and 0 < u.typing < u.seconds and u.lowering > 0
+        assert u.cache_load == u.cache_store == 0.0
+    assert "segment" in prof.format()
+
+
+def test_compile_profile_splits_cache_store_and_load(tmp_path):
+    f = tmp_path / "profile_probe.py"
+    f.write_text(textwrap.dedent('''
+        from numba.core.types import float64
+        from numbox.core.variable.variable import Graph, Params
+        from numbox.core.variable.compile_kernel import compile_kernel
+
+        def a(x):
+            return x + 1.0
+
+        g = Graph({"c": [{"name": "a", "inputs": {"x": "e"}, "formula": a, "params": Params(type=float64)}]}, ["e"])
+        g.external["e"].declare("x", Params(type=float64))
+        [u] = compile_kernel(g, "c.a", profile=True).compile_profile.units
+        print(u.cache, u.typing > 0, u.cache_store > 0, u.cache_load > 0)
+    '''))
+    env = {**os.environ, "NUMBA_CACHE_DIR": str(tmp_path / "nbcache")}
+    runs = []
+    for _ in range(2):
+        p = subprocess.run([sys.executable, str(f)], capture_output=True, text=True, env=env)
+        assert p.returncode == 0, p.stderr
+        runs.append(p.stdout.strip())
+    assert runs == ["miss True True False", "hit False False True"]
+
+
 def test_fingerprint_same_line_lambdas_distinct():
     from numbox.core.variable.compile_kernel import _formula_fingerprint
     f10, f1000 = (lambda y: y * 10.0), (lambda y: y * 1000.0)
@@ -971,8 +1010,8 @@ def test_external_typo_compiles_to_phantom_input():
         ck.execute({"ext": {"x": 5.0}})
 
 
-def test_deep_chain_recursion_error_is_contextual():
-    depth = sys.getrecursionlimit() + 100
+def test_deep_chain_compiles_without_recursion_limit():
+    depth = sys.getrecursionlimit() * 5
 
     def step(x):
         return x
@@ -983,8 +1022,13 @@ def test_deep_chain_recursion_error_is_contextual():
         for i in range(1, depth)
     ]
     g = Graph({"calc": specs}, ["ext"])
-    with pytest.raises(RecursionError, match="recursion limit"):
-        compile_kernel(g, f"calc.n{depth - 1}")
+    ck = compile_kernel(g, f"calc.n{depth - 1}", cache=False)
+    assert ck.params == ["ext.x"]
+    assert ck.source.count("\n") == depth + 2        # def line, one line per node, return
+    compiled = g.compile(f"calc.n{depth - 1}")
+    external = {v for vs in compiled.required_external_variables.values() for v in vs.values()}
+    nodes = [n for n in compiled.ordered_nodes if n.variable not in external]
+    assert len(compute_boundary(nodes, external, {nodes[-1].variable})) == 1
 
 
 def test_compile_kernel_cache_save_side(tmp_path):
@@ -1931,3 +1975,187 @@ def test_recompute_graph_priority_over_co_changed_interior_override():
     ck.recompute({"ext": {"a": 2}, "vars_": {"b": 999}})
     assert ck._store[b] == 20
     assert ck._store[c] == 21
+
+
+def _session_recompute_sequence(session, req, ext, changes):
+    out = [tuple(session.execute(ext)[q] for q in req)]
+    for ch in changes:
+        out.append(tuple(session.recompute(ch)))
+    return out
+
+
+def test_sessions_keep_independent_state_and_share_cone_plans():
+    g = _diamond_graph()
+    req = ["variables.u"]
+    ck = compile_kernel(g, req)
+    s1, s2 = ck.session(), ck.session()
+    with pytest.raises(RuntimeError, match="Session.recompute requires a prior full call"):
+        s1.recompute({"basket": {"y": 1}})
+    ch1 = [{"basket": {"y": 101}}, {"basket": {"y": 102}}]
+    ch2 = [{"basket": {"y": 7}}, {"basket": {"y": 8}}]
+    assert s1.execute({"basket": {"y": 100}}) == {"variables.u": 326.5}
+    assert s2.execute({"basket": {"y": 5}}) == {"variables.u": -53.5}
+    assert tuple(s1.recompute(ch1[0])) == _interp_recompute_sequence(g, req, {"basket": {"y": 100}}, ch1[:1])[-1]
+    assert tuple(s2.recompute(ch2[0])) == _interp_recompute_sequence(g, req, {"basket": {"y": 5}}, ch2[:1])[-1]
+    assert len(ck._cone_cache) == 1                   # one cone, fused once, shared
+    assert ck._store is None and ck._last_args is None  # the kernel's own state is untouched
+    with pytest.raises(RuntimeError, match="requires a prior full call"):
+        ck.recompute({"basket": {"y": 1}})
+    # An interior override in one session leaves the other's plans and values alone.
+    s2.recompute({"variables": {"x": 5.0}})
+    assert len(ck._cone_cache) == 2
+    assert tuple(s1.recompute(ch1[1])) == _interp_recompute_sequence(g, req, {"basket": {"y": 100}}, ch1)[-1]
+    assert len(ck._cone_cache) == 2
+
+
+def test_session_full_call_reseeds():
+    g = _chain_graph()
+    ck = compile_kernel(g, ["variables.p"])
+    session = ck.session()
+    session.kernel(10.0)
+    assert session.recompute({"basket": {"y": 11.0}}) == (21.0,)
+    session.kernel(1.0)                               # a new scenario: the store reseeds
+    assert session.recompute({}) == (1.0,)
+
+
+def test_session_segmented_matches_interpreted():
+    g = _chain_graph_with_python_middle()
+    req, ext = ["calc.n5"], {"ext": {"x": 1.0}}
+    changes = [{"ext": {"x": 2.0}}, {"calc": {"n2": 10.0}}, {"ext": {"x": 3.0}}]
+    ck = compile_kernel(g, req)
+    assert _session_recompute_sequence(ck.session(), req, ext, changes) == \
+        _interp_recompute_sequence(g, req, ext, changes)
+    assert ck.partition.mode == "segmented"
+    assert ck._store is None and ck._last_args is None
+
+
+def test_sessions_concurrent_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    g = _two_source_reconvergent_graph()
+    req = ["variables.r"]
+    ck = compile_kernel(g, req)
+    jobs = []
+    for k in range(8):
+        ext = {"basket": {"a": float(k), "b": 1.0}}
+        changes = [{"basket": {"a": float(k + i)}} if i % 2 else {"basket": {"b": float(i - k)}}
+                   for i in range(1, 30)]
+        jobs.append((ext, changes))
+
+    def run(job):
+        ext, changes = job
+        return _session_recompute_sequence(ck.session(), req, ext, changes)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, jobs))
+    for (ext, changes), got in zip(jobs, results):
+        assert got == _interp_recompute_sequence(g, req, ext, changes)
+    assert len(ck._cone_cache) == 2                   # a-cone and b-cone, each fused once
+
+
+def test_runtime_profile_times_segments_demoted_nodes_and_fused_calls():
+    from numbox.core.variable.timing import RuntimeProfile
+    ck = compile_kernel(_chain_graph_with_python_middle(), "calc.n5", cache=False)
+    ck.kernel(1.0)                                    # discovery call, not profiled
+    ck.profile = RuntimeProfile()
+    for x in (2.0, 3.0):
+        ck.kernel(x)
+    ck.session().kernel(4.0)
+    ck.recompute({"calc": {"n3": 1.0}})
+    rows = {(t.kind, t.name): (t.nodes, t.calls) for t in ck.profile.report()}
+    assert rows == {
+        ("jit", "calc.n1..calc.n2"): (2, 3),
+        ("python", "calc.n3"): (1, 3),
+        ("jit", "calc.n4..calc.n5"): (2, 4),          # + the recompute cone below the override
+    }
+    assert [t.name for t in ck.profile.report(kind="python")] == ["calc.n3"]
+    assert ck.profile.format(kind="python").splitlines()[1].split()[:2] == ["calc.n3", "python"]
+
+    fused = compile_kernel(_diamond_graph(), "variables.u", cache=False)
+    fused.profile = RuntimeProfile()
+    fused.kernel(100)
+    fused.kernel(101)
+    [t] = fused.profile.report()
+    assert (t.kind, t.name, t.nodes, t.calls) == ("fused", "fused", 4, 2)
+
+
+def _scenarios(**fields):
+    dtype = [(q, np.asarray(col).dtype) for q, col in fields.items()]
+    arr = np.empty(len(next(iter(fields.values()))), dtype=dtype)
+    for q, col in fields.items():
+        arr[q] = col
+    return arr
+
+
+def test_batch_source_golden():
+    from numbox.core.variable.compile_kernel import _assemble_batch_source
+    source = _assemble_batch_source(
+        [("basket", "y", "basket_y")],
+        ["    variables_x = f_variables_x(basket_y)  # 'variables.x' = f('basket.y')"],
+        ["variables_x", "basket_y"],
+    )
+    assert source == (
+        "def _kernel(_n, _c_basket_y, _o0, _o1):\n"
+        "    for _i in range(_n):\n"
+        "        basket_y = _c_basket_y[_i]\n"
+        "        variables_x = f_variables_x(basket_y)  # 'variables.x' = f('basket.y')\n"
+        "        _o0[_i] = variables_x\n"
+        "        _o1[_i] = basket_y\n"
+    )
+    parallel = _assemble_batch_source([("basket", "y", "basket_y")], [], ["basket_y"], parallel=True)
+    assert "    for _i in prange(_n):\n" in parallel
+
+
+def test_execute_batch_fused_matches_kernel():
+    g = _diamond_graph()
+    ck = compile_kernel(g, ["variables.u", "variables.a"], cache=False)
+    ys = np.arange(6, dtype=np.float64)
+    out = ck.execute_batch(_scenarios(**{"basket.y": ys}))
+    assert ck.partition.mode == "fused"
+    assert out.dtype.names == ("variables.u", "variables.a")
+    for y, row in zip(ys, out):
+        assert tuple(row) == ck.kernel(y)
+
+
+def test_kernel_batch_segmented_matches_kernel():
+    g = _chain_graph_with_python_middle()
+    ck = compile_kernel(g, "calc.n5", cache=False)
+    xs = np.linspace(-2.0, 2.0, 7)
+    (n5,) = ck.kernel_batch(xs)
+    assert ck.partition.mode == "segmented"
+    assert n5.tolist() == [ck.kernel(x)[0] for x in xs]
+    batch_plan = ck._ensure_batch_plan()
+    assert [type(s).__name__ for s in batch_plan.steps] == ["_JitStep", "_PyStep", "_JitStep"]
+
+
+def test_execute_batch_validates_inputs():
+    g = _diamond_graph()
+    ck = compile_kernel(g, ["variables.u"], cache=False)
+    with pytest.raises(KeyError, match="basket.y"):
+        ck.execute_batch(_scenarios(**{"basket.z": np.zeros(2)}))
+    empty = _scenarios(**{"basket.y": np.zeros(0)})
+    with pytest.raises(ValueError, match="out_dtype"):
+        ck.execute_batch(empty)
+    assert ck.execute_batch(empty, out_dtype=[("variables.u", "f8")]).shape == (0,)
+    with pytest.raises(ValueError, match="equal length"):
+        ck.kernel_batch(np.zeros((2, 2)))
+
+
+def test_kernel_batch_parallel_matches_sequential():
+    from numba import get_num_threads
+    g = _diamond_graph()
+    ck = compile_kernel(g, ["variables.u", "variables.a"], cache=False)
+    ys = np.linspace(0.0, 10.0, 257)
+    expected = ck.kernel_batch(ys)
+    threads = get_num_threads()
+    got = ck.kernel_batch(ys, parallel=True, n_threads=1)
+    assert get_num_threads() == threads              # thread cap restored after the call
+    assert all(np.array_equal(e, o) for e, o in zip(expected, got))
+    assert set(ck._batch_fused) == {False, True}
+
+
+def test_execute_batch_parallel_segmented():
+    g = _chain_graph_with_python_middle()
+    ck = compile_kernel(g, "calc.n5", cache=False)
+    xs = np.linspace(-2.0, 2.0, 33)
+    out = ck.execute_batch(_scenarios(**{"ext.x": xs}), parallel=True)
+    assert out["calc.n5"].tolist() == [ck.kernel(x)[0] for x in xs]
@@ -464,3 +464,55 @@ def test_validated_returns_memo_keys_on_flags():
     finally:
         _validated_returns.clear()
         _validated_returns.update(saved)
+
+
+# A warm worker restart must reuse the persisted recompute plans
+# ---------------------------------------------------------------------------
+
+def test_recompute_plans_persist_across_processes(tmp_path):
+    """Cone plans and the store-seeding plan compile through the content-addressed
+    anchors, so once a restart has persisted them a further restart recomputes
+    with no JIT: no per-node formula is compiled and no cache file is written."""
+    probe = tmp_path / "recompute_probe.py"
+    probe.write_text(textwrap.dedent('''
+        from numba.core.dispatcher import Dispatcher
+        from numbox.core.variable.variable import Graph
+        from numbox.core.variable.compile_kernel import compile_kernel
+
+        def x(y):
+            return 2.0 * y
+
+        def a(x):
+            return x - 74.0
+
+        def b(x):
+            return x + 0.5
+
+        def u(a, b):
+            return a * b
+
+        g = Graph(
+            variables_lists={"variables": [
+                {"name": "x", "inputs": {"y": "basket"}, "formula": x},
+                {"name": "a", "inputs": {"x": "variables"}, "formula": a},
+                {"name": "b", "inputs": {"x": "variables"}, "formula": b},
+                {"name": "u", "inputs": {"a": "variables", "b": "variables"}, "formula": u},
+            ]},
+            external_source_names=["basket"],
+        )
+        ck = compile_kernel(g, "variables.u")
+        print(ck.execute({"basket": {"y": 100.0}})["variables.u"])
+        print(ck.recompute({"basket": {"y": 101.0}})[0])
+        print(ck.recompute({"variables": {"x": 5.0}})[0])
+        bindings = ck._ctx.bindings_by_var.values()
+        print(sum(len(d.overloads) for d in bindings if isinstance(d, Dispatcher)))
+    '''), encoding="utf-8")
+
+    env = _shared_cache_env(tmp_path)
+    cold = _run_probe(probe, env).splitlines()
+    _run_probe(probe, env)                              # first restart persists the seeding plan
+    files = {p: p.stat().st_mtime_ns for p in (tmp_path / "nbcache").rglob("*.nb[ci]")}
+    warm = _run_probe(probe, env).splitlines()
+    assert warm[:3] == cold[:3] == [str(126.0 * 200.5), str(128.0 * 202.5), str(-69.0 * 5.5)]
+    assert warm[3] == "0", "a warm restart JIT-compiled per-node formulas"
+    assert {p: p.stat().st_mtime_ns for p in (tmp_path / "nbcache").rglob("*.nb[ci]")} == files
@@ -0,0 +1,109 @@
+"""BlobReader / BlobWriter tests: typed reads and writes straight into numpy
+buffers, chunked offsets and handle reuse across rows."""
+from ctypes import addressof, c_int64
+
+import numpy as np
+import pytest
+from numba import njit
+
+from numbox.core.bindings.sqlite.blob_io import BlobReader, BlobWriter
+from numbox.core.bindings.sqlite.conn import sqlite3_close, sqlite3_open
+from numbox.core.bindings.sqlite.constants import SQLITE_ABORT, SQLITE_ERROR, SQLITE_MISUSE, SQLITE_OK
+from numbox.utils.cstrings import c_string
+
+
+_ROWS = np.arange(1, 9)
+_FEATURES = np.random.default_rng(0).random((len(_ROWS), 16))
+
+
+@pytest.fixture
+def features_db(tmp_path):
+    """File-backed db with t(id INTEGER PRIMARY KEY, v BLOB) holding the
+    float64 row ``_FEATURES[i]`` at rowid ``_ROWS[i]``, plus a NULL at 100."""
+    import sqlite3 as stdlib_sqlite3
+    db_file = tmp_path / "features.sqlite"
+    conn = stdlib_sqlite3.connect(str(db_file))
+    conn.execute("CREATE TABLE t(id INTEGER PRIMARY KEY, v BLOB)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", [(int(r), f.tobytes()) for r, f in zip(_ROWS, _FEATURES)])
+    conn.execute("INSERT INTO t VALUES (100, NULL)")
+    conn.commit()
+    conn.close()
+    db_p = c_int64(0)
+    with c_string(str(db_file)) as name_p:
+        assert sqlite3_open(name_p, addressof(db_p)) == SQLITE_OK
+    yield db_p.value
+    sqlite3_close(db_p.value)
+
+
+def test_reader_reads_typed_view_and_chunks(features_db):
+    with BlobReader(features_db, "t", "v", 3) as reader:
+        assert reader.rowid == 3
+        assert reader.nbytes == _FEATURES[2].nbytes
+        out = np.empty(16)
+        assert reader.read_into(out) == SQLITE_OK
+        np.testing.assert_array_equal(out, _FEATURES[2])
+        chunk = np.empty(5)
+        got = []
+        for start in range(0, 16, 5):
+            k = min(5, 16 - start)
+            assert reader.read_into(chunk[:k], start * 8) == SQLITE_OK
+            got.append(chunk[:k].copy())
+        np.testing.assert_array_equal(np.concatenate(got), _FEATURES[2])
+        assert reader.read_into(np.empty(17)) == SQLITE_ERROR
+        with pytest.raises(ValueError, match="C-contiguous"):
+            reader.read_into(np.empty((4, 4), order="F"))
+
+
+def test_reader_reopen_and_read_rows(features_db):
+    reader = BlobReader(features_db, "t", "v", 1)
+    out = np.empty((len(_ROWS), 16))
+    assert reader.read_rows(_ROWS[::-1], out) == SQLITE_OK
+    np.testing.assert_array_equal(out, _FEATURES[::-1])
+    assert reader.rowid == _ROWS[0]
+    assert reader.reopen(100) == SQLITE_ERROR
+    assert reader.read_into(np.empty(16)) == SQLITE_ABORT
+    assert reader.close() == SQLITE_OK
+    assert reader.close() == SQLITE_OK
+    assert reader.read_into(np.empty(16)) == SQLITE_MISUSE
+
+
+def test_writer_from_njit_round_trips(features_db):
+    @njit
+    def _overwrite(db, rowids, src):
+        writer = BlobWriter(db, "t", "v", rowids[0])
+        rc = writer.write_rows(rowids, src)
+        writer.close()
+        reader = BlobReader(db, "t", "v", rowids[0])
+        out = np.empty_like(src)
+        rc2 = reader.read_rows(rowids, out)
+        reader.close()
+        return rc, rc2, out
+
+    rowids = _ROWS[2:5]
+    rc, rc2, out = _overwrite(features_db, rowids, -_FEATURES[2:5])
+    assert rc == SQLITE_OK and rc2 == SQLITE_OK
+    np.testing.assert_array_equal(out, -_FEATURES[2:5])
+    with BlobWriter(features_db, "t", "v", 1) as writer:
+        assert writer.write_from(np.full(2, 7.0), 8) == SQLITE_OK
+        assert writer.write_from(np.empty(16), 8) == SQLITE_ERROR  # cannot grow the BLOB
+    with BlobReader(features_db, "t", "v", 1) as reader:
+        head = np.empty(4)
+        assert reader.read_into(head) == SQLITE_OK
+    np.testing.assert_array_equal(head, [_FEATURES[0, 0], 7.0, 7.0, _FEATURES[0, 3]])
+
+
+def test_open_failure_raises(features_db):
+    with pytest.raises(RuntimeError, match="no such column"):
+        BlobReader(features_db, "t", "nope", 1)
+
+    @njit
+    def _open_bad(db):
+        BlobWriter(db, "t", "v", 100)
+
+    with pytest.raises(RuntimeError, match="sqlite3_blob_open failed"):
+        _open_bad(features_db)
+
+
+if __name__ == "__main__":
+    from test.auxiliary_utils import collect_and_run_tests
+    collect_and_run_tests(__name__)
@@ -8,9 +8,10 @@ from numbox.core.bindings.sqlite.constants import (
 )
 from numbox.core.bindings.sqlite.conn import (
     sqlite3_changes64, sqlite3_close, sqlite3_db_filename, sqlite3_db_readonly, sqlite3_errcode,
-    sqlite3_errmsg, sqlite3_extended_errcode, sqlite3_libversion, sqlite3_libversion_number,
+    sqlite3_errmsg, sqlite3_get_autocommit, sqlite3_extended_errcode, sqlite3_libversion, sqlite3_libversion_number,
     sqlite3_open, sqlite3_open_v2, sqlite3_threadsafe, sqlite3_total_changes64,
 )
+from numbox.core.bindings.sqlite.exec import sqlite3_exec
 from numbox.utils.cstrings import c_string
 from numbox.utils.lowlevel import get_str_from_p_as_int
 from test.auxiliary_utils import collect_and_run_tests, str_from_p_as_int
@@ -94,6 +95,18 @@ def test_db_readonly_zero_for_writable(tmp_path):
     sqlite3_close(db_p.value)
 
 
+def test_get_autocommit_is_zero_inside_a_transaction():
+    db_p = _open_memory()
+    assert sqlite3_get_autocommit(db_p) != 0
+    with c_string("BEGIN") as sql_p:
+        assert sqlite3_exec(db_p, sql_p, 0, 0, 0) == SQLITE_OK
+    assert sqlite3_get_autocommit(db_p) == 0
+    with c_string("COMMIT") as sql_p:
+        assert sqlite3_exec(db_p, sql_p, 0, 0, 0) == SQLITE_OK
+    assert sqlite3_get_autocommit(db_p) != 0
+    sqlite3_close(db_p)
+
+
 def test_threadsafe_returns_nonzero():
     # Modern SQLite is always built with at least multi-thread (1) or
     # serialized (2) mode. Single-thread (0) is essentially extinct.
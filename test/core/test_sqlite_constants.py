@@ -13,5 +13,10 @@ def test_index_constraint_ops():
             SQLITE_INDEX_CONSTRAINT_ISNULL, SQLITE_INDEX_CONSTRAINT_IS) == (2, 4, 8, 16, 32, 68, 71, 72)
 
 
+def test_index_scan_flags():
+    from numbox.core.bindings.sqlite.constants import SQLITE_INDEX_SCAN_UNIQUE
+    assert SQLITE_INDEX_SCAN_UNIQUE == 1
+
+
 if __name__ == "__main__":
     collect_and_run_tests(__name__)
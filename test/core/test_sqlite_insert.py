@@ -0,0 +1,104 @@
+from ctypes import addressof, c_int64
+
+import numpy as np
+import pytest
+from numba import njit
+from numba.core.errors import TypingError
+
+from numbox.core.bindings.sqlite.conn import sqlite3_close, sqlite3_get_autocommit, sqlite3_open
+from numbox.core.bindings.sqlite.constants import SQLITE_CONSTRAINT, SQLITE_ERROR, SQLITE_OK
+from numbox.core.bindings.sqlite.exec import sqlite3_exec
+from numbox.core.bindings.sqlite.insert import insert_array
+from numbox.core.bindings.sqlite.query import query_to_array
+from numbox.utils.cstrings import c_string
+
+
+def _open_mem():
+    db = c_int64(0)
+    with c_string(":memory:") as p:
+        assert sqlite3_open(p, addressof(db)) == 0
+    return db.value
+
+
+def _exec(db, sql):
+    with c_string(sql) as p:
+        assert sqlite3_exec(db, p, 0, 0, 0) == 0
+
+
+def _select(db, sql, dtype):
+    with c_string(sql) as p:
+        return query_to_array(db, p, np.dtype(dtype))
+
+
+def test_insert_array_roundtrips_through_query_to_array():
+    db = _open_mem()
+    _exec(db, 'CREATE TABLE "odd ""name"" t"(a, b, c, d, e, f, g, h)')
+    dt = np.dtype([("a", "i1"), ("b", "u4"), ("c", "i8"), ("d", "?"), ("e", "f4"), ("f", "f8"),
+                   ("g", "S4"), ("h", "U4")], align=False)
+    arr = np.zeros(50, dt)
+    arr["a"] = np.arange(50) - 25
+    arr["b"] = np.arange(50) * 1000
+    arr["c"] = -(2 ** 62) + np.arange(50)
+    arr["d"] = np.arange(50) % 2 == 0
+    arr["e"] = np.arange(50) * 0.25
+    arr["f"] = np.where(np.arange(50) % 7 == 0, np.nan, np.arange(50) / 3)
+    arr["g"] = [b"", b"ab", b"abcd"] * 16 + [b"x", b"y"]
+    arr["h"] = ["", "hé", "日本語", "\U0001F600abc", "abcd"] * 10
+    assert insert_array(db, 'odd "name" t', arr) == SQLITE_OK
+    back = _select(db, 'SELECT * FROM "odd ""name"" t" ORDER BY rowid', dt)
+    for name in ("a", "b", "c", "d", "e", "g", "h"):
+        assert back[name].tolist() == arr[name].tolist(), name
+    np.testing.assert_array_equal(back["f"], arr["f"])  # NaN binds as REAL NaN -> NULL -> NaN
+    assert _select(db, 'SELECT typeof(h) FROM "odd ""name"" t" LIMIT 1', [("t", "S8")])["t"][0] == b"text"
+    assert insert_array(db, 'odd "name" t', arr[::-5]) == SQLITE_OK  # a strided view
+    assert _select(db, 'SELECT c FROM "odd ""name"" t" WHERE rowid > 50', [("c", "i8")])["c"].tolist() \
+        == arr["c"][::-5].tolist()
+    sqlite3_close(db)
+
+
+def test_insert_array_is_one_transaction_rolled_back_on_failure():
+    db = _open_mem()
+    _exec(db, "CREATE TABLE t(k INTEGER PRIMARY KEY, x REAL)")
+    arr = np.zeros(10, [("k", "i8"), ("x", "f8")])
+    arr["k"] = [0, 1, 2, 3, 4, 5, 6, 7, 8, 3]  # the last row violates the key
+    assert insert_array(db, "t", arr) == SQLITE_CONSTRAINT
+    assert sqlite3_get_autocommit(db) != 0
+    assert len(_select(db, "SELECT k FROM t", [("k", "i8")])) == 0
+    assert insert_array(db, "missing", arr) == SQLITE_ERROR
+    _exec(db, "BEGIN")  # inside the caller's transaction: joined, and left open
+    assert insert_array(db, "t", arr[:5]) == SQLITE_OK
+    assert sqlite3_get_autocommit(db) == 0
+    _exec(db, "ROLLBACK")
+    assert len(_select(db, "SELECT k FROM t", [("k", "i8")])) == 0
+    sqlite3_close(db)
+
+
+@njit
+def _insert_in_batches(db, arr, batch):
+    for start in range(0, len(arr), batch):
+        rc = insert_array(db, "t", arr[start:start + batch])
+        if rc != SQLITE_OK:
+            return rc
+    return SQLITE_OK
+
+
+def test_insert_array_from_njit():
+    db = _open_mem()
+    _exec(db, "CREATE TABLE t(k INTEGER, s TEXT)")
+    arr = np.zeros(1000, [("k", "i8"), ("s", "U6")])
+    arr["k"] = np.arange(1000)
+    arr["s"] = np.char.add("r", arr["k"].astype("U4"))
+    assert _insert_in_batches(db, arr, 128) == SQLITE_OK
+    back = _select(db, "SELECT k, s FROM t ORDER BY k", arr.dtype)
+    assert back.tolist() == arr.tolist()
+    sqlite3_close(db)
+
+
+def test_insert_array_rejects_unsupported_arrays():
+    db = _open_mem()
+    _exec(db, "CREATE TABLE t(k)")
+    with pytest.raises(TypingError, match="unsupported column dtype"):
+        insert_array(db, "t", np.zeros(2, [("k", "M8[s]")]))
+    with pytest.raises(TypingError, match="1-D structured array"):
+        insert_array(db, "t", np.zeros(2, np.int64))
+    sqlite3_close(db)
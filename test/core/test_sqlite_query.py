@@ -2,9 +2,11 @@ from ctypes import addressof, c_int64
 
 import pytest
 import numpy as np
+from numba import njit
 from numbox.core.bindings.sqlite._typemap import utf8_to_utf32, utf32_to_utf8
 from numbox.core.bindings.sqlite.conn import sqlite3_open, sqlite3_close
-from numbox.core.bindings.sqlite.query import query_to_array
+from numbox.core.bindings.sqlite.constants import SQLITE_DONE, SQLITE_OK
+from numbox.core.bindings.sqlite.query import query_to_array, run_prepared
 from numbox.core.bindings.sqlite.exec import sqlite3_exec
 from numbox.utils.cstrings import c_string
 from numbox.utils.lowlevel import array_data_p
@@ -281,3 +283,275 @@ def test_query_empty_text_and_blob():
     assert out.shape == (1,)
     assert out["s"][0] == b"" and out["b"][0] == b"" and out["u"][0] == ""
     sqlite3_close(db)
+
+
+def _numbers_table(db, n):
+    _exec(db, "CREATE TABLE t(i INTEGER, x REAL, s TEXT)")
+    _exec(db, "WITH RECURSIVE c(n) AS (SELECT 1 UNION ALL SELECT n+1 FROM c WHERE n<%d) "
+              "INSERT INTO t SELECT n, CASE WHEN n %% 3 = 0 THEN NULL ELSE n * 0.5 END, 'r' || n FROM c" % n)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 100, 1000])
+def test_query_iter_arrays_matches_query_to_array(chunk_rows):
+    from numbox.core.bindings.sqlite.query import query_iter_arrays
+    db = _open_mem()
+    _numbers_table(db, 100)
+    dt = np.dtype([("i", "i8"), ("x", "f8"), ("s", "U5")])
+    with c_string("SELECT i, x, s FROM t ORDER BY i") as sql:
+        whole = query_to_array(db, sql, dt)
+        chunks = list(query_iter_arrays(db, sql, dt, chunk_rows))
+    assert [len(c) for c in chunks[:-1]] == [chunk_rows] * (len(chunks) - 1)
+    assert 0 < len(chunks[-1]) <= chunk_rows
+    joined = np.concatenate(chunks)
+    assert joined["i"].tolist() == whole["i"].tolist() and joined["s"].tolist() == whole["s"].tolist()
+    np.testing.assert_array_equal(joined["x"], whole["x"])
+    sqlite3_close(db)
+
+
+def test_query_iter_arrays_reuses_out_buffer():
+    from numbox.core.bindings.sqlite.query import query_iter_arrays
+    db = _open_mem()
+    _numbers_table(db, 10)
+    dt = np.dtype([("i", "i8"), ("x", "f8")])
+    out = np.empty(4, dt)
+    seen = []
+    with c_string("SELECT i, x FROM t ORDER BY i") as sql:
+        for chunk in query_iter_arrays(db, sql, dt, 4, out=out):
+            assert np.shares_memory(chunk, out)
+            seen.append((chunk["i"].tolist(), int(np.isnan(chunk["x"]).sum())))
+    assert seen == [([1, 2, 3, 4], 1), ([5, 6, 7, 8], 1), ([9, 10], 1)]
+    with c_string("SELECT i, x FROM t") as sql:
+        with pytest.raises(ValueError, match="at least 5 rows"):
+            query_iter_arrays(db, sql, dt, 5, out=out)
+    sqlite3_close(db)
+
+
+def test_query_iter_arrays_errors_and_early_close():
+    from numbox.core.bindings.sqlite.query import query_iter_arrays
+    db = _open_mem()
+    _numbers_table(db, 50)
+    dt = np.dtype([("i", "i8")])
+    with c_string("SELECT FROM") as sql:
+        with pytest.raises(RuntimeError, match="query_iter_arrays failed"):
+            query_iter_arrays(db, sql, dt, 8)
+    with c_string("SELECT i FROM t ORDER BY i") as sql:
+        it = query_iter_arrays(db, sql, dt, 8)
+    assert next(it)["i"].tolist() == list(range(1, 9))  # sql text already consumed by prepare
+    it.close()  # finalizes the open statement, so the table can be dropped
+    _exec(db, "DROP TABLE t")
+    sqlite3_close(db)
+
+
+def test_query_iter_arrays_finalizes_before_first_chunk():
+    from numbox.core.bindings.sqlite.query import query_iter_arrays
+    db = _open_mem()
+    _numbers_table(db, 5)
+    dt = np.dtype([("i", "i8")])
+    with c_string("SELECT i FROM t") as sql:
+        it = query_iter_arrays(db, sql, dt, 2)
+        it.close()
+        assert next(it, None) is None
+        dropped = query_iter_arrays(db, sql, dt, 2)
+    del dropped  # never started: collection finalizes the statement too
+    assert sqlite3_close(db) == SQLITE_OK
+
+
+_PQ_DT = np.dtype([("i", "i8"), ("x", "f8"), ("s", "U5")])
+
+
+def test_prepared_query_rebinds_tuple_and_record():
+    from numbox.core.bindings.sqlite.query import PreparedQuery, close_statement_cache
+    db = _open_mem()
+    _numbers_table(db, 20)
+    sql = "SELECT i, x, s FROM t WHERE i >= ? AND i < ? AND s != ? ORDER BY i"
+    with PreparedQuery(db, sql, _PQ_DT) as q:
+        assert q((3, 6, "r4"))["i"].tolist() == [3, 5]
+        assert q((10, 12.0, "rx"))["s"].tolist() == ["r10", "r11"]  # a float binds as REAL
+        assert len(q((1, None, ""))) == 0  # None binds as NULL
+        params = np.array([(2, 4.0, "r3", b"r2")], dtype=[("lo", "i4"), ("hi", "f8"), ("u", "U3"), ("b", "S3")])
+        assert q(params[0][["lo", "hi", "u"]])["i"].tolist() == [2]
+        with PreparedQuery(db, "SELECT i, x, s FROM t WHERE s = ? OR s = ? ORDER BY i", _PQ_DT) as q2:
+            assert q2(params[0][["u", "b"]])["i"].tolist() == [2, 3]
+    with PreparedQuery(db, "SELECT length(?), ?, ?", _PQ_DT) as q:
+        assert q(("héllo", 0.5, "héllo")).tolist() == [(5, 0.5, "héllo")]  # non-ASCII text is UTF-8
+    close_statement_cache(db)
+    assert sqlite3_close(db) == 0
+
+
+def test_prepared_query_reuses_cached_statement():
+    from numbox.core.bindings.sqlite.query import PreparedQuery, close_statement_cache, statement_cache
+    db = _open_mem()
+    _numbers_table(db, 5)
+    sql = "SELECT i, x, s FROM t WHERE i = ?"
+    cache = statement_cache(db)
+    with PreparedQuery(db, sql, _PQ_DT) as q:
+        assert q((2,))["i"].tolist() == [2]
+        with PreparedQuery(db, sql, _PQ_DT) as busy:  # q's statement is checked out: a second one
+            assert busy.stmt != q.stmt
+            stmt = busy.stmt  # checked in first; q's duplicate is then finalized
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 1)
+    for k in range(1, 6):
+        with PreparedQuery(db, sql, _PQ_DT) as q:
+            assert q.stmt == stmt and q((k,))["i"].tolist() == [k]
+    assert (cache.hits, cache.misses, len(cache)) == (5, 2, 1)
+    close_statement_cache(db)
+    assert sqlite3_close(db) == 0
+
+
+def test_statement_cache_is_a_bounded_lru():
+    from numbox.core.bindings.sqlite.query import PreparedQuery, close_statement_cache, statement_cache
+    db = _open_mem()
+    _numbers_table(db, 5)
+    cache = statement_cache(db, capacity=2)
+    sqls = ["SELECT i, x, s FROM t WHERE i = %d + ?" % k for k in range(3)]
+    for sql in sqls:
+        PreparedQuery(db, sql, _PQ_DT).close()
+    assert len(cache) == 2 and cache.misses == 3
+    PreparedQuery(db, sqls[1], _PQ_DT).close()  # hit; sqls[2] is now the least recently used
+    PreparedQuery(db, sqls[0], _PQ_DT).close()  # evicted earlier: a miss, which evicts sqls[2]
+    assert (cache.hits, cache.misses) == (1, 4)
+    PreparedQuery(db, sqls[2], _PQ_DT).close()
+    assert (cache.hits, cache.misses, len(cache)) == (1, 5, 2)
+    cache.resize(0)
+    assert len(cache) == 0
+    close_statement_cache(db)
+    assert sqlite3_close(db) == 0
+
+
+@njit
+def _prepared_lookups(handle, keys):
+    total = 0.0
+    for k in keys:
+        buf, rc = run_prepared(handle, (k,))
+        if rc != SQLITE_DONE:
+            return -1.0
+        rows = buf.view(_PQ_DT)
+        for r in range(len(rows)):
+            total += rows[r].x
+    return total
+
+
+def test_prepared_query_runs_from_njit():
+    from numbox.core.bindings.sqlite.query import PreparedQuery, close_statement_cache
+    db = _open_mem()
+    _numbers_table(db, 30)
+    keys = np.array([1, 2, 4, 4, 30, 99], dtype=np.int64)  # 99 matches no row
+    with PreparedQuery(db, "SELECT i, x, s FROM t WHERE i = ? AND x IS NOT NULL", _PQ_DT) as q:
+        assert _prepared_lookups(q.handle, keys) == 0.5 + 1.0 + 2.0 + 2.0
+    close_statement_cache(db)
+    assert sqlite3_close(db) == 0
+
+
+def test_prepared_query_errors():
+    from numbox.core.bindings.sqlite.query import PreparedQuery, close_statement_cache
+    db = _open_mem()
+    _numbers_table(db, 5)
+    with pytest.raises(ValueError, match="3 fields but query returns 1"):
+        PreparedQuery(db, "SELECT i FROM t", _PQ_DT)
+    with pytest.raises(RuntimeError, match="PreparedQuery failed"):
+        PreparedQuery(db, "SELECT FROM", _PQ_DT)
+    q = PreparedQuery(db, "SELECT i, x, s FROM t WHERE i = ?", _PQ_DT)
+    with pytest.raises(RuntimeError, match="rc=25"):  # SQLITE_RANGE: more params than placeholders
+        q((1, 2))
+    q.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        q((1,))
+    close_statement_cache(db)
+    assert sqlite3_close(db) == 0
+
+
+@pytest.mark.parametrize("nrows", [1, 16, 17, 300])
+def test_query_to_columns_matches_query_to_array(nrows):
+    from numbox.core.bindings.sqlite.query import query_to_columns
+    db = _open_mem()
+    _numbers_table(db, nrows)
+    dt = np.dtype([("i", "i4"), ("x", "f4"), ("s", "U3"), ("b", "S2"), ("odd", "?"), ("u", "u1")])
+    with c_string("SELECT i, x, s, s, i % 2, i FROM t ORDER BY i") as sql:
+        rows = query_to_array(db, sql, dt)
+        cols = query_to_columns(db, sql, {name: dt.fields[name][0] for name in dt.names})
+    assert list(cols) == list(dt.names)
+    for name in dt.names:
+        assert cols[name].dtype == dt.fields[name][0] and cols[name].flags.c_contiguous
+        np.testing.assert_array_equal(cols[name], rows[name])
+    sqlite3_close(db)
+
+
+def test_query_to_columns_nulls_and_errors():
+    from numbox.core.bindings.sqlite.query import query_to_columns
+    db = _open_mem()
+    _exec(db, "CREATE TABLE t(i INTEGER, x REAL, s TEXT)")
+    _exec(db, "INSERT INTO t VALUES (NULL, NULL, NULL), (2, 2.5, 'hé')")
+    with c_string("SELECT i, x, s, i FROM t ORDER BY rowid") as sql:
+        cols = query_to_columns(db, sql, {"i": np.int64, "x": np.float64, "s": "U2", "ok": np.bool_})
+        with pytest.raises(ValueError, match="3 fields but query returns 4"):
+            query_to_columns(db, sql, {"i": "i8", "x": "f8", "s": "U2"})
+        with pytest.raises(TypeError, match="unsupported column dtype"):
+            query_to_columns(db, sql, {"i": "i8", "x": "f8", "s": "U2", "t": "M8[s]"})
+    assert cols["i"].tolist() == [0, 2] and cols["s"].tolist() == ["", "hé"] and cols["ok"].tolist() == [False, True]
+    assert np.isnan(cols["x"][0]) and cols["x"][1] == 2.5
+    with c_string("SELECT i FROM t WHERE i > abs(-9223372036854775808)") as sql:  # overflow at step
+        with pytest.raises(RuntimeError, match="query_to_columns failed"):
+            query_to_columns(db, sql, {"i": "i8"})
+    sqlite3_close(db)
+
+
+def _numbers_file(tmp_path, n):
+    path = str(tmp_path / "numbers.sqlite")
+    db = c_int64(0)
+    with c_string(path) as p:
+        assert sqlite3_open(p, addressof(db)) == 0
+    _numbers_table(db.value, n)
+    _exec(db.value, "DELETE FROM t WHERE i % 10 = 4")  # leave holes in the rowid span
+    sqlite3_close(db.value)
+    return path
+
+
+def test_rowid_shards_split_the_rowid_span(tmp_path):
+    from numbox.core.bindings.sqlite.query import rowid_shards
+    path = _numbers_file(tmp_path, 100)
+    assert rowid_shards(path, "t", 4) == [(1, 26), (26, 51), (51, 76), (76, 101)]
+    assert rowid_shards(path, "t", 3) == [(1, 35), (35, 69), (69, 101)]
+    assert len(rowid_shards(path, "t", 500)) == 100
+    db = c_int64(0)
+    with c_string(path) as p:
+        assert sqlite3_open(p, addressof(db)) == 0
+    _exec(db.value, "DELETE FROM t")
+    sqlite3_close(db.value)
+    assert rowid_shards(path, "t", 4) == []
+    with pytest.raises(ValueError, match="shards must be positive"):
+        rowid_shards(path, "t", 0)
+
+
+@pytest.mark.parametrize("nshards", [1, 3, 8])
+def test_parallel_query_to_array_matches_query_to_array(tmp_path, nshards):
+    from numbox.core.bindings.sqlite.query import _shard_core, parallel_query_to_array, rowid_shards
+    path = _numbers_file(tmp_path, 1000)
+    dt = np.dtype([("i", "i8"), ("x", "f8"), ("s", "U5")])
+    shards = rowid_shards(path, "t", nshards) + [(5000, 6000)]  # an empty trailing shard
+    sql = "SELECT i, x, s FROM t WHERE rowid >= ?1 AND rowid < ?2 ORDER BY rowid"
+    out = parallel_query_to_array(path, sql, shards, dt, max_workers=4)
+    db = c_int64(0)
+    with c_string(path) as p:
+        assert sqlite3_open(p, addressof(db)) == 0
+    with c_string("SELECT i, x, s FROM t ORDER BY rowid") as p:
+        whole = query_to_array(db.value, p, dt)
+    sqlite3_close(db.value)
+    assert len(out) == 900
+    assert out["i"].tolist() == whole["i"].tolist() and out["s"].tolist() == whole["s"].tolist()
+    np.testing.assert_array_equal(out["x"], whole["x"])
+    assert parallel_query_to_array(path, sql, [], dt).dtype == dt
+    assert _shard_core.targetoptions["nogil"]
+
+
+def test_parallel_query_to_array_errors(tmp_path):
+    from numbox.core.bindings.sqlite.query import parallel_query_to_array
+    path = _numbers_file(tmp_path, 10)
+    dt = np.dtype([("i", "i8")])
+    with pytest.raises(RuntimeError, match="sqlite3_open_v2"):
+        parallel_query_to_array(str(tmp_path / "missing.sqlite"), "SELECT i FROM t", [(0, 10)], dt)
+    with pytest.raises(RuntimeError, match="no such table"):
+        parallel_query_to_array(path, "SELECT i FROM nope WHERE rowid >= ?1 AND rowid < ?2", [(0, 10)], dt)
+    with pytest.raises(RuntimeError, match="rc=25"):  # SQLITE_RANGE: no ?2 to bind
+        parallel_query_to_array(path, "SELECT i FROM t WHERE rowid >= ?1", [(0, 10)], dt)
+    with pytest.raises(ValueError, match="returns 2 columns"):
+        parallel_query_to_array(path, "SELECT i, x FROM t WHERE rowid >= ?1 AND rowid < ?2", [(0, 10)], dt)
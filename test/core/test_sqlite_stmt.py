@@ -1,10 +1,12 @@
 """Statement-lifecycle binding tests for the SQLite buildout."""
 from ctypes import addressof, c_int64
 
+from numbox.core.bindings.sqlite.bind import sqlite3_bind_int64
+from numbox.core.bindings.sqlite.column import sqlite3_column_int64
 from numbox.core.bindings.sqlite.constants import SQLITE_DONE, SQLITE_OK, SQLITE_ROW
 from numbox.core.bindings.sqlite.conn import sqlite3_db_handle
 from numbox.core.bindings.sqlite.stmt import (
-    sqlite3_expanded_sql, sqlite3_finalize, sqlite3_prepare_v2, sqlite3_reset, sqlite3_sql,
+    sqlite3_clear_bindings, sqlite3_expanded_sql, sqlite3_finalize, sqlite3_prepare_v2, sqlite3_reset, sqlite3_sql,
     sqlite3_step, sqlite3_stmt_busy,
 )
 from numbox.core.bindings.sqlite.exec import sqlite3_free
@@ -62,6 +64,18 @@ def test_stmt_busy_is_nonzero_mid_iteration(memory_db):
     sqlite3_finalize(stmt_p)
 
 
+def test_clear_bindings_resets_parameters_to_null(memory_db):
+    stmt_p = _prepare(memory_db, "SELECT ?1 IS NULL")
+    assert sqlite3_bind_int64(stmt_p, 1, 7) == SQLITE_OK
+    assert sqlite3_step(stmt_p) == SQLITE_ROW
+    assert sqlite3_column_int64(stmt_p, 0) == 0
+    sqlite3_reset(stmt_p)
+    assert sqlite3_clear_bindings(stmt_p) == SQLITE_OK
+    assert sqlite3_step(stmt_p) == SQLITE_ROW
+    assert sqlite3_column_int64(stmt_p, 0) == 1
+    sqlite3_finalize(stmt_p)
+
+
 def test_prepare_invalid_sql_returns_error(memory_db):
     stmt_p = c_int64(0)
     tail_p = c_int64(0)
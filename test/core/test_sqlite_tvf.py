@@ -5,12 +5,13 @@ from ctypes import addressof, c_char_p, c_int64, cast
 import pytest
 import numpy as np
 from numba import njit
-from numba.core import config
+from numba.core import config, types
+from numba.experimental import structref
 
 from numbox.utils.cstrings import c_string
 from numbox.core.bindings.sqlite.conn import sqlite3_open, sqlite3_close
 from numbox.core.bindings.sqlite import tvf
-from numbox.core.bindings.sqlite.tvf import register_tvf
+from numbox.core.bindings.sqlite.tvf import register_tvf, register_tvf_stream
 from numbox.core.bindings.sqlite.stmt import sqlite3_prepare_v2, sqlite3_step, sqlite3_finalize
 from numbox.core.bindings.sqlite.column import (
     sqlite3_column_int64, sqlite3_column_double, sqlite3_column_text, sqlite3_column_type,
@@ -394,7 +395,8 @@ def _two_u_series(start, stop):
 
 def _outer_xfilter_overloads():
     """Cached overloads recorded for the outer, per-registration ``_tvf_xfilter``
-    cfunc, summed over every cache root numba may be writing to."""
+    (and streaming ``_tvf_xnext_stream``) cfuncs, summed over every cache root
+    numba may be writing to."""
     roots = [os.path.dirname(tvf.__file__)]
     if config.CACHE_DIR:
         roots.append(config.CACHE_DIR)
@@ -402,7 +404,8 @@ def _outer_xfilter_overloads():
     for root in roots:
         for dirpath, _dirnames, filenames in os.walk(root):
             for fn in filenames:
-                if not fn.startswith("tvf.register_tvf.locals._tvf_xfilter-"):
+                if not fn.startswith(("tvf._install_tvf.locals._tvf_xfilter-",
+                                      "tvf._install_tvf.locals._tvf_xnext_stream-")):
                     continue
                 if not fn.endswith(".nbi"):
                     continue
@@ -431,3 +434,109 @@ def test_tvf_outer_xfilter_does_not_grow_the_numba_cache():
     assert _outer_xfilter_overloads() == before
     sqlite3_close(db.value)
     del h
+
+
+@structref.register
+class _CounterStateClass(types.StructRef):
+    pass
+
+
+_CounterState = _CounterStateClass([("next", types.int64), ("stop", types.int64)])
+
+
+@njit
+def _counter_init(start, stop):
+    s = structref.new(_CounterState)
+    s.next = start
+    s.stop = stop
+    return s
+
+
+@njit
+def _counter_next(s, out):
+    k = 0
+    while k < len(out) and s.next < s.stop:
+        out[k].n = s.next
+        out[k].v = s.next * 0.5
+        s.next += 1
+        k += 1
+    return k
+
+
+@njit
+def _counter_next_raises(s, out):
+    if s.next > 0:
+        raise ValueError("producer failed")
+    s.next = 1
+    out[0].n = 0
+    out[0].v = 0.0
+    return 1
+
+
+def _register_counter(db, next_chunk=_counter_next, chunk_rows=4):
+    register_tvf_stream(
+        db.value, "counter", (np.int64, np.int64), _OUT2, _CounterState, _counter_init, next_chunk,
+        chunk_rows=chunk_rows)
+
+
+def test_tvf_stream_spans_chunks_with_continuous_rowids():
+    db = _open()
+    _register_counter(db)
+    rc, rows = _select_int(db, "SELECT rowid, n FROM counter(5, 15)", ncol=2)
+    assert rc == SQLITE_OK
+    assert rows == [(i, 5 + i) for i in range(10)]
+    rc, rows = _select_int(db, "SELECT count(*) FROM counter(3, 3)")
+    assert rows == [(0,)]
+    rc, rows = _select_int(db, "SELECT a.n, b.n FROM counter(0, 3) a, counter(10, 12) b", ncol=2)
+    assert rows == [(a, b) for a in range(3) for b in range(10, 12)]
+    sqlite3_close(db.value)
+
+
+def test_tvf_stream_limit_stops_the_producer():
+    # 10**15 rows could never be materialized; LIMIT must stop after one chunk
+    db = _open()
+    _register_counter(db, chunk_rows=256)
+    rc, rows = _select_int(db, "SELECT n FROM counter(0, 1000000000000000) LIMIT 3")
+    assert rc == SQLITE_OK
+    assert rows == [(0,), (1,), (2,)]
+    sqlite3_close(db.value)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_tvf_stream_producer_raises_yields_error():
+    db = _open()
+    _register_counter(db, next_chunk=_counter_next_raises, chunk_rows=1)
+    stmt = c_int64(0)
+    with c_string("SELECT n FROM counter(0, 10)") as p:
+        assert sqlite3_prepare_v2(db.value, p, -1, addressof(stmt), 0) == SQLITE_OK
+    assert sqlite3_step(stmt.value) == SQLITE_ROW
+    assert sqlite3_step(stmt.value) == SQLITE_ERROR
+    sqlite3_finalize(stmt.value)
+    sqlite3_close(db.value)
+
+
+def test_tvf_stream_no_meminfo_leak():
+    from numba.core.runtime import nrt
+    _nrt = nrt._nrt
+    if not hasattr(_nrt, "memsys_enable_stats"):
+        pytest.skip("NRT allocation stats unavailable")
+    _nrt.memsys_enable_stats()
+    db = _open()
+    _register_counter(db)
+    _select_int(db, "SELECT n FROM counter(0, 10)")
+    before = nrt.rtsys.get_allocation_stats()
+    for _ in range(10):
+        _select_int(db, "SELECT n FROM counter(0, 10)")
+        _select_int(db, "SELECT n FROM counter(0, 100) LIMIT 2")
+    after = nrt.rtsys.get_allocation_stats()
+    sqlite3_close(db.value)
+    assert after.mi_alloc - before.mi_alloc == after.mi_free - before.mi_free
+
+
+def test_tvf_stream_rejects_bad_arguments():
+    db = _open()
+    with pytest.raises(ValueError, match="chunk_rows"):
+        _register_counter(db, chunk_rows=0)
+    with pytest.raises(TypeError, match="state_type"):
+        register_tvf_stream(db.value, "bad", (np.int64,), _OUT2, _OUT2, _counter_init, _counter_next)
+    sqlite3_close(db.value)
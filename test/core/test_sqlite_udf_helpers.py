@@ -674,3 +674,74 @@ def test_init_exception_empty_group_surfaces_error():
     sqlite3_close(db)
     assert rc != SQLITE_OK
     assert "init callback" in msg
+
+
+# --- scalar functions ---
+def _select(db, sql, dtype):
+    from numbox.core.bindings.sqlite.query import query_to_array
+    with c_string(sql) as sp:
+        return query_to_array(db, sp, np.dtype(dtype))
+
+
+@njit
+def hypot2(x, y):
+    return np.sqrt(x * x + y * y)
+
+
+def test_scalar_typed_arguments_and_results():
+    from numbox.core.bindings.sqlite.udf_helpers import register_scalar
+    db = _open_memory()
+    _make_table(db, [1, 2, 3])
+    register_scalar(db, "hypot2", (types.float64, types.float64), types.float64, hypot2)
+    register_scalar(db, "shout", (types.unicode_type, types.int32), types.unicode_type,
+                    lambda s, n: s.upper() + "!" * n)
+    register_scalar(db, "is_big", (types.int64,), types.boolean, lambda v: v > 1)
+    register_scalar(db, "nchars", (types.unicode_type,), types.int64, lambda s: len(s))
+    out = _select(db, "SELECT hypot2(v, 2 * v), shout('héllo ' || v, v), is_big(v), nchars('日本' || v) FROM t",
+                  [("h", "f8"), ("s", "U10"), ("b", "i8"), ("n", "i8")])
+    assert np.allclose(out["h"], np.sqrt(5.0) * np.arange(1, 4))
+    assert out["s"].tolist() == ["HÉLLO 1!", "HÉLLO 2!!", "HÉLLO 3!!!"]
+    assert out["b"].tolist() == [0, 1, 1] and out["n"].tolist() == [3, 3, 3]
+    nulls = _select(db, "SELECT hypot2(NULL, 1) IS NULL, shout('a', NULL) IS NULL", [("a", "?"), ("b", "?")])
+    assert nulls.tolist() == [(True, True)]  # a NULL argument short-circuits to NULL
+    sqlite3_close(db)
+
+
+def test_scalar_exception_surfaces_error():
+    from numbox.core.bindings.sqlite.udf_helpers import register_scalar
+    import pytest
+    db = _open_memory()
+    _make_table(db, [1, 0])
+    register_scalar(db, "inv", (types.int64,), types.int64, lambda v: 10 // v)
+    with c_string("SELECT inv(v) FROM t") as sp:
+        rc = sqlite3_exec(db, sp, 0, 0, 0)
+    assert rc != SQLITE_OK and "error in user scalar function" in _errmsg(db)
+    with pytest.raises(TypeError, match="argument type"):
+        register_scalar(db, "bad", (types.int64[:],), types.int64, lambda a: 0)
+    with pytest.raises(TypeError, match="return type"):
+        register_scalar(db, "bad", (types.int64,), types.none, lambda a: None)
+    sqlite3_close(db)
+
+
+def test_scalar_deterministic_flag_ors_bit(monkeypatch):
+    from numbox.core.bindings.sqlite.udf_helpers import register_scalar
+    import numbox.core.bindings.sqlite.udf_helpers as helpers
+    real = helpers.sqlite3_create_function_v2
+    seen = []
+
+    def spy(db, name_p, n_arg, flags, *rest):
+        seen.append((n_arg, flags))
+        return real(db, name_p, n_arg, flags, *rest)
+
+    monkeypatch.setattr(helpers, "sqlite3_create_function_v2", spy)
+    db = _open_memory()
+    register_scalar(db, "hyp_det", (types.float64, types.float64), types.float64, hypot2, deterministic=True)
+    register_scalar(db, "hyp", (types.float64, types.float64), types.float64, hypot2)
+    # only a deterministic function may appear in an index expression
+    with c_string("CREATE TABLE p(x REAL, y REAL); CREATE INDEX p_h ON p(hyp_det(x, y))") as sp:
+        assert sqlite3_exec(db, sp, 0, 0, 0) == SQLITE_OK
+    with c_string("CREATE INDEX p_h2 ON p(hyp(x, y))") as sp:
+        assert sqlite3_exec(db, sp, 0, 0, 0) != SQLITE_OK
+    sqlite3_close(db)
+    assert seen[0][0] == 2 and seen[0][1] & helpers.SQLITE_DETERMINISTIC
+    assert not (seen[1][1] & helpers.SQLITE_DETERMINISTIC)
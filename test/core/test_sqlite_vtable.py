@@ -143,7 +143,7 @@ def test_widest_unicode_width_accepted():
 
 def test_descriptor_dtype_itemsize():
     from numbox.core.bindings.sqlite.vtable import _DESC_DTYPE
-    assert _DESC_DTYPE.itemsize == 64
+    assert _DESC_DTYPE.itemsize == 72
 
 
 def test_index_info_offsets_match_c_abi():
@@ -163,9 +163,13 @@ def test_index_info_offsets_match_c_abi():
             ("orderByConsumed", ctypes.c_int),
             ("estimatedCost", ctypes.c_double),
             ("estimatedRows", ctypes.c_longlong),
+            ("idxFlags", ctypes.c_int),
+            ("colUsed", ctypes.c_ulonglong),
         ]
     assert _IDX_INFO_DTYPE.fields["estimatedCost"][1] == _IndexInfo.estimatedCost.offset
     assert _IDX_INFO_DTYPE.fields["estimatedRows"][1] == _IndexInfo.estimatedRows.offset
+    assert _IDX_INFO_DTYPE.fields["idxFlags"][1] == _IndexInfo.idxFlags.offset
+    assert _IDX_INFO_DTYPE.fields["colUsed"][1] == _IndexInfo.colUsed.offset
 
 
 def test_xbestindex_sets_cardinality():
@@ -1195,3 +1199,183 @@ def test_columnar_query_to_array():
     assert out["id"].tolist() == [2]
     assert out["px"].tolist() == [250.0]
     sqlite3_close(db)
+
+
+def _indexed_and_plain(db, cols, **index_kw):
+    register_table(db, "ix", cols, **index_kw)
+    register_table(db, "plain", cols)
+
+
+@pytest.mark.parametrize("where", [
+    "k = 3", "k = 3.0", "k = 2.5", "k > 2", "k >= 2.5", "k < -1", "k <= 4 AND k > 1", "k = 99",
+    "f = 0.5", "f > 0.25", "f <= 0.5 AND f >= 0.0", "f < 10", "u >= 9223372036854775807",
+    "k = 3 AND f > 0.1", "k > 1 AND k < 1",
+])
+def test_indexed_scan_matches_full_scan(where):
+    # Same rows through the sorted / hash index as through the unindexed scan,
+    # across int/REAL constraint values, NaN cells and wrapped uint64 keys.
+    db = _open_memory()
+    rng = np.random.default_rng(7)
+    f = rng.choice([0.0, 0.25, 0.5, 0.75, np.nan], 200)
+    cols = {"k": rng.integers(-3, 8, 200), "f": f,
+            "u": rng.choice(np.array([1, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64), 200)}
+    _indexed_and_plain(db, cols, indexes=["f", "u"], hash_indexes=["k"])
+    got = _fetchall(db, "SELECT rowid, k, f, u FROM ix WHERE %s ORDER BY rowid" % where)
+    exp = _fetchall(db, "SELECT rowid, k, f, u FROM plain WHERE %s ORDER BY rowid" % where)
+    assert got == exp
+    sqlite3_close(db)
+
+
+def test_indexed_plan_costs_below_full_scan():
+    from numbox.core.bindings.sqlite.vtable import (
+        _xbestindex, _build_descriptor_columnar, _build_indexes, _VTAB_DTYPE, _VTAB_SIZE, _IDX_INFO_DTYPE,
+        _CONSTRAINT_DTYPE, _USAGE_DTYPE,
+    )
+    from numbox.core.bindings.sqlite.constants import SQLITE_INDEX_CONSTRAINT_EQ, SQLITE_INDEX_CONSTRAINT_GT
+    from numbox.core.bindings.sqlite.exec import sqlite3_free
+    nrows = 1024
+    built = _build_descriptor_columnar({"a": np.arange(nrows), "b": np.arange(nrows) % 4}, False)
+    _build_indexes(built, ["a"], ["b"])
+    vtab = np.zeros(_VTAB_SIZE // 8, dtype=np.int64)
+    vtab.view(_VTAB_DTYPE)[0]["descriptor"] = built.c.ctypes.data
+
+    def best_index(col, op):
+        cons = np.zeros(1, dtype=_CONSTRAINT_DTYPE)
+        cons[0]["iColumn"], cons[0]["op"], cons[0]["usable"] = col, op, 1
+        usage = np.zeros(1, dtype=_USAGE_DTYPE)
+        ii = np.zeros(1, dtype=_IDX_INFO_DTYPE)
+        ii[0]["nConstraint"] = 1
+        ii[0]["aConstraint"] = cons.ctypes.data
+        ii[0]["aConstraintUsage"] = usage.ctypes.data
+        assert _xbestindex.ctypes(int(vtab.ctypes.data), int(ii.ctypes.data)) == 0
+        sqlite3_free(int(ii[0]["idxStr"]))
+        return int(ii[0]["estimatedRows"]), float(ii[0]["estimatedCost"])
+
+    # unique sorted key: one row after a log2 probe; hashed 4-value key: one
+    # lookup then a quarter of the rows; a range bound halves the column
+    assert best_index(0, SQLITE_INDEX_CONSTRAINT_EQ) == (1, 1.0 + np.log2(nrows + 1.0))
+    assert best_index(1, SQLITE_INDEX_CONSTRAINT_EQ) == (nrows // 4, 1.0 + nrows // 4)
+    assert best_index(0, SQLITE_INDEX_CONSTRAINT_GT) == (nrows // 2, np.log2(nrows + 1.0) + nrows // 2)
+
+
+def test_indexed_join_probes_inner_table():
+    db = _open_memory()
+    n = 5000
+    keys = np.arange(n, dtype=np.int64)[::-1].copy()
+    register_table(db, "dim", {"id": keys, "w": keys * 2.0}, hash_indexes=["id"])
+    register_table(db, "fact", {"id": np.array([3, 4999, 7, 3, -1], dtype=np.int64)})
+    plan = " ".join(r[3] for r in _fetchall(db, "EXPLAIN QUERY PLAN SELECT * FROM fact JOIN dim USING (id)"))
+    assert plan.index("SCAN fact") < plan.index("SCAN dim"), plan
+    assert _fetchall(db, "SELECT fact.id, w FROM fact JOIN dim USING (id) ORDER BY fact.rowid") == [
+        (3, 6.0), (4999, 9998.0), (7, 14.0), (3, 6.0)]
+    sqlite3_close(db)
+
+
+def test_index_arguments_validated():
+    cols = {"i": np.arange(3), "f": np.zeros(3), "s": np.array(["a", "b", "c"])}
+    with pytest.raises(ValueError, match="unknown column"):
+        register_table(0, "t", cols, indexes=["nope"])
+    with pytest.raises(ValueError, match="must be numeric"):
+        register_table(0, "t", cols, indexes=["s"])
+    with pytest.raises(ValueError, match="integer column"):
+        register_table(0, "t", cols, hash_indexes=["f"])
+
+
+def _plan_text(db, sql):
+    return " ".join(str(r[3]) for r in _fetchall(db, "EXPLAIN QUERY PLAN " + sql))
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT rowid, ts FROM {} ORDER BY ts",
+    "SELECT rowid, f FROM {} ORDER BY f DESC",
+    "SELECT rowid, f FROM {} ORDER BY f",
+    "SELECT rowid, f FROM {} WHERE f >= 0.25 ORDER BY f DESC",
+    "SELECT rowid, ts FROM {} WHERE ts < 40 AND k > 2 ORDER BY ts DESC",
+    "SELECT rowid FROM {} ORDER BY rowid",
+])
+def test_order_by_consumed_from_index_or_rowid_order(query):
+    # The index permutation (walked backwards for DESC, NULLs first for ASC)
+    # or the rowid scan supplies the order, so SQLite skips its sorter; the
+    # rows -- including ties and NULL placement -- match the sorted plain table.
+    db = _open_memory()
+    rng = np.random.default_rng(3)
+    cols = {"ts": rng.integers(0, 50, 300), "f": rng.choice([0.0, 0.25, 0.5, np.nan], 300),
+            "k": rng.integers(0, 5, 300)}
+    _indexed_and_plain(db, cols, indexes=["ts", "f"])
+    assert "TEMP B-TREE" not in _plan_text(db, query.format("ix"))
+    got = _fetchall(db, query.format("ix"))
+    exp = _fetchall(db, query.format("plain"))
+    key = (lambda r: (r[1] is not None, r[1])) if len(exp[0]) > 1 else (lambda r: r[0])
+    assert [key(r) for r in got] == [key(r) for r in exp]
+    assert sorted(got, key=lambda r: r[0]) == sorted(exp, key=lambda r: r[0])
+    sqlite3_close(db)
+
+
+def test_order_by_left_to_sqlite_when_unindexed_or_costlier():
+    db = _open_memory()
+    n = 4096
+    cols = {"id": np.arange(n), "ts": np.arange(n)[::-1].copy(), "v": np.arange(n) % 7}
+    register_table(db, "t", cols, indexes=["ts"], hash_indexes=["id"])
+    assert "TEMP B-TREE" in _plan_text(db, "SELECT * FROM t ORDER BY v")
+    assert "TEMP B-TREE" in _plan_text(db, "SELECT * FROM t ORDER BY ts, v")
+    # one row through the id hash, sorted by SQLite, beats walking all of ts
+    assert "TEMP B-TREE" in _plan_text(db, "SELECT * FROM t WHERE id = 5 ORDER BY ts")
+    assert _fetchall(db, "SELECT id, ts FROM t WHERE id = 5 ORDER BY ts") == [(5, n - 6)]
+    sqlite3_close(db)
+
+
+def test_col_used_sizes_unicode_scratch():
+    from numbox.core.bindings.sqlite.vtable import (
+        _xbestindex, _build_descriptor, _VTAB_DTYPE, _VTAB_SIZE, _IDX_INFO_DTYPE, _PLAN_DTYPE,
+    )
+    from numbox.core.bindings.sqlite.exec import sqlite3_free
+    arr = np.zeros(3, dtype=[("a", "i8"), ("wide", "U64"), ("narrow", "U2")])
+    built = _build_descriptor(arr, None, False)
+    vtab = np.zeros(_VTAB_SIZE // 8, dtype=np.int64)
+    vtab.view(_VTAB_DTYPE)[0]["descriptor"] = built.c.ctypes.data
+
+    def scratch_for(col_used):
+        ii = np.zeros(1, dtype=_IDX_INFO_DTYPE)
+        ii[0]["colUsed"] = col_used
+        assert _xbestindex.ctypes(int(vtab.ctypes.data), int(ii.ctypes.data)) == 0
+        plan = np.frombuffer(string_at(int(ii[0]["idxStr"]), _PLAN_DTYPE.itemsize), dtype=_PLAN_DTYPE)[0]
+        sqlite3_free(int(ii[0]["idxStr"]))
+        assert int(plan["nul"]) == 0
+        return int(plan["scratch_bytes"])
+
+    assert scratch_for(0b001) == 0
+    assert scratch_for(0b101) == 4 * 2 + 1
+    assert scratch_for(0b111) == 4 * 64 + 1
+    db = _open_memory()
+    arr["wide"] = ["x" * 64, "é", ""]
+    arr["narrow"] = ["ab", "c", ""]
+    register_table(db, "t", arr)
+    assert _fetchall(db, "SELECT narrow FROM t") == [("ab",), ("c",), ("",)]
+    assert _fetchall(db, "SELECT narrow, wide FROM t ORDER BY rowid DESC") == [("", ""), ("c", "é"), ("ab", "x" * 64)]
+    sqlite3_close(db)
+
+
+def test_unique_index_equality_flags_scan_unique():
+    from numbox.core.bindings.sqlite.vtable import (
+        _xbestindex, _build_descriptor_columnar, _build_indexes, _VTAB_DTYPE, _VTAB_SIZE, _IDX_INFO_DTYPE,
+        _CONSTRAINT_DTYPE, _USAGE_DTYPE,
+    )
+    from numbox.core.bindings.sqlite.constants import SQLITE_INDEX_CONSTRAINT_EQ, SQLITE_INDEX_SCAN_UNIQUE
+    from numbox.core.bindings.sqlite.exec import sqlite3_free
+    built = _build_descriptor_columnar({"id": np.arange(10), "g": np.arange(10) % 2}, False)
+    _build_indexes(built, ["g"], ["id"])
+    vtab = np.zeros(_VTAB_SIZE // 8, dtype=np.int64)
+    vtab.view(_VTAB_DTYPE)[0]["descriptor"] = built.c.ctypes.data
+    flags = []
+    for col in (0, 1):
+        cons = np.zeros(1, dtype=_CONSTRAINT_DTYPE)
+        cons[0]["iColumn"], cons[0]["op"], cons[0]["usable"] = col, SQLITE_INDEX_CONSTRAINT_EQ, 1
+        usage = np.zeros(1, dtype=_USAGE_DTYPE)
+        ii = np.zeros(1, dtype=_IDX_INFO_DTYPE)
+        ii[0]["nConstraint"] = 1
+        ii[0]["aConstraint"] = cons.ctypes.data
+        ii[0]["aConstraintUsage"] = usage.ctypes.data
+        assert _xbestindex.ctypes(int(vtab.ctypes.data), int(ii.ctypes.data)) == 0
+        sqlite3_free(int(ii[0]["idxStr"]))
+        flags.append(int(ii[0]["idxFlags"]))
+    assert flags == [SQLITE_INDEX_SCAN_UNIQUE, 0]
@@ -1,11 +1,15 @@
+import pickle
+import sys
+
 from inspect import getsource
 from textwrap import dedent
 from typing import Any
 
 import pytest
 
-from numbox.core.variable.variable import CompiledGraph, Graph, Values, Variables, Variable
+from numbox.core.variable.variable import CompiledGraph, CompiledNode, Graph, Value, Values, Variables, Variable
 from numbox.core.variable.node import make_node
+from numbox.core.variable.timing import RuntimeProfile
 from numbox.core.work.print_tree import make_image
 
 from test.auxiliary_utils import collect_and_run_tests
@@ -291,5 +295,141 @@ def test_variable_name_rejects_qual_sep_but_source_allows_it():
     assert v.qual_name() == "a.b.b"
 
 
+def _deep_chain(depth):
+    specs = [{"name": "n0", "inputs": {"x": "ext"}, "formula": lambda x: x + 1, "metadata": "n0"}]
+    specs += [
+        {"name": f"n{i}", "inputs": {f"n{i - 1}": "calc"}, "formula": lambda v: v + 1, "metadata": f"n{i}"}
+        for i in range(1, depth)
+    ]
+    return Graph({"calc": specs}, ["ext"])
+
+
+def test_deep_chain_traversals_do_not_recurse():
+    depth = sys.getrecursionlimit() * 5
+    graph = _deep_chain(depth)
+    compiled = graph.compile(f"calc.n{depth - 1}")
+    assert [n.variable.name for n in compiled.ordered_nodes[:3]] == ["x", "n0", "n1"]
+    assert len(compiled.ordered_nodes) == depth + 1
+    values = Values()
+    compiled.execute({"ext": {"x": 0}}, values)
+    assert values.get(compiled.ordered_nodes[-1].variable).value == depth
+    explanation = graph.explain(f"calc.n{depth - 1}")
+    assert explanation.startswith(f"\n'calc.n{depth - 1}' depends on ('calc.n{depth - 2}',)")
+    assert explanation.endswith("'x' comes from external source 'ext'\n")
+    assert len(graph.dependents_of("ext.x")) == depth + 1
+
+
+def test_topological_order_shared_inputs_and_cycle():
+    graph = Graph({"v": [
+        {"name": "a", "inputs": {"x": "ext"}},
+        {"name": "b", "inputs": {"a": "v", "x": "ext"}},
+        {"name": "c", "inputs": {"b": "v", "a": "v"}},
+    ]}, ["ext"])
+    ordered, used_external = graph._topological_order(["v.c", "v.a"])
+    assert [v.name for v in ordered] == ["x", "a", "b", "c"]
+    assert {v.qual_name() for v in used_external} == {"ext.x"}
+    cyclic = Graph({"v": [
+        {"name": "a", "inputs": {"b": "v"}},
+        {"name": "b", "inputs": {"a": "v"}},
+    ]}, [])
+    with pytest.raises(RuntimeError, match="Cycle detected at v.a"):
+        cyclic.compile("v.a")
+
+
+class _DictStorage:
+    """ Custom `Storage` without slots, exercising the generic access path. """
+    def __init__(self):
+        self._values = {}
+
+    def get(self, variable):
+        if variable not in self._values:
+            self._values[variable] = Value(variable=variable)
+        return self._values[variable]
+
+    def __iter__(self):
+        return iter(self._values)
+
+
+def _diamond_graph():
+    return Graph({"v": [
+        {"name": "a", "inputs": {"x": "ext"}, "formula": lambda x: x + 1},
+        {"name": "b", "inputs": {"a": "v", "y": "ext"}, "formula": lambda a, y: a * y},
+        {"name": "c", "inputs": {"a": "v", "b": "v"}, "formula": lambda a, b: a - b},
+        {"name": "d", "inputs": {"y": "ext"}, "formula": lambda y: -y},
+    ]}, ["ext"])
+
+
+def test_slot_values_match_generic_storage():
+    graph = _diamond_graph()
+    compiled = graph.compile(["v.c", "v.d"])
+    slotted, generic = Values(), _DictStorage()
+    for values in (slotted, generic):
+        compiled.execute({"ext": {"x": 1, "y": 3}}, values)
+        compiled.recompute({"ext": {"y": 5}}, values)
+    for node in compiled.ordered_nodes:
+        assert slotted.get(node.variable).value == generic.get(node.variable).value
+    assert slotted.get(graph.registry["v"]["c"]).value == 2 - 10
+    assert set(slotted) == {node.variable for node in compiled.ordered_nodes}
+
+
+def test_values_shared_across_compiled_graphs():
+    graph = _diamond_graph()
+    values = Values()
+    d = graph.registry["v"]["d"]
+    early = values.get(d)
+    graph.compile("v.a").execute({"ext": {"x": 1}}, values)
+    compiled_cd = graph.compile(["v.c", "v.d"])
+    assert compiled_cd.slot_layout is graph.compile("v.a").slot_layout
+    compiled_cd.execute({"ext": {"x": 1, "y": 3}}, values)
+    assert values.get(d) is early
+    assert values.get(d).value == early.value == -3
+    assert values.get(graph.registry["v"]["a"]).value == 2
+    values.get(graph.registry["ext"]["y"]).value = 4
+    compiled_cd._calculate(compiled_cd.ordered_nodes, values)
+    assert values.get(d).value == -4
+    # A `Values` bound to one graph falls back to generic access for another.
+    other = _diamond_graph().compile("v.d")
+    other.execute({"ext": {"y": 7}}, values)
+    assert values.get(d).value == -7
+
+
+def test_slot_values_uninitialized_input():
+    graph = Graph({"v": [
+        {"name": "a", "inputs": {}},
+        {"name": "b", "inputs": {"a": "v"}, "formula": lambda a: a},
+    ]}, [])
+    with pytest.raises(RuntimeError, match="Uninitialized input v.a"):
+        graph.compile("v.b").execute({}, Values())
+
+
+def test_variable_identity_is_cached_and_slotted():
+    v = Variable(name="x", source="ext", metadata="m")
+    twin = Variable(name="".join(["x"]), source="ext")
+    assert hash(v) == hash(twin) == hash(("ext", "x"))
+    assert v == twin and v.qual_name() is twin.qual_name()
+    assert not hasattr(v, "__dict__")
+    assert pickle.loads(pickle.dumps(v)) == v
+    node = CompiledNode(variable=v, inputs=[])
+    assert hash(node) == hash(v)
+    assert node == CompiledNode(variable=twin, inputs=[])
+    assert node != CompiledNode(variable=Variable(name="y", source="ext"), inputs=[])
+
+
+def test_runtime_profile_counts_calls_per_node():
+    compiled = _diamond_graph().compile(["v.c", "v.d"])
+    for values in (Values(), _DictStorage()):
+        profile = RuntimeProfile()
+        compiled.execute({"ext": {"x": 1, "y": 3}}, values, profile=profile)
+        compiled.recompute({"ext": {"y": 4}}, values, profile=profile)
+        calls = {t.name: t.calls for t in profile.report(sort="name")}
+        assert calls == {"v.a": 1, "v.b": 2, "v.c": 2, "v.d": 2}
+        assert all(t.kind == "node" and t.total_ns >= 0 for t in profile.report())
+        assert [t.name for t in profile.report(sort="calls")][-1] == "v.a"
+    with pytest.raises(ValueError, match="sort must be one of"):
+        profile.report(sort="slowest")
+    profile.clear()
+    assert profile.report() == []
+
+
 if __name__ == "__main__":
     collect_and_run_tests(__name__)
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from numba import float64, int64
+
+from numbox.core.variable.variable import Graph, Params
+from numbox.core.variable.warmup import declare_externals, warmup
+from numbox.warmup import _parse_type
+
+
+def _declared_graph(mix=False):
+    """``e.x -> c.a -> c.b -> c.d``; with `mix`, ``c.b`` is declared plain Python."""
+    def to_py(a):
+        return float(a) * 2.0
+    return Graph({"c": [
+        {"name": "a", "inputs": {"x": "e"}, "formula": lambda x: x + 1.0, "params": Params(type=float64)},
+        {"name": "b", "inputs": {"a": "c"}, "formula": to_py if mix else (lambda a: a * 2.0),
+         "params": Params(jitable=not mix, type=float64)},
+        {"name": "d", "inputs": {"b": "c"}, "formula": lambda b: b - 3.0, "params": Params(type=float64)},
+    ]}, ["e"])
+
+
+def test_warmup_fused_reports_the_unit():
+    report = warmup(_declared_graph(), "c.d", types={"e.x": float64}, cache=False)
+    assert report.mode == "fused-pending"
+    [unit] = report.units
+    assert (unit.unit, unit.nodes, unit.signature, unit.cache) == ("fused", ("c.a", "c.b", "c.d"), "(float64)", "off")
+    assert unit.seconds > 0 and not report.warm
+    assert report.kernel.kernel(1.0) == (1.0,)
+    assert "0/1 unit(s) loaded from cache" in report.format()
+
+
+def test_warmup_segmented_reports_every_jit_segment():
+    report = warmup(_declared_graph(mix=True), "c.d", types={"e.x": float64}, cache=False)
+    assert report.mode == "segmented"
+    assert [(u.unit, u.nodes) for u in report.units] == [("segment", ("c.a",)), ("segment", ("c.d",))]
+    assert report.kernel.kernel(1.0) == (1.0,)
+
+
+def test_warmup_rejects_undeclared_graph_and_unknown_externals():
+    g = Graph({"c": [{"name": "a", "inputs": {"x": "e"}, "formula": lambda x: x + 1.0}]}, ["e"])
+    with pytest.raises(ValueError, match="fully-declared"):
+        warmup(g, "c.a", types={"e.x": float64}, cache=False)
+    with pytest.raises(ValueError, match="external source"):
+        declare_externals(_declared_graph(), {"c.a": float64})
+
+
+def test_parse_type_evaluates_numba_type_expressions():
+    assert _parse_type("e.x=int64") == ("e.x", int64)
+    assert _parse_type("e.y=float64[:]")[1] == float64[:]
+    with pytest.raises(Exception, match="not a numba type"):
+        _parse_type("e.x=1")
+
+
+def test_warmup_cli_primes_the_cache_across_processes(tmp_path):
+    """A first ``python -m numbox.warmup`` compiles and writes the cache; a
+    second process loads every unit from it (``--check`` passes)."""
+    (tmp_path / "warm_factory.py").write_text(textwrap.dedent('''
+        from numba import float64
+        from numbox.core.variable.variable import Graph, Params
+
+        def a(x):
+            return x + 1.0
+
+        def b(a):
+            return float(a) * 2.0
+
+        def d(b):
+            return b - 3.0
+
+        def make():
+            return Graph({"c": [
+                {"name": "a", "inputs": {"x": "e"}, "formula": a, "params": Params(type=float64)},
+                {"name": "b", "inputs": {"a": "c"}, "formula": b, "params": Params(jitable=False, type=float64)},
+                {"name": "d", "inputs": {"b": "c"}, "formula": d, "params": Params(type=float64)},
+            ]}, ["e"])
+    '''), encoding="utf-8")
+    env = dict(os.environ)
+    env["NUMBA_CACHE_DIR"] = str(tmp_path / "nbcache")
+    env["PYTHONPATH"] = os.pathsep.join([str(tmp_path)] + sys.path)
+    cmd = [sys.executable, "-m", "numbox.warmup", "warm_factory:make", "-r", "c.d", "-t", "e.x=float64", "--check"]
+    cold = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    assert cold.returncode == 1, cold.stderr
+    assert cold.stdout.count("cache miss") == 2
+    warm = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    assert warm.returncode == 0, warm.stdout + warm.stderr
+    assert warm.stdout.count("cache hit") == 2
+    assert "2/2 unit(s) loaded from cache" in warm.stdout
@@ -0,0 +1,107 @@
+import numpy
+import pytest
+from numba import njit
+from numba.core.types import float64, unicode_type
+from numba.typed.typeddict import Dict
+
+from numbox.core.any.any_type import AnyType, make_any
+from numbox.core.work.batch import make_row_runner, run_rows
+from numbox.core.work.loader_utils import load_array_row_into_dict
+from numbox.core.work.work import make_work
+from numbox.utils.highlevel import cres
+from test.auxiliary_utils import collect_and_run_tests
+
+
+@cres(float64(float64, float64))
+def derive_add(x_, y_):
+    return x_ + y_
+
+
+@cres(float64(float64, float64))
+def derive_mul(x_, y_):
+    return x_ * y_
+
+
+def _graph():
+    a = make_work("a", 0.0)
+    b = make_work("b", 0.0)
+    c = make_work("c", 2.0)
+    s = make_work("s", 0.0, sources=(a, b), derive=derive_add)
+    p = make_work("p", 0.0, sources=(s, c), derive=derive_mul)
+    q = make_work("q", 0.0, sources=(b, c), derive=derive_mul)
+    return p, q
+
+
+_INPUTS_DTYPE = numpy.dtype([("a", numpy.float64), ("b", numpy.float64)])
+_OUTPUTS_DTYPE = numpy.dtype([("p", numpy.float64), ("s", numpy.float64), ("q", numpy.float64)])
+
+
+def _inputs(num_rows):
+    inputs = numpy.empty(num_rows, dtype=_INPUTS_DTYPE)
+    inputs["a"] = numpy.arange(num_rows)
+    inputs["b"] = 10.0 * numpy.arange(num_rows)
+    return inputs
+
+
+@njit
+def _run_row_by_row(p, q, inputs, loader_dict, outputs):
+    for i in range(len(inputs)):
+        load_array_row_into_dict(inputs, i, loader_dict)
+        p.load(loader_dict)
+        p.calculate()
+        q.load(loader_dict)
+        q.calculate()
+        outputs[i].p = p.data
+        outputs[i].s = p.sources[0].data
+        outputs[i].q = q.data
+
+
+def test_run_rows_matches_row_by_row():
+    inputs = _inputs(5)
+    outputs = numpy.zeros(5, dtype=_OUTPUTS_DTYPE)
+    run_rows(_graph(), inputs, outputs)
+    expected = numpy.zeros(5, dtype=_OUTPUTS_DTYPE)
+    _run_row_by_row(*_graph(), inputs, Dict.empty(key_type=unicode_type, value_type=AnyType), expected)
+    assert numpy.array_equal(outputs, expected)
+    assert numpy.allclose(outputs["p"], 11 * 2.0 * numpy.arange(5))
+
+
+def test_row_runner_recalculates_downstream_only():
+    p, q = _graph()
+    p.calculate()
+    a = p.sources[0].sources[0]
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["a"] = make_any(5.0)
+    a.load(load_data)  # `s` stays derived, with its stale value 0.0
+    runner = make_row_runner(p, numpy.dtype([("c", numpy.float64)]), numpy.dtype([("p", numpy.float64)]))
+    inputs = numpy.array([(3.0,), (4.0,)], dtype=[("c", numpy.float64)])
+    outputs = numpy.ones(2, dtype=[("p", numpy.float64)])
+    runner(inputs, outputs)
+    assert numpy.allclose(outputs["p"], 0.0)
+    assert p.derived and not q.derived and not a.derived
+
+
+def test_run_rows_loads_every_node_of_a_name():
+    w1, w1b, k = make_work("w1", 0.0), make_work("w1", 0.0), make_work("k", 1.0)
+    w2 = make_work("w2", 0.0, sources=(w1, k), derive=derive_add)
+    w3 = make_work("w3", 0.0, sources=(w1b, k), derive=derive_add)
+    w4 = make_work("w4", 0.0, sources=(w2, w3), derive=derive_add)
+    w4.calculate()
+    inputs = numpy.array([(20.0,), (5.0,)], dtype=[("w1", numpy.float64)])
+    outputs = numpy.zeros(2, dtype=[("w2", numpy.float64), ("w3", numpy.float64), ("w4", numpy.float64)])
+    run_rows(w4, inputs, outputs)
+    assert outputs.tolist() == [(21.0, 21.0, 42.0), (6.0, 6.0, 12.0)]
+    assert w1.data == w1b.data == 5.0
+
+
+def test_make_row_runner_validates():
+    p, q = _graph()
+    with pytest.raises(ValueError, match="not found"):
+        make_row_runner(p, numpy.dtype([("z", numpy.float64)]), _OUTPUTS_DTYPE[["p"]])
+    runner = make_row_runner((p, q), _INPUTS_DTYPE, _OUTPUTS_DTYPE)
+    with pytest.raises(ValueError, match="expected as many"):
+        runner(_inputs(3), numpy.zeros(2, dtype=_OUTPUTS_DTYPE))
+
+
+if __name__ == "__main__":
+    collect_and_run_tests(__name__)
@@ -0,0 +1,235 @@
+import numpy
+import pytest
+from numba import njit
+from numba.core.types import Array, float64, unicode_type
+from numba.typed.typeddict import Dict
+
+from numbox.core.any.any_type import AnyType, make_any
+from numbox.core.work.schedule import (
+    _step_registry, load_schedule, make_schedule, run_schedule, run_schedule_parallel
+)
+from numbox.core.work.work import make_work
+from numbox.utils.highlevel import cres
+from test.auxiliary_utils import collect_and_run_tests
+
+
+@cres(float64(float64))
+def derive_inc(x_):
+    return x_ + 1.0
+
+
+@cres(float64(float64, float64))
+def derive_add(x_, y_):
+    return x_ + y_
+
+
+@cres(float64(float64))
+def derive_checked(x_):
+    if x_ > 2.0:
+        raise ValueError("input out of range")
+    return x_
+
+
+@cres(float64(Array(float64, 1, "C"), float64))
+def derive_counted_checked(calls_, x_):
+    calls_[0] += 1.0
+    if x_ > 2.0:
+        raise ValueError("input out of range")
+    return x_
+
+
+@cres(Array(float64, 1, "C")(Array(float64, 1, "C"), float64))
+def derive_scaled(x_, s_):
+    return x_ * s_
+
+
+def _diamond():
+    a = make_work("a", 1.0)
+    b = make_work("b", 0.0, sources=(a,), derive=derive_inc)
+    c = make_work("c", 0.0, sources=(a,), derive=derive_inc)
+    d = make_work("d", 0.0, sources=(b, c), derive=derive_add)
+    return a, b, c, d
+
+
+def test_schedule_order_and_calculate():
+    a, b, c, d = _diamond()
+    schedule = make_schedule(d)
+    assert schedule.names == ["a", "b", "c", "d"]
+    assert schedule.sources_ind[schedule.sources_ptr[3]:schedule.sources_ptr[4]].tolist() == [1, 2]
+    schedule.calculate()
+    assert d.data == 4.0
+    assert all(w.derived for w in (a, b, c, d))
+
+
+def test_schedule_array_data():
+    x = make_work("x", numpy.arange(4.0))
+    s = make_work("s", 2.5)
+    y = make_work("y", numpy.zeros(4), sources=(x, s), derive=derive_scaled)
+    make_schedule(y).calculate()
+    assert numpy.allclose(y.data, numpy.arange(4.0) * 2.5)
+
+
+def test_schedule_deep_chain_shares_one_step():
+    w = make_work("w0", 0.0)
+    for i in range(1, 60):
+        w = make_work(f"w{i}", 0.0, sources=(w,), derive=derive_inc)
+    num_steps = len(_step_registry)
+    schedule = make_schedule(w)
+    assert len(schedule) == 60
+    assert len(_step_registry) - num_steps <= 2
+    schedule.calculate()
+    assert w.data == 59.0
+
+
+def test_schedule_keeps_derived_semantics():
+    a = make_work("a", 1.0)
+    b = make_work("b", 0.0, sources=(a,), derive=derive_inc)
+    c = make_work("c", 0.0, sources=(b,), derive=derive_inc)
+    schedule = make_schedule(c)
+    schedule.calculate()
+    assert c.data == 3.0
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["a"] = make_any(10.0)
+    b.load(load_data)
+    assert c.derived and not b.derived
+    schedule.calculate()  # c is derived: like c.calculate(), nothing below it runs
+    assert not b.derived and b.data == 2.0 and c.data == 3.0
+    c.load(load_data)
+    assert not c.derived
+    schedule.calculate()
+    assert b.derived and c.data == 12.0
+
+
+def test_schedule_propagates_derive_exception():
+    a = make_work("a", 5.0)
+    b = make_work("b", 0.0, sources=(a,), derive=derive_checked)
+    schedule = make_schedule(b)
+    with pytest.raises(ValueError, match="input out of range"):
+        schedule.calculate()
+    assert not b.derived
+
+
+def test_run_schedule_from_jitted_code():
+    a, b, c, d = _diamond()
+    schedule = make_schedule(d)
+
+    @njit
+    def _run(run_args):
+        run_schedule(*run_args)
+
+    _run(schedule.as_tuple())
+    assert d.data == 4.0
+
+
+def test_schedule_load_matches_work_load():
+    graphs = [_diamond(), _diamond()]
+    e = make_work("e", 5.0)
+    x, y = (make_work("x", 0.0, sources=(d, e), derive=derive_add) for *_, d in graphs)
+    x.calculate()
+    schedule = make_schedule(y)
+    schedule.calculate()
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["c"] = make_any(10.0)
+    load_data["not_in_graph"] = make_any(0.0)
+    assert x.load(load_data) == schedule.load(load_data) is True
+    for w, v in zip((*graphs[0], x), (*graphs[1], y)):
+        assert (w.data, w.derived) == (v.data, v.derived)
+    assert not schedule._marks.any()
+    x.calculate()
+    schedule.calculate()
+    assert x.data == y.data == 9.0
+    empty = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    assert schedule.load(empty) is False
+    assert y.derived
+
+    # several nodes sharing a name are all loaded, as by `Work.load`
+    tops = []
+    for _ in range(2):
+        w1, w1b = make_work("w1", 0.0), make_work("w1", 0.0)
+        w2 = make_work("w2", 0.0, sources=(w1,), derive=derive_inc)
+        w3 = make_work("w3", 0.0, sources=(w1b,), derive=derive_inc)
+        tops.append(make_work("w4", 0.0, sources=(w2, w3), derive=derive_add))
+    x, y = tops
+    schedule = make_schedule(y)
+    assert schedule.named("w1").tolist() == [0, 2] and len(schedule.named("w5")) == 0
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["w1"] = make_any(9.0)
+    assert x.load(load_data) == schedule.load(load_data) is True
+    x.calculate()
+    schedule.calculate()
+    assert x.data == y.data == 20.0
+
+
+def test_load_schedule_from_jitted_code():
+    a, b, c, d = _diamond()
+    schedule = make_schedule(d)
+
+    @njit
+    def _run(load_data, load_args, run_args):
+        load_schedule(load_data, *load_args)
+        run_schedule(*run_args)
+
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["a"] = make_any(2.0)
+    _run(load_data, schedule.as_load_tuple(), schedule.as_tuple())
+    assert d.data == 6.0
+
+
+def test_parallel_schedule_levels_and_matches_sequential():
+    graphs = []
+    for _ in range(2):
+        leaves = [make_work(f"l{i}", float(i)) for i in range(6)]
+        mids = [make_work(f"m{i}", 0.0, sources=(leaf,), derive=derive_inc) for i, leaf in enumerate(leaves)]
+        pairs = [make_work(f"p{i}", 0.0, sources=tuple(mids[2 * i:2 * i + 2]), derive=derive_add) for i in range(3)]
+        top = make_work("top", 0.0, sources=(pairs[0], pairs[1]), derive=derive_add)
+        graphs.append(make_work("root", 0.0, sources=(top, pairs[2]), derive=derive_add))
+    sequential, parallel = (make_schedule(root) for root in graphs)
+    assert numpy.diff(parallel.levels_ptr).tolist() == [6, 6, 3, 1, 1]
+    assert sorted(parallel.levels_ind.tolist()) == list(range(len(parallel)))
+    sequential.calculate()
+    parallel.calculate(parallel=True, n_threads=1)
+    assert graphs[0].data == graphs[1].data == sum(range(1, 7))
+    load_data = Dict.empty(key_type=unicode_type, value_type=AnyType)
+    load_data["l0"] = make_any(100.0)
+    for schedule in (sequential, parallel):
+        schedule.load(load_data)
+    sequential.calculate()
+
+    @njit
+    def _run(run_args):
+        run_schedule_parallel(*run_args)
+
+    _run(parallel.as_parallel_tuple())
+    assert graphs[0].data == graphs[1].data == sum(range(1, 7)) + 100.0
+
+
+def test_parallel_schedule_propagates_derive_exception():
+    a = make_work("a", 5.0)
+    b = make_work("b", 0.0, sources=(a,), derive=derive_checked)
+    c = make_work("c", 0.0, sources=(a,), derive=derive_inc)
+    d = make_work("d", 0.0, sources=(b, c), derive=derive_add)
+    schedule = make_schedule(d)
+    with pytest.raises(ValueError, match="input out of range"):
+        schedule.calculate(parallel=True)
+    assert c.derived and not b.derived and not d.derived
+
+
+def test_parallel_schedule_derives_failing_node_once():
+    a = make_work("a", 5.0)
+    calls = make_work("calls", numpy.zeros(1))
+    b = make_work("b", 0.0, sources=(calls, a), derive=derive_counted_checked)
+    e = make_work("e", 0.0, sources=(calls, a), derive=derive_counted_checked)
+    c = make_work("c", 0.0, sources=(a,), derive=derive_inc)
+    d = make_work("d", 0.0, sources=(b, c), derive=derive_add)
+    root = make_work("root", 0.0, sources=(d, e), derive=derive_add)
+    schedule = make_schedule(root)
+    for _ in range(3):
+        calls.data[0] = 0.0
+        with pytest.raises(ValueError, match="input out of range"):
+            schedule.calculate(parallel=True)
+        assert calls.data[0] == 2.0  # b and e, each once; only the first failure is re-raised
+    assert c.derived and not (b.derived or e.derived or d.derived)
+
+
+if __name__ == "__main__":
+    collect_and_run_tests(__name__)
@@ -0,0 +1,103 @@
+"""Benchmark: rows/sec of ``sqlite.insert.insert_array`` vs ``sqlite3.executemany``.
+
+Both load the same ``--rows``-row structured array (an int64 key, two float64
+columns and a short text column) into a fresh table in one transaction:
+
+- ``insert_array``: the @njit path -- one prepared INSERT rebound per row
+  straight from the array's records, no Python object per cell;
+- ``executemany``: the standard-library ``sqlite3`` module fed ``arr.tolist()``,
+  which boxes every cell (the conversion is included in its time).
+
+Each run uses its own database, in memory or -- with ``--file`` -- a file under
+a temporary directory, so the journal and page writes are included.
+
+Run it (from the repo root, with numbox installed)::
+
+    python -m test.sqlite_insert_benchmark
+    python -m test.sqlite_insert_benchmark --rows 10000000 --file
+
+----------------------------------------------------------------------------
+Sample results (shared Linux x86-64 box, CPython 3.11, SQLite 3.40; 1M rows,
+in memory; your numbers will vary). Best of 3:
+
+    insert_array      0.83M rows/s
+    executemany       0.51M rows/s
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from ctypes import addressof, c_int64
+
+import numpy as np
+
+from numbox.core.bindings.sqlite.conn import sqlite3_close, sqlite3_open
+from numbox.core.bindings.sqlite.exec import sqlite3_exec
+from numbox.core.bindings.sqlite.insert import insert_array
+from numbox.utils.cstrings import c_string
+
+_DDL = "CREATE TABLE t(k INTEGER, x REAL, y REAL, s TEXT)"
+_DTYPE = np.dtype([("k", "i8"), ("x", "f8"), ("y", "f8"), ("s", "U8")])
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    arr = np.empty(n, _DTYPE)
+    arr["k"] = np.arange(n)
+    arr["x"] = rng.random(n)
+    arr["y"] = rng.normal(size=n)
+    arr["s"] = np.char.add("r", (np.arange(n) % 1000).astype("U3"))
+    return arr
+
+
+def _time_numbox(path, arr):
+    db = c_int64(0)
+    with c_string(path) as p:
+        assert sqlite3_open(p, addressof(db)) == 0
+    with c_string(_DDL) as p:
+        assert sqlite3_exec(db.value, p, 0, 0, 0) == 0
+    t0 = time.perf_counter()
+    rc = insert_array(db.value, "t", arr)
+    elapsed = time.perf_counter() - t0
+    sqlite3_close(db.value)
+    assert rc == 0, rc
+    return elapsed
+
+
+def _time_stdlib(path, arr):
+    con = sqlite3.connect(path)
+    con.execute(_DDL)
+    t0 = time.perf_counter()
+    with con:
+        con.executemany("INSERT INTO t VALUES (?, ?, ?, ?)", arr.tolist())
+    elapsed = time.perf_counter() - t0
+    con.close()
+    return elapsed
+
+
+def run(rows, repeats, on_file):
+    arr = make_rows(rows)
+    _time_numbox(":memory:", arr[:10])  # compile outside the timed runs
+    results = {"insert_array": [], "executemany": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rep in range(repeats):
+            for name, fn in (("insert_array", _time_numbox), ("executemany", _time_stdlib)):
+                path = os.path.join(tmp, f"{name}{rep}.sqlite") if on_file else ":memory:"
+                results[name].append(fn(path, arr))
+    print(f"{rows} rows, {'file' if on_file else 'in memory'}, best of {repeats}:")
+    for name, times in results.items():
+        print(f"  {name:<16}{rows / min(times) / 1e6:8.2f}M rows/s")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rows", type=int, default=1_000_000, help="rows per load (default 1M)")
+    p.add_argument("--repeats", type=int, default=3, help="timed reps (default 3)")
+    p.add_argument("--file", action="store_true", help="load into on-disk databases instead of :memory:")
+    args = p.parse_args()
+    run(args.rows, args.repeats, args.file)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ from numpy.random import randint, seed
 from numbox.core.any.any_type import AnyType
 from numbox.core.configurations import jit_options
 from numbox.core.work.loader_utils import load_array_row_into_dict
+from numbox.core.work.batch import make_row_runner
 from numbox.core.work.lowlevel_work_utils import ll_make_work
+from numbox.core.work.schedule import load_schedule, make_schedule, run_schedule
 from numbox.utils.highlevel import cres
 from numbox.utils.timer import timer
 
@@ -151,3 +153,38 @@ def multiple_run(num_of_inputs, num_of_entities):
     loader_dict = Dict.empty(unicode_type, AnyType)
     total_data = run(node, data, loader_dict, num_of_entities)
     return total_data
+
+
+@timer
+@njit(**jit_options)
+def run_scheduled(total, data, loader_dict, load_args, run_args, num_of_entities=NUM_OF_ENTITIES_DEFAULT):
+    total_data = numpy.empty((num_of_entities,), dtype=numpy.float64)
+    for i in range(num_of_entities):
+        load_array_row_into_dict(data, i, loader_dict)
+        load_schedule(loader_dict, *load_args)
+        run_schedule(*run_args)
+        total_data[i] = total.data
+    return total_data
+
+
+def multiple_run_scheduled(num_of_inputs, num_of_entities):
+    create_nodes = make_create_nodes_func(num_of_inputs)
+    node = do_create_nodes(create_nodes)
+    schedule = make_schedule(node)
+    data = prepare_input_data(num_of_inputs, num_of_entities)
+    loader_dict = Dict.empty(unicode_type, AnyType)
+    return run_scheduled(node, data, loader_dict, schedule.as_load_tuple(), schedule.as_tuple(), num_of_entities)
+
+
+@timer
+def run_batched(row_runner, data, total_data):
+    row_runner(data, total_data)
+
+
+def multiple_run_batched(num_of_inputs, num_of_entities):
+    create_nodes = make_create_nodes_func(num_of_inputs)
+    node = do_create_nodes(create_nodes)
+    data = prepare_input_data(num_of_inputs, num_of_entities)
+    total_data = numpy.empty((num_of_entities,), dtype=[(node.name, numpy.float64)])
+    run_batched(make_row_runner(node, data.dtype, total_data.dtype), data, total_data)
+    return total_data[node.name]
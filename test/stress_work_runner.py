@@ -93,7 +93,7 @@ Execution of run took 3.779s (0.664s for 1,000 entities)
 import sys
 
 from numbox.utils.timer import timer
-from test.stress_work import multiple_run, single_run
+from test.stress_work import multiple_run, multiple_run_batched, multiple_run_scheduled, single_run
 
 
 @timer
@@ -109,6 +109,12 @@ if __name__ == "__main__":
     print("multiple run", file=sys.stderr)
     total_data = multiple_run(num_of_inputs, num_of_entities)
     print(f"total_data = {total_data}")
+    print("multiple run, schedule-driven", file=sys.stderr)
+    total_data = multiple_run_scheduled(num_of_inputs, num_of_entities)
+    print(f"total_data = {total_data}")
+    print("multiple run, row-batched", file=sys.stderr)
+    total_data = multiple_run_batched(num_of_inputs, num_of_entities)
+    print(f"total_data = {total_data}")
     print("single run", file=sys.stderr)
     w = single_run(num_of_inputs)
     print(f"w.data = {w.data}")
@@ -0,0 +1,130 @@
+"""Benchmark: per-call overhead of interpreted ``CompiledGraph.recompute``.
+
+``Variable`` and ``CompiledNode`` are the keys of every dict and set on the
+interpreted execution path (``dependents``, ``affected_cache``, the slot layout,
+and any dict-backed ``Storage``). This measures that overhead on a 10k-node
+graph of cheap pure-Python formulas, so the orchestration, not the arithmetic,
+dominates:
+
+- ``lookup``: one dict lookup per variable with an equal-but-distinct key (a
+  hash plus an ``__eq__`` per lookup);
+- ``cone (cold)``: ``_collect_affected`` with the cone caches cleared, i.e. the
+  set traversal paid the first time a change set is seen;
+- ``recompute``: steady-state ``recompute`` of one input's cone, both on the
+  slot-backed ``Values`` and on a plain dict-backed ``Storage``.
+
+The graph is ``--width`` independent columns of ``--depth`` chained nodes over
+their own external input, plus one sink per column; recompute cycles through the
+columns so each call touches a ``depth``-node cone.
+
+Run it (from the repo root, with numbox installed)::
+
+    python -m test.variable_recompute_benchmark
+    python -m test.variable_recompute_benchmark --width 500 --depth 20
+
+----------------------------------------------------------------------------
+Sample results (shared Linux x86-64 box, CPython 3.11; 10.2k nodes = 100 cols
+x 100 deep; your numbers will vary). Microseconds/call, best of 30, before and
+after caching the ``Variable``/``CompiledNode`` hash and interning their names:
+
+                               recomputed hash   cached hash
+    lookup (10200 keys)             9224            6869
+    cone (cold, per column)         4872            2576
+    recompute (Values)                96              76
+    recompute (dict)                 353             206
+"""
+import argparse
+import time
+
+from numbox.core.variable.variable import Graph, Value, Values, Variable
+
+
+class DictStorage:
+    """ Dict-backed `Storage`, exercising `Variable` hashing on every access. """
+    def __init__(self):
+        self._values = {}
+
+    def get(self, variable):
+        if variable not in self._values:
+            self._values[variable] = Value(variable=variable)
+        return self._values[variable]
+
+    def __iter__(self):
+        return iter(self._values)
+
+
+def build_columns(width, depth):
+    """``width`` columns ``ext.i{k} -> c{k}_0 -> ... -> c{k}_{depth-1} -> o{k}``."""
+    specs = []
+    for k in range(width):
+        specs.append({"name": f"c{k}_0", "inputs": {f"i{k}": "ext"}, "formula": lambda a: a + 1})
+        for j in range(1, depth):
+            specs.append({"name": f"c{k}_{j}", "inputs": {f"c{k}_{j - 1}": "vars"}, "formula": lambda a: a + 1})
+        specs.append({"name": f"o{k}", "inputs": {f"c{k}_{depth - 1}": "vars"}, "formula": lambda a: a})
+    graph = Graph({"vars": specs}, external_source_names=["ext"])
+    return graph, [f"vars.o{k}" for k in range(width)]
+
+
+def best(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        fn()
+        times.append(time.perf_counter_ns() - t0)
+    return min(times) / 1e3
+
+
+def run(width, depth, repeats):
+    graph, required = build_columns(width, depth)
+    compiled = graph.compile(required)
+    print(f"graph: {len(compiled.ordered_nodes)} nodes ({width} cols x {depth} deep)")
+    ext = {"ext": {f"i{k}": 0 for k in range(width)}}
+
+    variables = [node.variable for node in compiled.ordered_nodes]
+    table = dict.fromkeys(variables, 0)
+    twins = [Variable(name=v.name, source=v.source) for v in variables]
+
+    def lookup():
+        for v in twins:
+            table[v]
+
+    def cone():
+        for k in range(width):
+            compiled.affected_cache.clear()
+            compiled._collect_affected({graph.registry["ext"][f"i{k}"]})
+
+    changes = [{"ext": {f"i{k}": 1}} for k in range(width)]
+
+    def cycled(storage):
+        compiled.execute(ext, storage)
+        i = [0]
+
+        def step():
+            compiled.recompute(changes[i[0] % width], storage)
+            i[0] += 1
+        for _ in range(width):
+            step()
+        return step
+
+    rows = [
+        (f"lookup ({len(twins)} keys)", best(lookup, repeats)),
+        ("cone (cold, per column)", best(cone, repeats) / width),
+        ("recompute (Values)", best(cycled(Values()), repeats)),
+        ("recompute (dict)", best(cycled(DictStorage()), repeats)),
+    ]
+    print(f"best of {repeats} (microseconds/call):")
+    for name, t in rows:
+        print(f"  {name:<28}{t:10.1f}")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--width", type=int, default=100, help="independent columns (default 100)")
+    p.add_argument("--depth", type=int, default=100, help="nodes per column (default 100)")
+    p.add_argument("--repeats", type=int, default=30, help="timed reps (default 30)")
+    args = p.parse_args()
+    run(args.width, args.depth, args.repeats)
+
+
+if __name__ == "__main__":
+    main()